@@ -0,0 +1,243 @@
+import numpy as np
+import pandas as pd
+
+from istatistik import SIGNIFICANCE_LEVEL, batch_group_tests, benjamini_hochberg, bootstrap_fold_change, permutation_tests
+from onbellek import LRUCache, hash_arrays
+
+# Regülasyon durumu kodları (çeviriden bağımsız)
+NO_CHANGE = 0
+UPREGULATED = 1
+DOWNREGULATED = -1
+
+
+# Farklı uzunluktaki Ct serilerini NaN ile doldurulmuş tek bir matrise dönüştür
+def pad_series(series_list, width=None):
+    lengths = np.array([len(s) for s in series_list], dtype=int)
+    if width is None:
+        width = int(lengths.max()) if len(lengths) else 0
+    padded = np.full((len(series_list), width), np.nan)
+    # Tüm değerler tek bir kopyalama ile yerleştirilir
+    mask = np.arange(width) < lengths[:, None]
+    if mask.any():
+        padded[mask] = np.concatenate([np.asarray(s, dtype=float)[:width] for s in series_list])
+    return padded
+
+
+# NaN değerleri yok sayan ortalama (boş satırlarda uyarı vermeden NaN döner)
+def masked_mean(values, axis=-1):
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=axis)
+    sums = np.where(valid, values, 0.0).sum(axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+# Çoklu referans gen normalizasyonu (geNorm / MIQE): örnek başına referans Ct ortalaması
+# Ct log2 ölçeğinde olduğundan Ct ortalaması, referans ifadelerinin (2^-Ct) geometrik ortalamasına karşılık gelir
+# reference_ct: referans gen ekseni `axis` olan matris; bir referansı eksik örnekler NaN olur
+# weights: referans gen başına ağırlık (Pfaffl için log2(E)); her referans genin Ct'si ortalamadan önce
+# kendi ağırlığıyla çarpılır, böylece sonuç E_ref^(-Ct) değerlerinin geometrik ortalamasına karşılık gelir
+# Sonuç tüm hedef genler için bir kez hesaplanır ve yayınlanarak (broadcast) paylaşılır
+def reference_normalization(reference_ct, axis=0, weights=None):
+    reference_ct = np.asarray(reference_ct, dtype=float)
+    if reference_ct.shape[axis] == 0:
+        return np.full(np.delete(reference_ct.shape, axis), np.nan)
+    if weights is not None:
+        shape = [1] * reference_ct.ndim
+        shape[axis] = -1
+        reference_ct = reference_ct * np.reshape(np.asarray(weights, dtype=float), shape)
+    return reference_ct.mean(axis=axis)
+
+
+# Örnek başına değerleri satır indeksleriyle hücre matrisine yerleştir; -1 (dolgu) hücreler NaN olur
+def gather_rows(values, rows):
+    gathered = np.asarray(values, dtype=float)[np.maximum(rows, 0)]
+    gathered[rows < 0] = np.nan
+    return gathered
+
+
+# Pfaffl modeli için verimlilik ağırlıklı Ct matrisleri: hedef Ct * log2(E_hedef)
+# Referans matrisleri reference_normalization(weights=log2(E_ref)) ile referans gen başına ağırlıklandırılıp
+# ortalanmış olarak verilir; böylece 2^(-ΔΔCt) tam Pfaffl oranına eşittir:
+# E_hedef^ΔCt_hedef / geometrik ortalama(E_ref^ΔCt_ref)
+# E = 2 (%100 verimlilik) için matrisler değişmez ve klasik ΔΔCt sonuçları (ve önbellek anahtarları) korunur
+# target_amplification: (gen,) hedef genlerin amplifikasyon faktörleri
+def efficiency_weighted(control_target, weighted_control_reference, sample_target, weighted_sample_reference,
+                        target_amplification):
+    target_weight = np.log2(np.asarray(target_amplification, dtype=float))
+    return (
+        control_target * target_weight[:, None],
+        weighted_control_reference,
+        sample_target * target_weight[:, None, None],
+        weighted_sample_reference,
+    )
+
+
+# 2^(-ΔΔCt) değerinden regülasyon kodunu belirle
+def regulation_codes(expression_change):
+    return np.select(
+        [expression_change == 1, expression_change > 1, expression_change < 1],
+        [NO_CHANGE, UPREGULATED, DOWNREGULATED],
+        default=NO_CHANGE,
+    )
+
+
+# Tüm gen x grup hücreleri için ΔCt, ΔΔCt ve 2^(-ΔΔCt) hesaplaması
+# control_target / control_reference: (gen, örnek) şeklinde NaN ile doldurulmuş matrisler
+# sample_target / sample_reference:   (gen, hasta grubu, örnek) şeklinde matrisler
+# Hedef ve referans serilerinden biri kısaysa fazla örnekler NaN olur (eski kırpma davranışı)
+def analyze_panel(control_target, control_reference, sample_target, sample_reference):
+    control_target = np.asarray(control_target, dtype=float)
+    control_reference = np.asarray(control_reference, dtype=float)
+    sample_target = np.asarray(sample_target, dtype=float)
+    sample_reference = np.asarray(sample_reference, dtype=float)
+
+    control_delta_ct = control_target - control_reference
+    sample_delta_ct = sample_target - sample_reference
+
+    control_mean = masked_mean(control_delta_ct)
+    sample_mean = masked_mean(sample_delta_ct)
+
+    delta_delta_ct = sample_mean - control_mean[:, None]
+    expression_change = 2 ** (-delta_delta_ct)
+    regulation = regulation_codes(expression_change)
+
+    return {
+        "control_delta_ct": control_delta_ct,
+        "sample_delta_ct": sample_delta_ct,
+        "control_mean": control_mean,
+        "sample_mean": sample_mean,
+        "delta_delta_ct": delta_delta_ct,
+        "expression_change": expression_change,
+        "regulation": regulation,
+        "valid": ~np.isnan(delta_delta_ct),
+    }
+
+
+# Geçerli her gen x grup karşılaştırması için sabit anahtarlı sonuç ve istatistik tabloları
+# gene / group tam sayı kodlarıdır, regulation kodları ve test anahtarları çeviriden bağımsızdır
+def result_frames(panel):
+    gene, group = np.nonzero(panel["valid"])
+    results = pd.DataFrame({
+        "gene": gene,
+        "group": group,
+        "delta_delta_ct": panel["delta_delta_ct"][gene, group],
+        "expression_change": panel["expression_change"][gene, group],
+        "regulation": panel["regulation"][gene, group],
+        "control_mean": panel["control_mean"][gene],
+        "sample_mean": panel["sample_mean"][gene, group],
+    })
+    pvalues = panel["test_pvalue"][gene, group]
+    stats = pd.DataFrame({
+        "gene": gene,
+        "group": group,
+        "test_type": panel["test_type"][gene, group],
+        "test_method": panel["test_method"][gene, group],
+        "test_pvalue": pvalues,
+        "adjusted_pvalue": panel["adjusted_pvalue"][gene, group],
+        "significant": pvalues < SIGNIFICANCE_LEVEL,
+    })
+    return results, stats
+
+
+# Aynı Ct verileri için analiz ve istatistik sonuçları yeniden hesaplanmaz
+analysis_cache = LRUCache(max_entries=32)
+
+# İstatistik modları: otomatik test seçimi zinciri veya permütasyon testi
+STATISTICS_MODES = ("automatic_selection", "permutation_test")
+
+
+# Hücre başına test sonuçları (test türü, yöntem, ham p-değeri); anahtar kontrol ve hasta ΔCt içeriğidir
+# Bir kontrol serisi değişince yalnızca o genin karşılaştırmaları, bir hasta serisi değişince tek karşılaştırma yeniden test edilir
+cell_cache = LRUCache(max_entries=50_000)
+
+
+# Hücre anahtarları: sıralanmış geçerli ΔCt değerleri (testler sıra ve NaN doldurmasından bağımsızdır)
+# Böylece başka bir serinin uzaması matris genişliğini değiştirse bile anahtarlar korunur
+def _cell_keys(control_delta_ct, sample_delta_ct, gene_index, group_index, statistics):
+    control = np.sort(control_delta_ct, axis=-1)
+    control_n = np.count_nonzero(~np.isnan(control), axis=-1)
+    control_keys = {g: hash_arrays(control[g, :control_n[g]]) for g in np.unique(gene_index)}
+    samples = np.sort(sample_delta_ct[gene_index, group_index], axis=-1)
+    samples_n = np.count_nonzero(~np.isnan(samples), axis=-1)
+    return [
+        (control_keys[g], hash_arrays(row[:n]), statistics)
+        for g, row, n in zip(gene_index, samples, samples_n)
+    ]
+
+
+# Panel testleri yalnızca önbellekte olmayan hücreler için çalıştırılır; BH düzeltmesi her seferinde tüm panel üzerinden yapılır
+def incremental_tests(control_delta_ct, sample_delta_ct, valid, statistics):
+    shape = valid.shape
+    test_type = np.full(shape, None, dtype=object)
+    test_method = np.full(shape, None, dtype=object)
+    test_pvalue = np.full(shape, np.nan)
+
+    gene_index, group_index = np.nonzero(valid)
+    keys = _cell_keys(control_delta_ct, sample_delta_ct, gene_index, group_index, statistics)
+    cached = [cell_cache.get(key) for key in keys]
+    stale = np.array([entry is None for entry in cached], dtype=bool)
+
+    if stale.any():
+        # Yalnızca değişen hücrelerin genleri test fonksiyonuna verilir
+        genes, stale_gene = np.unique(gene_index[stale], return_inverse=True)
+        stale_valid = np.zeros((len(genes), shape[1]), dtype=bool)
+        stale_valid[stale_gene, group_index[stale]] = True
+        test = permutation_tests if statistics == "permutation_test" else batch_group_tests
+        fresh = test(control_delta_ct[genes], sample_delta_ct[genes], stale_valid)
+        for position, g, j in zip(np.flatnonzero(stale), stale_gene, group_index[stale]):
+            cached[position] = (fresh["test_type"][g, j], fresh["test_method"][g, j], fresh["test_pvalue"][g, j])
+            cell_cache.put(keys[position], cached[position])
+
+    for g, j, (cell_type, cell_method, cell_pvalue) in zip(gene_index, group_index, cached):
+        test_type[g, j] = cell_type
+        test_method[g, j] = cell_method
+        test_pvalue[g, j] = cell_pvalue
+
+    return {
+        "test_type": test_type,
+        "test_method": test_method,
+        "test_pvalue": test_pvalue,
+        "adjusted_pvalue": benjamini_hochberg(test_pvalue),
+    }
+
+
+# Ct matrislerinin içerik özetine göre önbelleğe alınan tam analiz (ΔΔCt + istatistik)
+# ΔΔCt tüm panel için vektörel hesaplanır; istatistik testleri hücre önbelleği üzerinden artımlıdır
+def run_analysis(control_target, control_reference, sample_target, sample_reference, statistics="automatic_selection"):
+    key = (hash_arrays(control_target, control_reference, sample_target, sample_reference), statistics)
+
+    def compute():
+        panel = analyze_panel(control_target, control_reference, sample_target, sample_reference)
+        panel.update(incremental_tests(panel["control_delta_ct"], panel["sample_delta_ct"], panel["valid"], statistics))
+        panel["results"], panel["stats"] = result_frames(panel)
+        return panel
+
+    return analysis_cache.get_or_compute(key, compute)
+
+
+bootstrap_cache = LRUCache(max_entries=16)
+
+
+# Bootstrap güven aralıkları; ΔCt verileri ve parametreler değişmediyse önbellekten gelir
+def run_bootstrap(panel, n_resamples, confidence, method):
+    key = (hash_arrays(panel["control_delta_ct"], panel["sample_delta_ct"]), n_resamples, confidence, method)
+    return bootstrap_cache.get_or_compute(key, lambda: bootstrap_fold_change(
+        panel["control_delta_ct"], panel["sample_delta_ct"], panel["valid"],
+        n_resamples=n_resamples, confidence=confidence, method=method,
+    ))
+
+
+# Sonuç tablosuna bootstrap güven aralığı sütunlarını ekle
+def with_confidence_intervals(results, bootstrap):
+    gene, group = results["gene"].to_numpy(), results["group"].to_numpy()
+    return results.assign(ci_lower=bootstrap["ci_lower"][gene, group], ci_upper=bootstrap["ci_upper"][gene, group])
+
+
+# Pfaffl modunda analiz matrisleri Ct * log2(E) değerleridir; tablolarda gösterilen ΔCt ortalamaları ham Ct
+# matrislerinden hesaplanır (ΔΔCt ve ekspresyon değişimi verimlilik düzeltmeli kalır)
+def with_raw_delta_ct(results, control_target, control_reference, sample_target, sample_reference):
+    gene, group = results["gene"].to_numpy(), results["group"].to_numpy()
+    control_mean = masked_mean(np.asarray(control_target, dtype=float) - np.asarray(control_reference, dtype=float))
+    sample_mean = masked_mean(np.asarray(sample_target, dtype=float) - np.asarray(sample_reference, dtype=float))
+    return results.assign(control_mean=control_mean[gene], sample_mean=sample_mean[gene, group])
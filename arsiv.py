@@ -0,0 +1,179 @@
+import json
+import zipfile
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from onbellek import LRUCache, hash_arrays
+from veri_tablosu import SampleTable, code_dtype
+
+# Arşiv tablo biçimleri: Parquet (sıkıştırılmış) veya Arrow IPC (sıkıştırmasız, bellek eşlemeye uygun)
+ARCHIVE_FORMATS = ("parquet", "arrow")
+ARCHIVE_VERSION = 1
+METADATA_NAME = "metadata.json"
+TABLE_NAMES = ("samples", "results", "stats")
+
+# Aynı arşiv tekrar yüklendiğinde dosya yeniden okunmaz
+archive_cache = LRUCache(max_entries=8)
+
+
+def _write_table(frame, archive_format):
+    buffer = BytesIO()
+    if archive_format == "arrow":
+        frame.reset_index(drop=True).to_feather(buffer, compression="uncompressed")
+    else:
+        frame.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _read_table(content, archive_format):
+    if archive_format == "arrow":
+        return pd.read_feather(BytesIO(content))
+    return pd.read_parquet(BytesIO(content))
+
+
+# Örnek, sonuç ve istatistik tablolarını sabit anahtarlı, tipli sütunlarla tek bir zip arşivine yaz
+# Gen ve grup sütunları kategorik (sözlük kodlu) olarak saklanır; etiket listeleri metadata.json içindedir
+# panel_matrices: (kontrol hedef, kontrol referans, hasta hedef, hasta referans) ham Ct matrisleri;
+# örnek tablosu bunlardan çift duyarlıklı oluşturulur, böylece yeniden yükleme aynı sonuçları verir
+# efficiency: Pfaffl analizlerinde {"target_amplification": gen başına E, "reference_amplification": {referans gen: E},
+# "weighted_reference": (kontrol, hasta) ağırlıklı referans matrisleri}; None ise 2^(-ΔΔCt) analizidir
+# Ağırlıklı referans Ct'leri örnek tablosuna ayrı sütun olarak yazılır (referans genlerin tek tek Ct'leri saklanmaz)
+def export_analysis(panel_matrices, results, stats, gene_labels, control_label, group_labels, statistics,
+                    archive_format="parquet", efficiency=None):
+    sample_table = SampleTable.from_panel(*panel_matrices, ct_dtype=np.float64)
+    gene_labels = list(gene_labels)
+    group_labels = list(group_labels)
+    all_groups = [control_label] + group_labels
+
+    def categorical(codes, categories):
+        return pd.Categorical.from_codes(np.asarray(codes), categories=categories)
+
+    frames = {
+        "samples": pd.DataFrame({
+            "gene": categorical(sample_table.gene, gene_labels),
+            "group": categorical(sample_table.group, all_groups),
+            "sample_number": sample_table.sample_number,
+            "target_ct": sample_table.target_ct,
+            "reference_ct": sample_table.reference_ct,
+            "delta_ct": sample_table.delta_ct,
+        }),
+        "results": results.assign(
+            gene=categorical(results["gene"], gene_labels),
+            group=categorical(results["group"], group_labels),
+            regulation=results["regulation"].astype(np.int8),
+        ),
+        "stats": stats.assign(
+            gene=categorical(stats["gene"], gene_labels),
+            group=categorical(stats["group"], group_labels),
+            test_type=stats["test_type"].astype("category"),
+            test_method=stats["test_method"].astype("category"),
+        ),
+    }
+    metadata = {
+        "version": ARCHIVE_VERSION,
+        "format": archive_format,
+        "statistics": statistics,
+        "quantification": "delta_delta_ct_method" if efficiency is None else "pfaffl",
+        "genes": gene_labels,
+        "control_group": control_label,
+        "patient_groups": group_labels,
+    }
+    if efficiency is not None:
+        control_target, _, sample_target, _ = panel_matrices
+        # Ağırlıklı referanslar ham matrislerle aynı hücrelerde tanımlıdır; satırlar örnek tablosuyla hizalanır
+        weighted = SampleTable.from_panel(control_target, efficiency["weighted_reference"][0],
+                                          sample_target, efficiency["weighted_reference"][1], ct_dtype=np.float64)
+        frames["samples"]["weighted_reference_ct"] = weighted.reference_ct
+        metadata["target_amplification"] = [float(value) for value in efficiency["target_amplification"]]
+        metadata["reference_amplification"] = {str(gene): float(value) for gene, value in efficiency["reference_amplification"].items()}
+
+    extension = "arrow" if archive_format == "arrow" else "parquet"
+    buffer = BytesIO()
+    # Tablolar zaten sıkıştırılmış (Parquet) ya da bellek eşleme için ham (Arrow) olduğundan zip içinde saklanır
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        archive.writestr(METADATA_NAME, json.dumps(metadata, ensure_ascii=False, indent=2))
+        for name in TABLE_NAMES:
+            archive.writestr(f"{name}.{extension}", _write_table(frames[name], archive_format))
+    return buffer.getvalue()
+
+
+# Arşivi oku; metin ayrıştırması yapılmaz, tablolar tipleriyle birlikte yüklenir
+def import_analysis(source):
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile:
+        raise ValueError("Geçerli bir zip arşivi değil")
+    with archive:
+        try:
+            metadata = json.loads(archive.read(METADATA_NAME))
+        except KeyError:
+            raise ValueError(f"{METADATA_NAME} bulunamadı")
+        if metadata.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"Desteklenmeyen arşiv sürümü: {metadata.get('version')}")
+        archive_format = metadata["format"]
+        extension = "arrow" if archive_format == "arrow" else "parquet"
+        try:
+            tables = {name: _read_table(archive.read(f"{name}.{extension}"), archive_format) for name in TABLE_NAMES}
+        except KeyError as e:
+            raise ValueError(f"Arşivde eksik tablo: {e}")
+    return {"metadata": metadata, **tables}
+
+
+# Arşivdeki örnek tablosundan analiz motorunun beklediği Ct matrislerini yeniden oluştur
+def archive_panel(archive):
+    metadata = archive["metadata"]
+    samples = archive["samples"]
+    gene_labels = metadata["genes"]
+    group_labels = metadata["patient_groups"]
+    all_groups = [metadata["control_group"]] + group_labels
+
+    gene = pd.Categorical(samples["gene"], categories=gene_labels).codes.astype(code_dtype(len(gene_labels)))
+    group = pd.Categorical(samples["group"], categories=all_groups).codes.astype(code_dtype(len(all_groups)))
+    sample_number = samples["sample_number"].to_numpy(code_dtype(int(samples["sample_number"].to_numpy().max(initial=0)) + 1))
+
+    def matrices(reference_ct):
+        return SampleTable(
+            gene=gene,
+            group=group,
+            sample_number=sample_number,
+            # Ct sütunları saklandıkları tiple okunur (tek duyarlıklı eski arşivler to_matrices'te yuvarlanır)
+            target_ct=samples["target_ct"].to_numpy(),
+            reference_ct=reference_ct,
+            delta_ct=samples["delta_ct"].to_numpy(),
+            num_genes=len(gene_labels),
+            num_groups=len(all_groups),
+        ).to_matrices()
+
+    control_target, control_reference, sample_target, sample_reference = matrices(samples["reference_ct"].to_numpy())
+    panel = {
+        "genes": gene_labels,
+        "control_group": metadata["control_group"],
+        "patient_groups": group_labels,
+        "statistics": metadata["statistics"],
+        # Sürüm 1 arşivlerinin ilk örneklerinde bu anahtar yoktur; onlar her zaman 2^(-ΔΔCt) analizidir
+        "quantification": metadata.get("quantification", "delta_delta_ct_method"),
+        "control_target": control_target,
+        "control_reference": control_reference,
+        "sample_target": sample_target,
+        "sample_reference": sample_reference,
+    }
+    if panel["quantification"] == "pfaffl":
+        if "weighted_reference_ct" not in samples or "target_amplification" not in metadata:
+            raise ValueError("Pfaffl arşivinde amplifikasyon faktörleri eksik")
+        _, weighted_control, _, weighted_sample = matrices(samples["weighted_reference_ct"].to_numpy())
+        panel.update(
+            target_amplification=np.asarray(metadata["target_amplification"], dtype=float),
+            reference_amplification=metadata["reference_amplification"],
+            weighted_control_reference=weighted_control,
+            weighted_sample_reference=weighted_sample,
+        )
+    return panel
+
+
+# Yüklenen arşivi içerik özetine göre önbellekten oku
+def import_analysis_cached(uploaded_file):
+    content = uploaded_file.getvalue()
+    key = hash_arrays(np.frombuffer(content, dtype=np.uint8))
+    return archive_cache.get_or_compute(key, lambda: archive_panel(import_analysis(BytesIO(content))))
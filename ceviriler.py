@@ -0,0 +1,1021 @@
+import functools
+
+import pandas as pd
+
+from analiz import DOWNREGULATED, NO_CHANGE, UPREGULATED
+from on_isleme import REMOVAL_REASONS
+
+translations = {
+    "tr": {
+        "title": "🧬 Gen Ekspresyon Analizi Uygulaması",
+        "subtitle": "B. Yalçınkaya tarafından geliştirildi",
+        "patient_data_header": "📊 Hasta ve Kontrol Grubu Verisi Girin",
+        "num_target_genes": "🔹 Hedef Gen Sayısını Girin",
+        "num_patient_groups": "🔹 Hasta Grubu Sayısını Girin",
+        "sample_number": "Örnek Numarası",
+        "Grup": "Grup",
+        "x_axis_title": "Grup Adı",
+        "ct_value": "Ct Değeri",
+        "reference_ct": "Referans Ct",
+        "delta_ct_control": "ΔCt (Kontrol)",
+        "delta_ct_patient": "ΔCt (Hasta)",
+        "warning_empty_input": "⚠️ Dikkat: Verileri alt alta yazın veya boşluk içeren hücre olmayacak şekilde excelden kopyalayıp yapıştırın.",
+        "download_csv": "📥 CSV İndir",
+        "generate_pdf": "📥 PDF Raporu Hazırla",
+        "pdf_report": "Gen Ekspresyon Analizi Raporu",
+        "statistics": "istatistiksel Sonuçlar",
+        "nil_mine": "📊 Sonuçlar",
+        "gr_tbl": "📋 Giriş Verileri Tablosu",
+        "control_group": "🧬 Kontrol Grubu",
+        "ctrl_trgt_ct": "🟦 Kontrol Grubu Hedef Gen {i} Ct Değerleri",
+        "ctrl_ref_ct": "🟦 Kontrol Grubu Referans Gen {i} Ct Değerleri",
+        "hst_trgt_ct": "🩸 Hasta Grubu Hedef Gen {j} Ct Değerleri",
+        "hst_ref_ct": "🩸 Hasta Grubu Referans Gen {j} Ct Değerleri",
+        "warning_control_ct": "⚠️ Dikkat: Kontrol Grubu {i} verilerini alt alta yazın veya boşluk içeren hücre olmayacak şekilde Excel'den kopyalayıp yapıştırın.",
+        "warning_patient_ct": "⚠️ Dikkat: Hasta grubu Ct verilerini alt alta yazın veya boşluk içeren hücre olmayacak şekilde Excel'den kopyalayıp yapıştırın.",
+        "target_gene": "Hedef Gen",
+        "reference_gene": "Referans Gen",
+        "target_ct": "Hedef Gen Ct",
+        "distribution_graph": "Dağılım Grafiği",
+        "error_missing_control_data": "⚠️ Hata: Kontrol Grubu için {gene} verileri eksik!",
+        "control_group_avg": "Kontrol Grubu Ortalama",
+        "avg": "Ortalama",
+        "control": "Kontrol",
+        "sample": "Örnek",
+        "patient": "Hasta",
+        "delta_ct_distribution": "ΔCt Dağılımı",
+        "delta_ct_value": "ΔCt Değeri",
+        "parametric": "Parametrik",
+        "non_parametric": "Nonparametrik",
+        "t_test": "t-test",
+        "welch_t_test": "Welch t-testi",
+        "mann_whitney_u_test": "Mann-Whitney U testi",
+        "significant": "Anlamlı",
+        "insignificant": "Anlamsız",
+        "test_type": "Test Türü",
+        "test_method": "Kullanılan Test",
+        "test_pvalue": "Test P-değeri",
+        "adjusted_pvalue": "Düzeltilmiş P-değeri (BH)",
+        "significance": "Anlamlılık",
+        "delta_delta_ct": "ΔΔCt",
+        "gene_expression_change": "Gen Ekspresyon Değişimi (2^(-ΔΔCt))",
+        "regulation_status": "Regülasyon Durumu",
+        "no_change": "Değişim Yok",
+        "upregulated": "Yukarı Regüle",
+        "downregulated": "Aşağı Regüle",
+        "report_title": "Gen Ekspresyon Analizi Raporu",
+        "input_data_table": "Giriş Verileri Tablosu",
+        "results": "Sonuçlar",
+        "statistical_results": "📈 İstatistiksel Sonuçlar",
+        "statistical_evaluation": "İstatistiksel Değerlendirme",
+        "significance": "Anlamlılık",
+        "target_gene": "Hedef Gen",
+        "patient_group": "🩸 Hasta Grubu",
+        "expression_change": "Gen Ekspresyon Değişimi",
+        "regulation_status": "Regülasyon Durumu",
+        "generate_pdf": "PDF Oluştur",
+        "pdf_report": "Gen Ekspresyon Raporu",
+        "error_no_data": "Veri bulunamadı, PDF oluşturulamadı.",
+        "input_mode": "🔹 Veri Giriş Yöntemi",
+        "manual_input": "Elle Giriş",
+        "file_input": "Dosya Yükleme (CSV/TSV/XLSX)",
+        "upload_file": "qPCR dışa aktarım dosyası (sample, group, gene, role, ct sütunları)",
+        "control_group_select": "Kontrol Grubu",
+        "file_error": "⚠️ Hata: Dosya okunamadı.",
+        "file_report": "{rows} satır okundu. Atlanan: {unknown_role} bilinmeyen rol, {no_reference} referanssız hedef.",
+        "bootstrap_ci": "Bootstrap güven aralığı hesapla (2^(-ΔΔCt), %95)",
+        "bootstrap_resamples": "Yeniden örnekleme sayısı",
+        "bootstrap_method": "Güven aralığı yöntemi",
+        "percentile": "Yüzdelik",
+        "bca": "BCa",
+        "ci_lower": "GA Alt Sınır",
+        "ci_upper": "GA Üst Sınır",
+        "test_selection": "🔹 İstatistiksel Test Seçimi",
+        "automatic_selection": "Otomatik (Shapiro-Wilk → t-test / Mann-Whitney U)",
+        "permutation_test": "Permütasyon testi",
+        "charts_per_page": "Sayfa başına grafik",
+        "page": "Sayfa",
+        "heatmap_overview": "Panel Genel Görünümü (log2 Gen Ekspresyon Değişimi)",
+        "cluster_genes": "Hiyerarşik kümelemeye göre sırala",
+        "pdf_summarize_raw": "PDF'te ham veriler yerine özet tablo kullan",
+        "pdf_include_charts": "Grafikleri PDF'e ekle",
+        "static_rendering_unavailable": "Grafikleri PDF'e eklemek için kaleido paketi gereklidir.",
+        "static_rendering_failed": "Bazı grafikler görüntüye dönüştürülemedi ve rapora eklenmedi.",
+        "report_charts": "Grafikler",
+        "report_in_progress": "PDF raporu hazırlanıyor...",
+        "cancel": "İptal",
+        "report_cancelled": "Rapor hazırlama iptal edildi.",
+        "report_failed": "Rapor hazırlanamadı",
+        "archive_input": "Analiz Arşivi",
+        "upload_archive": "Analiz arşivini yükleyin (zip)",
+        "archive_loaded": "Arşiv yüklendi (kaydedildiği istatistik modu: {statistics}).",
+        "archive_format": "Arşiv biçimi",
+        "download_archive": "📥 Analiz Arşivini İndir",
+        "shared_reference": "Ortak referans genler kullan (geometrik ortalama)",
+        "num_reference_genes": "Referans gen sayısı",
+        "quantification_method": "Miktar belirleme yöntemi",
+        "delta_delta_ct_method": "2^(-ΔΔCt) (%100 verimlilik)",
+        "pfaffl": "Pfaffl (verimlilik düzeltmeli)",
+        "upload_standard_curve": "Standart eğri dosyasını yükleyin (gen, miktar, Ct)",
+        "standard_curves": "Standart Eğriler",
+        "slope": "Eğim",
+        "intercept": "Kesişim",
+        "amplification_factor": "Amplifikasyon faktörü (E)",
+        "efficiency_percent": "Verimlilik (%)",
+        "reference_curves": "Referans gen eğrileri",
+        "missing_standard_curve": "Standart eğrisi olmayan veya kabul aralığı dışında kalan ({min_amplification} < E ≤ {max_amplification}, R² ≥ {min_r_squared}) genler için %100 verimlilik kullanıldı: {genes}",
+        "aggregate_replicates": "Teknik tekrarların ortalamasını al",
+        "ct_cutoff": "Ct eşiği (üzeri amplifikasyon yok sayılır)",
+        "outlier_method": "Aykırı kuyu filtresi",
+        "outlier_none": "Yok",
+        "outlier_sd": "SD eşiği",
+        "outlier_grubbs": "Grubbs testi (α = 0,05)",
+        "sd_threshold": "Tekrar SD eşiği (döngü)",
+        "preprocess_report": "{wells} kuyu, {replicate_groups} teknik tekrar grubu ({averaged} grubun ortalaması alındı). Çıkarılan: {undetermined} belirsiz Ct, {above_cutoff} eşik üstü Ct, {outlier} aykırı kuyu; {empty_groups} grupta geçerli kuyu kalmadı.",
+        "removed_wells": "Çıkarılan kuyular",
+        "removal_reason": "Neden",
+        "removal_undetermined": "Belirsiz Ct",
+        "removal_above_cutoff": "Eşik üstü Ct",
+        "removal_outlier": "Aykırı kuyu",
+        "well_role": "Rol",
+        "gene": "Gen",
+        "invalid_ct_tokens": "⚠️ {count} değer sayıya çevrilemedi ve yok sayıldı (satır: değer): {tokens}",
+        "show_memory_usage": "Bellek kullanımını göster",
+        "memory_report": "Bu oturum: {session:.2f} MB · Örnek tablosu: {table:.2f} MB · Paylaşılan önbellekler (tüm oturumlar): {shared:.2f} MB",
+        "compress_exports": "CSV dosyalarını gzip ile sıkıştır (.csv.gz)",
+        "download_xlsx": "📥 Excel (XLSX) İndir",
+        "sheet_raw_ct": "Ham Ct",
+        "sheet_delta_ct": "ΔCt",
+        "sheet_results": "ΔΔCt ve Ekspresyon Değişimi",
+        "sheet_statistics": "İstatistik",
+        "ideal_efficiency": "Eğri yok (%100 verimlilik)",
+        "archived_efficiency": "Arşivde kaydedilen amplifikasyon faktörleri kullanılıyor. Yeniden hesaplamak için standart eğri dosyası yükleyin.",
+        "usable_curve": "Kullanılabilir",
+        "statistical_explanation": (
+            "İstatistiksel değerlendirme sürecinde veri dağılımı Shapiro-Wilk testi ile analiz edilmiştir. "
+            "Normallik sağlanırsa, gruplar arasındaki varyans eşitliği Levene testi ile kontrol edilmiştir. "
+            "Varyans eşitliği varsa bağımsız örneklem t-testi, yoksa Welch t-testi uygulanmıştır. "
+            "Normal dağılım sağlanmazsa, parametrik olmayan Mann-Whitney U testi kullanılmıştır. "
+            "Sonuçların anlamlılığı p < 0.05 kriterine göre belirlenmiştir. "
+            "<b>Öneri ve destekleriniz için:</b> Burhanettin Yalçınkaya - mail: mailtoburhanettin@gmail.com"
+        )
+    },
+
+    "en": {
+        "title": "🧬 Gene Expression Analysis Application",
+        "subtitle": "Developed by B. Yalçınkaya",
+        "patient_data_header": "📊 Enter Patient and Control Group Data",
+        "num_target_genes": "🔹 Enter the Number of Target Genes",
+        "num_patient_groups": "🔹 Enter the Number of Patient Groups",
+        "sample_number": "Sample Number",
+        "Grup": "Group",
+        "x_axis_title": "Grup Name",
+        "ct_value": "Ct Value",
+        "reference_ct": "Reference Ct",
+        "delta_ct_control": "ΔCt (Control)",
+        "delta_ct_patient": "ΔCt (Patient)",
+        "warning_empty_input": "⚠️ Warning: Write data one below the other or copy-paste without empty cells from Excel.",
+        "download_csv": "📥 Download CSV",
+        "generate_pdf": "📥 Prepare PDF Report",
+        "pdf_report": "Gene Expression Analysis Report",
+        "nil_mine": "📊 Results",
+        "gr_tbl": "📋 Input Data Table",
+        "control_group": "🧬 Control Group",
+        "ctrl_trgt_ct": "🟦 Control Group Target Gene {i} Ct Values",
+        "ctrl_ref_ct": "🟦 Control Group Reference Gene {i} Ct Values",
+        "hst_trgt_ct": "🩸 Patient Group Target Gene {j} Ct Values",
+        "hst_ref_ct": "🩸 Patient Group Reference Gene {j} Ct Values",
+        "warning_control_ct": "⚠️ Warning: Control Group {i} data should be entered line by line or copied from Excel without empty cells.",
+        "warning_patient_ct": "⚠️ Warning: Enter patient group Ct values line by line or copy-paste from Excel without empty cells.",
+        "target_gene": "Target Gene",
+        "reference_gene": "Reference Gen",
+        "target_ct": "Target Gene Ct", 
+        "distribution_graph": "Distribution Graph",
+        "error_missing_control_data": "⚠️ Error: Missing data for {gene} in the Control Group!",
+        "control_group_avg": "Control Group Average",
+        "avg": "Average",
+        "control": "Control",
+        "sample": "Sample",
+        "patient": "Patient",
+        "delta_ct_distribution": "ΔCt Distribution",
+        "delta_ct_value": "ΔCt Value",
+        "parametric": "Parametric",
+        "non_parametric": "Nonparametric",
+        "t_test": "t-test",
+        "welch_t_test": "Welch t-test",
+        "mann_whitney_u_test": "Mann-Whitney U test",
+        "significant": "Significant",
+        "insignificant": "Insignificant",
+        "test_type": "Test Type",
+        "test_method": "Test Method",
+        "test_pvalue": "Test P-value",
+        "adjusted_pvalue": "Adjusted P-value (BH)",
+        "significance": "Significance",
+        "delta_delta_ct": "ΔΔCt",
+        "gene_expression_change": "Gene Expression Change (2^(-ΔΔCt))",
+        "regulation_status": "Regulation Status",
+        "no_change": "No Change",
+        "upregulated": "Upregulated",
+        "downregulated": "Downregulated",
+        "report_title": "Gene Expression Analysis Report",
+        "input_data_table": "Input Data Table",
+        "results": "Results",
+        "statistical_results": "📈 Statistical Results",
+        "statistical_evaluation": "Statistical Evaluation",
+        "significance": "Significance",
+        "target_gene": "Target Gene",
+        "patient_group": "🩸 Patient Group",
+        "expression_change": "Gene Expression Change",
+        "regulation_status": "Regulation Status",
+        "generate_pdf": "Generate PDF",
+        "pdf_report": "Gene Expression Report",
+        "error_no_data": "No data found, PDF could not be generated.",
+        "input_mode": "🔹 Data Input Method",
+        "manual_input": "Manual Entry",
+        "file_input": "File Upload (CSV/TSV/XLSX)",
+        "upload_file": "qPCR export file (sample, group, gene, role, ct columns)",
+        "control_group_select": "Control Group",
+        "file_error": "⚠️ Error: The file could not be read.",
+        "file_report": "{rows} rows read. Skipped: {unknown_role} unknown role, {no_reference} targets without reference.",
+        "bootstrap_ci": "Compute bootstrap confidence intervals (2^(-ΔΔCt), 95%)",
+        "bootstrap_resamples": "Number of resamples",
+        "bootstrap_method": "Interval method",
+        "percentile": "Percentile",
+        "bca": "BCa",
+        "ci_lower": "CI Lower",
+        "ci_upper": "CI Upper",
+        "test_selection": "🔹 Statistical Test Selection",
+        "automatic_selection": "Automatic (Shapiro-Wilk → t-test / Mann-Whitney U)",
+        "permutation_test": "Permutation test",
+        "charts_per_page": "Charts per page",
+        "page": "Page",
+        "heatmap_overview": "Panel Overview (log2 Gene Expression Change)",
+        "cluster_genes": "Order by hierarchical clustering",
+        "pdf_summarize_raw": "Use a summary table instead of raw data in the PDF",
+        "pdf_include_charts": "Include charts in the PDF",
+        "static_rendering_unavailable": "The kaleido package is required to include charts in the PDF.",
+        "static_rendering_failed": "Some charts could not be rendered and were left out of the report.",
+        "report_charts": "Charts",
+        "report_in_progress": "Preparing PDF report...",
+        "cancel": "Cancel",
+        "report_cancelled": "Report generation was cancelled.",
+        "report_failed": "Report generation failed",
+        "archive_input": "Analysis Archive",
+        "upload_archive": "Upload analysis archive (zip)",
+        "archive_loaded": "Archive loaded (saved with statistics mode: {statistics}).",
+        "archive_format": "Archive format",
+        "download_archive": "📥 Download Analysis Archive",
+        "shared_reference": "Use shared reference genes (geometric mean)",
+        "num_reference_genes": "Number of reference genes",
+        "quantification_method": "Quantification method",
+        "delta_delta_ct_method": "2^(-ΔΔCt) (100% efficiency)",
+        "pfaffl": "Pfaffl (efficiency-corrected)",
+        "upload_standard_curve": "Upload standard curve file (gene, quantity, Ct)",
+        "standard_curves": "Standard Curves",
+        "slope": "Slope",
+        "intercept": "Intercept",
+        "amplification_factor": "Amplification factor (E)",
+        "efficiency_percent": "Efficiency (%)",
+        "reference_curves": "Reference gene curves",
+        "missing_standard_curve": "100% efficiency was used for genes without a standard curve or outside the acceptance range ({min_amplification} < E ≤ {max_amplification}, R² ≥ {min_r_squared}): {genes}",
+        "aggregate_replicates": "Average technical replicates",
+        "ct_cutoff": "Ct cutoff (higher values count as no amplification)",
+        "outlier_method": "Outlier well filter",
+        "outlier_none": "None",
+        "outlier_sd": "SD threshold",
+        "outlier_grubbs": "Grubbs test (α = 0.05)",
+        "sd_threshold": "Replicate SD threshold (cycles)",
+        "preprocess_report": "{wells} wells, {replicate_groups} technical replicate groups ({averaged} averaged). Removed: {undetermined} undetermined Ct, {above_cutoff} Ct above cutoff, {outlier} outlier wells; {empty_groups} groups have no valid wells left.",
+        "removed_wells": "Removed wells",
+        "removal_reason": "Reason",
+        "removal_undetermined": "Undetermined Ct",
+        "removal_above_cutoff": "Ct above cutoff",
+        "removal_outlier": "Outlier well",
+        "well_role": "Role",
+        "gene": "Gene",
+        "invalid_ct_tokens": "⚠️ {count} values could not be read as numbers and were ignored (line: value): {tokens}",
+        "show_memory_usage": "Show memory usage",
+        "memory_report": "This session: {session:.2f} MB · Sample table: {table:.2f} MB · Shared caches (all sessions): {shared:.2f} MB",
+        "compress_exports": "Compress CSV files with gzip (.csv.gz)",
+        "download_xlsx": "📥 Download Excel (XLSX)",
+        "sheet_raw_ct": "Raw Ct",
+        "sheet_delta_ct": "ΔCt",
+        "sheet_results": "ΔΔCt and Fold Change",
+        "sheet_statistics": "Statistics",
+        "ideal_efficiency": "No curve (100% efficiency)",
+        "archived_efficiency": "Using the amplification factors saved in the archive. Upload a standard curve file to recompute them.",
+        "usable_curve": "Usable",
+        "statistical_explanation": (
+            "During the statistical evaluation process, data distribution was analyzed using the Shapiro-Wilk test. "
+            "If normality was met, variance homogeneity between groups was checked with Levene’s test. "
+            "If variance was equal, an independent sample t-test was applied; otherwise, a Welch t-test was used. "
+            "If normal distribution was not achieved, the non-parametric Mann-Whitney U test was applied. "
+            "Significance was determined using the p < 0.05 criterion."
+            "For suggestions and support, Burhanettin Yalçinkaya - email: mailtoburhanettin@gmail.com"
+        )
+    },
+
+    "de": {
+        "title": "🧬 Genexpression-Analyseanwendung",
+        "subtitle": "Entwickelt von B. Yalçınkaya",
+        "patient_data_header": "📊 Geben Sie Patientendaten und Kontrollgruppen ein",
+        "num_target_genes": "🔹 Geben Sie die Anzahl der Zielgene ein",
+        "num_patient_groups": "🔹 Geben Sie die Anzahl der Patientengruppen ein",
+        "sample_number": "Beispielnummer",
+        "Grup": "Gruppe",
+        "x_axis_title": "Gruppenname",
+        "ct_value": "Ct-Wert",
+        "reference_ct": "Referenz Ct",
+        "delta_ct_control": "ΔCt (Kontrolle)",
+        "delta_ct_patient": "ΔCt (Patientendaten)",
+        "warning_empty_input": "⚠️ Warnung: Geben Sie die Daten untereinander ein oder kopieren Sie sie ohne leere Zellen aus Excel.",
+        "download_csv": "📥 CSV herunterladen",
+        "generate_pdf": "📥 PDF-Bericht erstellen",
+        "pdf_report": "Genexpression-Analysebericht",
+        "statistics": "Statistische Ergebnisse",
+        "nil_mine": "📊 Ergebnisse",
+        "gr_tbl": "📋 Eingabedaten Tabelle",
+        "control_group": "🧬 Kontroll gruppe",
+        "ctrl_trgt_ct": "🟦 Kontrollgruppe Zielgen {i} Ct-Werte",
+        "ctrl_ref_ct": "🟦 Kontrollgruppe Referenz {i} Ct-Werte",
+        "hst_trgt_ct": "🩸 Patientendaten gruppe Zielgen {j} Ct-Werte",
+        "hst_ref_ct": "🩸 Patientendaten gruppe Referenz {j} Ct-Werte",
+        "warning_control_ct": "⚠️ Achtung: Kontrollgruppe {i} Daten sollten untereinander eingegeben oder aus Excel ohne leere Zellen eingefügt werden.",
+        "warning_patient_ct": "⚠️ Achtung: Geben Sie die Ct-Werte der Patientendaten gruppe untereinander ein oder kopieren Sie sie aus Excel ohne leere Zellen.",
+        "target_gene": "Zielgen",
+        "reference_gene": "Referenzgen",
+        "target_ct": "Zielgen Ct",
+        "distribution_graph": "Verteilungsdiagramm",
+        "error_missing_control_data": "⚠️ Fehler: Fehlende Daten für {gene} in der Kontrollgruppe!",
+        "control_group_avg": "Durchschnitt der Kontrollgruppe",
+        "avg": "Durchschnitt",
+        "control": "Kontrolle",
+        "sample": "Probe",
+        "patient": "Patient",
+        "delta_ct_distribution": "ΔCt-Verteilung",
+        "delta_ct_value": "ΔCt-Wert",
+        "parametric": "Parametrisch",
+        "non_parametric": "Nicht parametrisch",
+        "t_test": "t-Test",
+        "welch_t_test": "Welch-t-Test",
+        "mann_whitney_u_test": "Mann-Whitney U-Test",
+        "significant": "Signifikant",
+        "insignificant": "Nicht signifikant",
+        "test_type": "Testtyp",
+        "test_method": "Verwendeter Test",
+        "test_pvalue": "P-Wert",
+        "adjusted_pvalue": "Adjustierter P-Wert (BH)",
+        "significance": "Bedeutung",
+        "delta_delta_ct": "ΔΔCt",
+        "gene_expression_change": "Genexpression Veränderung (2^(-ΔΔCt))",
+        "regulation_status": "Regulierungsstatus",
+        "no_change": "Keine Veränderung",
+        "upregulated": "Hochreguliert",
+        "downregulated": "Herunterreguliert",
+        "report_title": "Genexpressionsanalysebericht",
+        "input_data_table": "Eingabedatentabelle",
+        "results": "Ergebnisse",
+        "statistical_results": "📈 Statistische Ergebnisse",
+        "statistical_evaluation": "Statistische Auswertung",
+        "significance": "Signifikanz",
+        "target_gene": "Zielgen",
+        "patient_group": "🩸 Patientengruppe",
+        "expression_change": "Genexpressionsänderung",
+        "regulation_status": "Regulierungsstatus",
+        "generate_pdf": "PDF Erstellen",
+        "pdf_report": "Genexpressionsbericht",
+        "error_no_data": "Keine Daten gefunden, PDF konnte nicht erstellt werden.",
+        "input_mode": "🔹 Dateneingabemethode",
+        "manual_input": "Manuelle Eingabe",
+        "file_input": "Datei-Upload (CSV/TSV/XLSX)",
+        "upload_file": "qPCR-Exportdatei (Spalten sample, group, gene, role, ct)",
+        "control_group_select": "Kontrollgruppe",
+        "file_error": "⚠️ Fehler: Die Datei konnte nicht gelesen werden.",
+        "file_report": "{rows} Zeilen gelesen. Übersprungen: {unknown_role} unbekannte Rolle, {no_reference} Zielwerte ohne Referenz.",
+        "bootstrap_ci": "Bootstrap-Konfidenzintervalle berechnen (2^(-ΔΔCt), 95 %)",
+        "bootstrap_resamples": "Anzahl der Resamples",
+        "bootstrap_method": "Intervallmethode",
+        "percentile": "Perzentil",
+        "bca": "BCa",
+        "ci_lower": "KI Untergrenze",
+        "ci_upper": "KI Obergrenze",
+        "test_selection": "🔹 Auswahl des statistischen Tests",
+        "automatic_selection": "Automatisch (Shapiro-Wilk → t-Test / Mann-Whitney U)",
+        "permutation_test": "Permutationstest",
+        "charts_per_page": "Diagramme pro Seite",
+        "page": "Seite",
+        "heatmap_overview": "Panelübersicht (log2 Genexpressionsänderung)",
+        "cluster_genes": "Nach hierarchischem Clustering sortieren",
+        "pdf_summarize_raw": "Im PDF eine Übersichtstabelle statt Rohdaten verwenden",
+        "pdf_include_charts": "Diagramme in das PDF aufnehmen",
+        "static_rendering_unavailable": "Für Diagramme im PDF wird das Paket kaleido benötigt.",
+        "static_rendering_failed": "Einige Diagramme konnten nicht gerendert werden und fehlen im Bericht.",
+        "report_charts": "Diagramme",
+        "report_in_progress": "PDF-Bericht wird erstellt...",
+        "cancel": "Abbrechen",
+        "report_cancelled": "Die Berichterstellung wurde abgebrochen.",
+        "report_failed": "Berichterstellung fehlgeschlagen",
+        "archive_input": "Analysearchiv",
+        "upload_archive": "Analysearchiv hochladen (zip)",
+        "archive_loaded": "Archiv geladen (gespeichert mit Statistikmodus: {statistics}).",
+        "archive_format": "Archivformat",
+        "download_archive": "📥 Analysearchiv herunterladen",
+        "shared_reference": "Gemeinsame Referenzgene verwenden (geometrisches Mittel)",
+        "num_reference_genes": "Anzahl der Referenzgene",
+        "quantification_method": "Quantifizierungsmethode",
+        "delta_delta_ct_method": "2^(-ΔΔCt) (100 % Effizienz)",
+        "pfaffl": "Pfaffl (effizienzkorrigiert)",
+        "upload_standard_curve": "Standardkurvendatei hochladen (Gen, Menge, Ct)",
+        "standard_curves": "Standardkurven",
+        "slope": "Steigung",
+        "intercept": "Achsenabschnitt",
+        "amplification_factor": "Amplifikationsfaktor (E)",
+        "efficiency_percent": "Effizienz (%)",
+        "reference_curves": "Referenzgen-Kurven",
+        "missing_standard_curve": "Für Gene ohne Standardkurve oder außerhalb des Akzeptanzbereichs ({min_amplification} < E ≤ {max_amplification}, R² ≥ {min_r_squared}) wurde 100 % Effizienz verwendet: {genes}",
+        "aggregate_replicates": "Technische Replikate mitteln",
+        "ct_cutoff": "Ct-Grenzwert (höhere Werte gelten als keine Amplifikation)",
+        "outlier_method": "Ausreißer-Filter für Wells",
+        "outlier_none": "Keiner",
+        "outlier_sd": "SD-Schwellenwert",
+        "outlier_grubbs": "Grubbs-Test (α = 0,05)",
+        "sd_threshold": "SD-Schwellenwert der Replikate (Zyklen)",
+        "preprocess_report": "{wells} Wells, {replicate_groups} technische Replikatgruppen ({averaged} gemittelt). Entfernt: {undetermined} unbestimmte Ct, {above_cutoff} Ct über dem Grenzwert, {outlier} Ausreißer-Wells; {empty_groups} Gruppen ohne gültige Wells.",
+        "removed_wells": "Entfernte Wells",
+        "removal_reason": "Grund",
+        "removal_undetermined": "Unbestimmter Ct",
+        "removal_above_cutoff": "Ct über Grenzwert",
+        "removal_outlier": "Ausreißer-Well",
+        "well_role": "Rolle",
+        "gene": "Gen",
+        "invalid_ct_tokens": "⚠️ {count} Werte konnten nicht als Zahl gelesen werden und wurden ignoriert (Zeile: Wert): {tokens}",
+        "show_memory_usage": "Speicherverbrauch anzeigen",
+        "memory_report": "Diese Sitzung: {session:.2f} MB · Probentabelle: {table:.2f} MB · Gemeinsame Caches (alle Sitzungen): {shared:.2f} MB",
+        "compress_exports": "CSV-Dateien mit gzip komprimieren (.csv.gz)",
+        "download_xlsx": "📥 Excel (XLSX) herunterladen",
+        "sheet_raw_ct": "Roh-Ct",
+        "sheet_delta_ct": "ΔCt",
+        "sheet_results": "ΔΔCt und Expressionsänderung",
+        "sheet_statistics": "Statistik",
+        "ideal_efficiency": "Keine Kurve (100 % Effizienz)",
+        "archived_efficiency": "Die im Archiv gespeicherten Amplifikationsfaktoren werden verwendet. Laden Sie eine Standardkurvendatei hoch, um sie neu zu berechnen.",
+        "usable_curve": "Verwendbar",
+        "statistical_explanation": (
+            "Während des statistischen Bewertungsprozesses wurde die Datenverteilung mit dem Shapiro-Wilk-Test analysiert. "
+            "Wenn die Normalität erfüllt war, wurde die Varianzhomogenität zwischen den Gruppen mit dem Levene-Test überprüft. "
+            "War die Varianz gleich, wurde ein unabhängiger Stichprobent-Test angewendet; andernfalls wurde ein Welch-T-Test verwendet. "
+            "Wenn keine normale Verteilung vorlag, wurde der nicht-parametrische Mann-Whitney-U-Test angewendet. "
+            "Die Signifikanz wurde anhand des Kriteriums p < 0,05 bestimmt."
+            "Für Vorschläge und Unterstützung, Burhanettin Yalçinkaya - E-Mail: mailtoburhanettin@gmail.com"
+        )
+    },
+    
+    "fr": {
+        "title": "🧬 Application d'Analyse de l'Expression Génétique",
+        "subtitle": "Développé par B. Yalçınkaya",
+        "patient_data_header": "📊 Entrez les données des groupes patients et témoins",
+        "num_target_genes": "🔹 Entrez le nombre de gènes cibles",
+        "num_patient_groups": "🔹 Entrez le nombre de groupes de patients",
+        "sample_number": "Numéro de l'échantillon",
+        "Grup": "Groupe",
+        "x_axis_title": "Nom du Groupe",
+        "ct_value": "Valeur Ct",
+        "reference_ct": "Ct de Référence",
+        "delta_ct_control": "ΔCt (Contrôle)",
+        "delta_ct_patient": "ΔCt (Patient)",
+        "warning_empty_input": "⚠️ Avertissement : Entrez les données sous forme de liste ou copiez-collez sans cellules vides depuis Excel.",
+        "statistical_results": "📈 Résultats Statistiques",
+        "download_csv": "📥 Télécharger CSV",
+        "generate_pdf": "📥 Préparer le Rapport PDF",
+        "pdf_report": "Rapport d'Analyse de l'Expression Génétique",
+        "statistics": "Résultats Statistiques",
+        "nil_mine": "📊 Résultats",
+        "gr_tbl": "📋 Tableau des Données d'Entrée",
+        "control_group": "🧬 Groupe Contrôle",
+        "ctrl_trgt_ct": "🟦 Valeurs Ct du Gène Cible {i} pour le Groupe Contrôle",
+        "ctrl_ref_ct": "🟦 Valeurs Ct du Gène Référence {i} pour le Groupe Contrôle",
+        "hst_trgt_ct": "🩸 Valeurs Ct du Gène Cible {j} pour le Groupe Patient",
+        "hst_ref_ct": "🩸 Valeurs Ct du Gène Référence {j} pour le Groupe Patient",
+        "warning_control_ct": "⚠️ Avertissement : Les données du groupe témoin {i} doivent être saisies ligne par ligne ou copiées depuis Excel sans cellules vides.",
+        "warning_patient_ct": "⚠️ Avertissement : Entrez les valeurs Ct du groupe patient ligne par ligne ou copiez-les depuis Excel sans cellules vides.",
+        "statistical_results": "📈 Résultats Statistiques",
+        "target_gene": "Gène Cible",
+        "reference_gene": "Gène Référence",
+        "target_ct": "Ct du Gène Cible", 
+        "distribution_graph": "Graphique de Distribution",
+        "error_missing_control_data": "⚠️ Erreur : Données manquantes pour {gene} dans le Groupe Contrôle!",
+        "control_group_avg": "Moyenne du Groupe Contrôle",
+        "avg": "Moyenne",
+        "control": "Contrôle",
+        "sample": "Échantillon",
+        "patient": "Patient",
+        "delta_ct_distribution": "Distribution ΔCt",
+        "delta_ct_value": "Valeur ΔCt",
+        "parametric": "Paramétrique",
+        "non_parametric": "Non paramétrique",
+        "t_test": "Test t",
+        "welch_t_test": "Test t de Welch",
+        "mann_whitney_u_test": "Test Mann-Whitney U",
+        "significant": "Significatif",
+        "insignificant": "Non Significatif",
+        "test_type": "Type de Test",
+        "test_method": "Méthode de Test",
+        "test_pvalue": "P-valeur du Test",
+        "adjusted_pvalue": "P-valeur Ajustée (BH)",
+        "significance": "Signification",
+        "delta_delta_ct": "ΔΔCt",
+        "gene_expression_change": "Changement de l'Expression Génétique (2^(-ΔΔCt))",
+        "regulation_status": "Statut de Régulation",
+        "no_change": "Aucun Changement",
+        "upregulated": "Upregulé",
+        "downregulated": "Downregulé",
+        "report_title": "Rapport d'Analyse de l'Expression Génétique",
+        "input_data_table": "Tableau des Données d'Entrée",
+        "results": "Résultats",
+        "statistical_results": "Résultats Statistiques",
+        "statistical_evaluation": "Évaluation Statistique",
+        "significance": "Signification",
+        "target_gene": "Gène Cible",
+        "patient_group": "🩸 Groupe Patient",
+        "expression_change": "Changement de l'Expression Génétique",
+        "regulation_status": "Statut de Régulation",
+        "generate_pdf": "Générer le PDF",
+        "pdf_report": "Rapport sur l'Expression Génétique",
+        "error_no_data": "Aucune donnée trouvée, le PDF n'a pas pu être généré.",
+        "input_mode": "🔹 Méthode de Saisie des Données",
+        "manual_input": "Saisie Manuelle",
+        "file_input": "Téléversement de Fichier (CSV/TSV/XLSX)",
+        "upload_file": "Fichier d'export qPCR (colonnes sample, group, gene, role, ct)",
+        "control_group_select": "Groupe Contrôle",
+        "file_error": "⚠️ Erreur : Le fichier n'a pas pu être lu.",
+        "file_report": "{rows} lignes lues. Ignorées : {unknown_role} rôles inconnus, {no_reference} cibles sans référence.",
+        "bootstrap_ci": "Calculer les intervalles de confiance bootstrap (2^(-ΔΔCt), 95 %)",
+        "bootstrap_resamples": "Nombre de rééchantillonnages",
+        "bootstrap_method": "Méthode d'intervalle",
+        "percentile": "Percentile",
+        "bca": "BCa",
+        "ci_lower": "IC Borne Inférieure",
+        "ci_upper": "IC Borne Supérieure",
+        "test_selection": "🔹 Choix du Test Statistique",
+        "automatic_selection": "Automatique (Shapiro-Wilk → test t / Mann-Whitney U)",
+        "permutation_test": "Test de permutation",
+        "charts_per_page": "Graphiques par page",
+        "page": "Page",
+        "heatmap_overview": "Vue d'Ensemble du Panel (log2 Changement d'Expression)",
+        "cluster_genes": "Trier par classification hiérarchique",
+        "pdf_summarize_raw": "Utiliser un tableau récapitulatif au lieu des données brutes dans le PDF",
+        "pdf_include_charts": "Inclure les graphiques dans le PDF",
+        "static_rendering_unavailable": "Le paquet kaleido est nécessaire pour inclure les graphiques dans le PDF.",
+        "static_rendering_failed": "Certains graphiques n'ont pas pu être rendus et ont été omis du rapport.",
+        "report_charts": "Graphiques",
+        "report_in_progress": "Préparation du rapport PDF...",
+        "cancel": "Annuler",
+        "report_cancelled": "La génération du rapport a été annulée.",
+        "report_failed": "Échec de la génération du rapport",
+        "archive_input": "Archive d'analyse",
+        "upload_archive": "Téléverser l'archive d'analyse (zip)",
+        "archive_loaded": "Archive chargée (enregistrée avec le mode statistique : {statistics}).",
+        "archive_format": "Format d'archive",
+        "download_archive": "📥 Télécharger l'archive d'analyse",
+        "shared_reference": "Utiliser des gènes de référence communs (moyenne géométrique)",
+        "num_reference_genes": "Nombre de gènes de référence",
+        "quantification_method": "Méthode de quantification",
+        "delta_delta_ct_method": "2^(-ΔΔCt) (efficacité de 100 %)",
+        "pfaffl": "Pfaffl (corrigé de l'efficacité)",
+        "upload_standard_curve": "Téléverser le fichier de courbe standard (gène, quantité, Ct)",
+        "standard_curves": "Courbes standard",
+        "slope": "Pente",
+        "intercept": "Ordonnée à l'origine",
+        "amplification_factor": "Facteur d'amplification (E)",
+        "efficiency_percent": "Efficacité (%)",
+        "reference_curves": "Courbes des gènes de référence",
+        "missing_standard_curve": "Une efficacité de 100 % a été utilisée pour les gènes sans courbe standard ou hors de la plage d'acceptation ({min_amplification} < E ≤ {max_amplification}, R² ≥ {min_r_squared}) : {genes}",
+        "aggregate_replicates": "Moyenner les réplicats techniques",
+        "ct_cutoff": "Seuil de Ct (valeurs supérieures considérées sans amplification)",
+        "outlier_method": "Filtre des puits aberrants",
+        "outlier_none": "Aucun",
+        "outlier_sd": "Seuil d'écart type",
+        "outlier_grubbs": "Test de Grubbs (α = 0,05)",
+        "sd_threshold": "Seuil d'écart type des réplicats (cycles)",
+        "preprocess_report": "{wells} puits, {replicate_groups} groupes de réplicats techniques ({averaged} moyennés). Retirés : {undetermined} Ct indéterminés, {above_cutoff} Ct au-dessus du seuil, {outlier} puits aberrants ; {empty_groups} groupes sans puits valide.",
+        "removed_wells": "Puits retirés",
+        "removal_reason": "Raison",
+        "removal_undetermined": "Ct indéterminé",
+        "removal_above_cutoff": "Ct au-dessus du seuil",
+        "removal_outlier": "Puits aberrant",
+        "well_role": "Rôle",
+        "gene": "Gène",
+        "invalid_ct_tokens": "⚠️ {count} valeurs n'ont pas pu être lues comme nombres et ont été ignorées (ligne : valeur) : {tokens}",
+        "show_memory_usage": "Afficher l'utilisation de la mémoire",
+        "memory_report": "Cette session : {session:.2f} Mo · Table des échantillons : {table:.2f} Mo · Caches partagés (toutes les sessions) : {shared:.2f} Mo",
+        "compress_exports": "Compresser les fichiers CSV avec gzip (.csv.gz)",
+        "download_xlsx": "📥 Télécharger Excel (XLSX)",
+        "sheet_raw_ct": "Ct bruts",
+        "sheet_delta_ct": "ΔCt",
+        "sheet_results": "ΔΔCt et variation d'expression",
+        "sheet_statistics": "Statistiques",
+        "ideal_efficiency": "Aucune courbe (efficacité 100 %)",
+        "archived_efficiency": "Les facteurs d'amplification enregistrés dans l'archive sont utilisés. Chargez un fichier de courbes standard pour les recalculer.",
+        "usable_curve": "Utilisable",
+        "statistical_explanation": (
+            "Au cours du processus d'évaluation statistique, la répartition des données a été analysée à l'aide du test de Shapiro-Wilk. "
+            "Si la normalité était remplie, l'homogénéité de la variance entre les groupes a été vérifiée à l'aide du test de Levene. "
+            "Si la variance était égale, un test t pour échantillons indépendants a été appliqué, sinon, un test t de Welch a été utilisé. "
+            "Si aucune distribution normale n'était atteinte, le test non paramétrique de Mann-Whitney U a été appliqué. "
+            "La signification a été déterminée en utilisant le critère p < 0,05."
+            "Pour des suggestions et un soutien, Burhanettin Yalçınkaya - e-mail : mailtoburhanettin@gmail.com"
+        )
+    },
+
+    "es": {
+        "title": "🧬 Aplicación de Análisis de Expresión Génica",
+        "subtitle": "Desarrollado por B. Yalçınkaya",
+        "patient_data_header": "📊 Ingrese Datos de Grupos de Pacientes y de Control",
+        "num_target_genes": "🔹 Ingrese el número de Genes Objetivo",
+        "num_patient_groups": "🔹 Ingrese el número de Grupos de Pacientes",
+        "sample_number": "Número de muestra",
+        "Grup": "Grupo",
+        "x_axis_title": "Nombre del Grupo",
+        "ct_value": "Valor de Ct",
+        "reference_ct": "Ct de Referencia",
+        "delta_ct_control": "ΔCt (Control)",
+        "delta_ct_patient": "ΔCt (Paciente)",
+        "warning_empty_input": "⚠️ Advertencia: Ingrese los datos uno debajo del otro o cópielos sin celdas vacías desde Excel.",
+        "statistical_results": "📈 Resultados Estadísticos",
+        "download_csv": "📥 Descargar CSV",
+        "generate_pdf": "📥 Preparar Informe en PDF",
+        "pdf_report": "Informe de Análisis de Expresión Génica",
+        "statistics": "Resultados Estadísticos",
+        "nil_mine": "📊 Resultados",
+        "gr_tbl": "📋 Tabla de Datos de Entrada",
+        "control_group": "🧬 Grupo Control",
+        "ctrl_trgt_ct": "🟦 Valores Ct del Gen Objetivo {i} para el Grupo Control",
+        "ctrl_ref_ct": "🟦 Valores Ct del Gen de Referencia {i} para el Grupo Control",
+        "hst_trgt_ct": "🩸 Valores Ct del Gen Objetivo {j} para el Grupo Paciente",
+        "hst_ref_ct": "🩸 Valores Ct del Gen de Referencia {j} para el Grupo Paciente",
+        "warning_control_ct": "⚠️ Advertencia: Los datos del grupo control {i} deben ingresarse fila por fila o copiarse desde Excel sin celdas vacías.",
+        "warning_patient_ct": "⚠️ Advertencia: Ingrese los valores de Ct del grupo paciente fila por fila o cópielos desde Excel sin celdas vacías.",
+        "statistical_results": "📈 Resultados Estadísticos",
+        "target_gene": "Gen Objetivo",
+        "reference_gene": "Gen de Referencia",
+        "target_ct": "Ct del Gen Objetivo", 
+        "distribution_graph": "Gráfico de Distribución",
+        "error_missing_control_data": "⚠️ Error: ¡Datos faltantes para {gene} en el Grupo Control!",
+        "control_group_avg": "Promedio del Grupo Control",
+        "avg": "Promedio",
+        "control": "Control",
+        "sample": "Muestra",
+        "patient": "Paciente",
+        "delta_ct_distribution": "Distribución ΔCt",
+        "delta_ct_value": "Valor ΔCt",
+        "parametric": "Paramétrico",
+        "non_parametric": "No paramétrico",
+        "t_test": "Test t",
+        "welch_t_test": "Test t de Welch",
+        "mann_whitney_u_test": "Test Mann-Whitney U",
+        "significant": "Significativo",
+        "insignificant": "No Significativo",
+        "test_type": "Tipo de Test",
+        "test_method": "Método de Test",
+        "test_pvalue": "P-valor del Test",
+        "adjusted_pvalue": "P-valor Ajustado (BH)",
+        "significance": "Significación",
+        "delta_delta_ct": "ΔΔCt",
+        "gene_expression_change": "Cambio de Expresión Génica (2^(-ΔΔCt))",
+        "regulation_status": "Estado de Regulación",
+        "no_change": "Sin Cambio",
+        "upregulated": "Upregulado",
+        "downregulated": "Downregulado",
+        "report_title": "Informe de Análisis de Expresión Génica",
+        "input_data_table": "Tabla de Datos de Entrada",
+        "results": "Resultados",
+        "statistical_results": "Resultados Estadísticos",
+        "statistical_evaluation": "Evaluación Estadística",
+        "significance": "Significación",
+        "target_gene": "Gen Objetivo",
+        "patient_group": "🩸 Grupo Paciente",
+        "expression_change": "Cambio de Expresión Génica",
+        "regulation_status": "Estado de Regulación",
+        "generate_pdf": "Generar PDF",
+        "pdf_report": "Informe de Expresión Génica",
+        "error_no_data": "No se encontraron datos, no se pudo generar el PDF.",
+        "input_mode": "🔹 Método de Entrada de Datos",
+        "manual_input": "Entrada Manual",
+        "file_input": "Carga de Archivo (CSV/TSV/XLSX)",
+        "upload_file": "Archivo de exportación qPCR (columnas sample, group, gene, role, ct)",
+        "control_group_select": "Grupo Control",
+        "file_error": "⚠️ Error: No se pudo leer el archivo.",
+        "file_report": "{rows} filas leídas. Omitidas: {unknown_role} roles desconocidos, {no_reference} objetivos sin referencia.",
+        "bootstrap_ci": "Calcular intervalos de confianza bootstrap (2^(-ΔΔCt), 95 %)",
+        "bootstrap_resamples": "Número de remuestreos",
+        "bootstrap_method": "Método del intervalo",
+        "percentile": "Percentil",
+        "bca": "BCa",
+        "ci_lower": "IC Límite Inferior",
+        "ci_upper": "IC Límite Superior",
+        "test_selection": "🔹 Selección de Prueba Estadística",
+        "automatic_selection": "Automático (Shapiro-Wilk → test t / Mann-Whitney U)",
+        "permutation_test": "Prueba de permutación",
+        "charts_per_page": "Gráficos por página",
+        "page": "Página",
+        "heatmap_overview": "Vista General del Panel (log2 Cambio de Expresión)",
+        "cluster_genes": "Ordenar por agrupamiento jerárquico",
+        "pdf_summarize_raw": "Usar una tabla resumen en lugar de los datos sin procesar en el PDF",
+        "pdf_include_charts": "Incluir gráficos en el PDF",
+        "static_rendering_unavailable": "Se necesita el paquete kaleido para incluir gráficos en el PDF.",
+        "static_rendering_failed": "Algunos gráficos no se pudieron generar y se omitieron del informe.",
+        "report_charts": "Gráficos",
+        "report_in_progress": "Preparando el informe PDF...",
+        "cancel": "Cancelar",
+        "report_cancelled": "Se canceló la generación del informe.",
+        "report_failed": "Error al generar el informe",
+        "archive_input": "Archivo de análisis",
+        "upload_archive": "Subir archivo de análisis (zip)",
+        "archive_loaded": "Archivo cargado (guardado con el modo estadístico: {statistics}).",
+        "archive_format": "Formato de archivo",
+        "download_archive": "📥 Descargar archivo de análisis",
+        "shared_reference": "Usar genes de referencia comunes (media geométrica)",
+        "num_reference_genes": "Número de genes de referencia",
+        "quantification_method": "Método de cuantificación",
+        "delta_delta_ct_method": "2^(-ΔΔCt) (eficiencia del 100 %)",
+        "pfaffl": "Pfaffl (corregido por eficiencia)",
+        "upload_standard_curve": "Subir archivo de curva estándar (gen, cantidad, Ct)",
+        "standard_curves": "Curvas estándar",
+        "slope": "Pendiente",
+        "intercept": "Intersección",
+        "amplification_factor": "Factor de amplificación (E)",
+        "efficiency_percent": "Eficiencia (%)",
+        "reference_curves": "Curvas de genes de referencia",
+        "missing_standard_curve": "Se usó una eficiencia del 100 % para los genes sin curva estándar o fuera del rango de aceptación ({min_amplification} < E ≤ {max_amplification}, R² ≥ {min_r_squared}): {genes}",
+        "aggregate_replicates": "Promediar las réplicas técnicas",
+        "ct_cutoff": "Umbral de Ct (valores superiores se consideran sin amplificación)",
+        "outlier_method": "Filtro de pocillos atípicos",
+        "outlier_none": "Ninguno",
+        "outlier_sd": "Umbral de DE",
+        "outlier_grubbs": "Prueba de Grubbs (α = 0,05)",
+        "sd_threshold": "Umbral de DE de réplicas (ciclos)",
+        "preprocess_report": "{wells} pocillos, {replicate_groups} grupos de réplicas técnicas ({averaged} promediados). Eliminados: {undetermined} Ct indeterminados, {above_cutoff} Ct sobre el umbral, {outlier} pocillos atípicos; {empty_groups} grupos sin pocillos válidos.",
+        "removed_wells": "Pocillos eliminados",
+        "removal_reason": "Motivo",
+        "removal_undetermined": "Ct indeterminado",
+        "removal_above_cutoff": "Ct sobre el umbral",
+        "removal_outlier": "Pocillo atípico",
+        "well_role": "Rol",
+        "gene": "Gen",
+        "invalid_ct_tokens": "⚠️ {count} valores no se pudieron leer como números y se ignoraron (línea: valor): {tokens}",
+        "show_memory_usage": "Mostrar uso de memoria",
+        "memory_report": "Esta sesión: {session:.2f} MB · Tabla de muestras: {table:.2f} MB · Cachés compartidas (todas las sesiones): {shared:.2f} MB",
+        "compress_exports": "Comprimir archivos CSV con gzip (.csv.gz)",
+        "download_xlsx": "📥 Descargar Excel (XLSX)",
+        "sheet_raw_ct": "Ct sin procesar",
+        "sheet_delta_ct": "ΔCt",
+        "sheet_results": "ΔΔCt y cambio de expresión",
+        "sheet_statistics": "Estadísticas",
+        "ideal_efficiency": "Sin curva (eficiencia del 100 %)",
+        "archived_efficiency": "Se usan los factores de amplificación guardados en el archivo. Cargue un archivo de curvas estándar para recalcularlos.",
+        "usable_curve": "Utilizable",
+        "statistical_explanation": (
+            "Durante el proceso de evaluación estadística, se analizó la distribución de los datos mediante la prueba de Shapiro-Wilk. "
+            "Si se cumplió la normalidad, se verificó la homogeneidad de varianza entre los grupos mediante la prueba de Levene. "
+            "Si la varianza era igual, se aplicó la prueba t de muestras independientes; de lo contrario, se utilizó la prueba t de Welch. "
+            "Si no se alcanzó una distribución normal, se aplicó la prueba no paramétrica Mann-Whitney U. "
+            "La significancia se determinó utilizando el criterio p < 0.05."
+            "Para sugerencias y soporte, Burhanettin Yalçınkaya - correo electrónico: mailtoburhanettin@gmail.com"
+        )
+    },
+
+    "ar": {
+        "title": "🧬 تطبيق تحليل التعبير الجيني",
+        "subtitle": "تم تطويره بواسطة ب. يالجنكايا",
+        "patient_data_header": "📊 إدخال بيانات مجموعة المرضى ومجموعة التحكم",
+        "num_target_genes": "🔹 إدخال عدد الجينات المستهدفة",
+        "num_patient_groups": "🔹 إدخال عدد مجموعات المرضى",
+        "sample_number": "رقم العينة",
+        "Grup": "مجموعة",
+        "x_axis_title": "اسم المجموعة",
+        "ct_value": "قيمة Ct",
+        "reference_ct": "قيمة Ct المرجعية",
+        "delta_ct_control": "ΔCt (التحكم)",
+        "delta_ct_patient": "ΔCt (المريض)",
+        "warning_empty_input": "⚠️ تحذير: أدخل البيانات واحدًا تلو الآخر أو انسخها دون خلايا فارغة من Excel.",
+        "statistical_results": "📈 النتائج الإحصائية",
+        "download_csv": "📥 تحميل CSV",
+        "generate_pdf": "📥 إعداد تقرير PDF",
+        "pdf_report": "تقرير تحليل التعبير الجيني",
+        "statistics": "النتائج الإحصائية",
+        "nil_mine": "📊 النتائج",
+        "gr_tbl": "📋 جدول بيانات الإدخال",
+        "control_group": "🧬 مجموعة التحكم",
+        "ctrl_trgt_ct": "🟦 قيم Ct الجين المستهدف {i} لمجموعة التحكم",
+        "ctrl_ref_ct": "🟦 قيم Ct الجين المرجعي {i} لمجموعة التحكم",
+        "hst_trgt_ct": "🩸 قيم Ct الجين المستهدف {j} لمجموعة المرضى",
+        "hst_ref_ct": "🩸 قيم Ct الجين المرجعي {j} لمجموعة المرضى",
+        "warning_control_ct": "⚠️ تحذير: يجب إدخال بيانات مجموعة التحكم {i} سطرًا بسطر أو نسخها من Excel دون خلايا فارغة.",
+        "warning_patient_ct": "⚠️ تحذير: أدخل قيم Ct لمجموعة المرضى سطرًا بسطر أو انسخها من Excel دون خلايا فارغة.",
+        "statistical_results": "📈 النتائج الإحصائية",
+        "target_gene": "الجين المستهدف",
+        "reference_gene": "الجين المرجعي",
+        "target_ct": "قيمة Ct الجين المستهدف", 
+        "distribution_graph": "رسم بياني للتوزيع",
+        "error_missing_control_data": "⚠️ خطأ: بيانات مفقودة للجين المستهدف {gene} في مجموعة التحكم!",
+        "control_group_avg": "متوسط مجموعة التحكم",
+        "avg": "متوسط",
+        "control": "التحكم",
+        "sample": "عينة",
+        "patient": "مريض",
+        "delta_ct_distribution": "توزيع ΔCt",
+        "delta_ct_value": "قيمة ΔCt",
+        "parametric": "معلمي",
+        "non_parametric": "غير معلمي",
+        "t_test": "اختبار t",
+        "welch_t_test": "اختبار t ويلش",
+        "mann_whitney_u_test": "اختبار مان-ويتني U",
+        "significant": "مهم",
+        "insignificant": "غير مهم",
+        "test_type": "نوع الاختبار",
+        "test_method": "طريقة الاختبار",
+        "test_pvalue": "قيمة P للاختبار",
+        "adjusted_pvalue": "قيمة P المعدلة (BH)",
+        "significance": "الدلالة",
+        "delta_delta_ct": "ΔΔCt",
+        "gene_expression_change": "تغيير التعبير الجيني (2^(-ΔΔCt))",
+        "regulation_status": "حالة التنظيم",
+        "no_change": "لا تغيير",
+        "upregulated": "مرتفع التنظيم",
+        "downregulated": "منخفض التنظيم",
+        "report_title": "تقرير تحليل التعبير الجيني",
+        "input_data_table": "جدول بيانات الإدخال",
+        "results": "النتائج",
+        "statistical_results": "النتائج الإحصائية",
+        "statistical_evaluation": "التقييم الإحصائي",
+        "significance": "الدلالة",
+        "target_gene": "الجين المستهدف",
+        "patient_group": "🩸 مجموعة المرضى",
+        "expression_change": "تغيير التعبير الجيني",
+        "regulation_status": "حالة التنظيم",
+        "generate_pdf": "توليد تقرير PDF",
+        "pdf_report": "تقرير التعبير الجيني",
+        "error_no_data": "لم يتم العثور على بيانات، لم يتم إنشاء التقرير PDF.",
+        "input_mode": "🔹 طريقة إدخال البيانات",
+        "manual_input": "إدخال يدوي",
+        "file_input": "تحميل ملف (CSV/TSV/XLSX)",
+        "upload_file": "ملف تصدير qPCR (أعمدة sample, group, gene, role, ct)",
+        "control_group_select": "مجموعة التحكم",
+        "file_error": "⚠️ خطأ: تعذر قراءة الملف.",
+        "file_report": "تمت قراءة {rows} صفًا. تم تخطي: {unknown_role} دور غير معروف، {no_reference} هدف بدون مرجع.",
+        "bootstrap_ci": "حساب فترات الثقة بطريقة Bootstrap (2^(-ΔΔCt)، 95%)",
+        "bootstrap_resamples": "عدد إعادة المعاينة",
+        "bootstrap_method": "طريقة الفترة",
+        "percentile": "المئين",
+        "bca": "BCa",
+        "ci_lower": "الحد الأدنى لفترة الثقة",
+        "ci_upper": "الحد الأعلى لفترة الثقة",
+        "test_selection": "🔹 اختيار الاختبار الإحصائي",
+        "automatic_selection": "تلقائي (شابيرو-ويلك → اختبار t / مان-ويتني U)",
+        "permutation_test": "اختبار التبديل",
+        "charts_per_page": "عدد الرسوم في الصفحة",
+        "page": "الصفحة",
+        "heatmap_overview": "نظرة عامة على اللوحة (log2 تغيير التعبير الجيني)",
+        "cluster_genes": "الترتيب حسب التجميع الهرمي",
+        "pdf_summarize_raw": "استخدام جدول ملخص بدلاً من البيانات الخام في ملف PDF",
+        "pdf_include_charts": "تضمين الرسوم البيانية في ملف PDF",
+        "static_rendering_unavailable": "حزمة kaleido مطلوبة لتضمين الرسوم البيانية في ملف PDF.",
+        "static_rendering_failed": "تعذر تحويل بعض الرسوم البيانية إلى صور ولم تُضمَّن في التقرير.",
+        "report_charts": "الرسوم البيانية",
+        "report_in_progress": "جارٍ إعداد تقرير PDF...",
+        "cancel": "إلغاء",
+        "report_cancelled": "تم إلغاء إعداد التقرير.",
+        "report_failed": "فشل إعداد التقرير",
+        "archive_input": "أرشيف التحليل",
+        "upload_archive": "تحميل أرشيف التحليل (zip)",
+        "archive_loaded": "تم تحميل الأرشيف (تم حفظه بوضع الإحصاء: {statistics}).",
+        "archive_format": "تنسيق الأرشيف",
+        "download_archive": "📥 تنزيل أرشيف التحليل",
+        "shared_reference": "استخدام جينات مرجعية مشتركة (المتوسط الهندسي)",
+        "num_reference_genes": "عدد الجينات المرجعية",
+        "quantification_method": "طريقة القياس الكمي",
+        "delta_delta_ct_method": "2^(-ΔΔCt) (كفاءة 100%)",
+        "pfaffl": "بفافل (مصحح بالكفاءة)",
+        "upload_standard_curve": "تحميل ملف المنحنى القياسي (الجين، الكمية، Ct)",
+        "standard_curves": "المنحنيات القياسية",
+        "slope": "الميل",
+        "intercept": "نقطة التقاطع",
+        "amplification_factor": "عامل التضخيم (E)",
+        "efficiency_percent": "الكفاءة (%)",
+        "reference_curves": "منحنيات الجينات المرجعية",
+        "missing_standard_curve": "تم استخدام كفاءة 100% للجينات التي ليس لها منحنى قياسي أو التي تقع خارج نطاق القبول ({min_amplification} < E ≤ {max_amplification}، R² ≥ {min_r_squared}): {genes}",
+        "aggregate_replicates": "حساب متوسط التكرارات التقنية",
+        "ct_cutoff": "حد Ct (القيم الأعلى تعتبر بدون تضخيم)",
+        "outlier_method": "مرشح الآبار الشاذة",
+        "outlier_none": "لا شيء",
+        "outlier_sd": "حد الانحراف المعياري",
+        "outlier_grubbs": "اختبار غرابز (α = 0.05)",
+        "sd_threshold": "حد الانحراف المعياري للتكرارات (دورات)",
+        "preprocess_report": "{wells} بئر، {replicate_groups} مجموعة تكرار تقني (تم حساب متوسط {averaged}). تمت إزالة: {undetermined} قيمة Ct غير محددة، {above_cutoff} قيمة Ct فوق الحد، {outlier} بئر شاذ؛ {empty_groups} مجموعة لم يتبق فيها بئر صالح.",
+        "removed_wells": "الآبار المزالة",
+        "removal_reason": "السبب",
+        "removal_undetermined": "Ct غير محدد",
+        "removal_above_cutoff": "Ct فوق الحد",
+        "removal_outlier": "بئر شاذ",
+        "well_role": "الدور",
+        "gene": "الجين",
+        "invalid_ct_tokens": "⚠️ تعذر قراءة {count} قيمة كأرقام وتم تجاهلها (السطر: القيمة): {tokens}",
+        "show_memory_usage": "عرض استخدام الذاكرة",
+        "memory_report": "هذه الجلسة: {session:.2f} ميغابايت · جدول العينات: {table:.2f} ميغابايت · ذاكرات التخزين المؤقت المشتركة (كل الجلسات): {shared:.2f} ميغابايت",
+        "compress_exports": "ضغط ملفات CSV باستخدام gzip (.csv.gz)",
+        "download_xlsx": "📥 تنزيل Excel (XLSX)",
+        "sheet_raw_ct": "Ct الخام",
+        "sheet_delta_ct": "ΔCt",
+        "sheet_results": "ΔΔCt وتغير التعبير",
+        "sheet_statistics": "الإحصاءات",
+        "ideal_efficiency": "لا يوجد منحنى (كفاءة 100%)",
+        "archived_efficiency": "يتم استخدام عوامل التضخيم المحفوظة في الأرشيف. قم بتحميل ملف المنحنيات القياسية لإعادة حسابها.",
+        "usable_curve": "قابل للاستخدام",
+        "statistical_explanation": (
+            "أثناء عملية التقييم الإحصائي، تم تحليل توزيع البيانات باستخدام اختبار شابيرو-ويلك. "
+            "إذا تم تحقيق التوزيع الطبيعي، تم التحقق من تجانس التباين بين المجموعات باستخدام اختبار ليفين. "
+            "إذا كانت التباين متساويًا، تم تطبيق اختبار t للعينة المستقلة، وإذا لم يكن كذلك، تم استخدام اختبار t ويلش. "
+            "إذا لم يتم تحقيق التوزيع الطبيعي، تم تطبيق اختبار مان-ويتني U غير المعلمي. "
+            "تم تحديد الدلالة باستخدام المعيار p < 0.05."
+            "للاقتراحات والدعم، بورهانيتين يالجنكايا - البريد الإلكتروني: mailtoburhanettin@gmail.com"
+        )
+    }
+}
+
+
+# Sonuç ve istatistik tablolarının sabit sütun anahtarları -> çeviri anahtarları
+RESULT_COLUMNS = {
+    "gene": "target_gene",
+    "group": "patient_group",
+    "delta_delta_ct": "delta_delta_ct",
+    "expression_change": "gene_expression_change",
+    "regulation": "regulation_status",
+    "control_mean": "delta_ct_control",
+    "sample_mean": "delta_ct_patient",
+    "ci_lower": "ci_lower",
+    "ci_upper": "ci_upper",
+}
+STATS_COLUMNS = {
+    "gene": "target_gene",
+    "group": "patient_group",
+    "test_type": "test_type",
+    "test_method": "test_method",
+    "test_pvalue": "test_pvalue",
+    "adjusted_pvalue": "adjusted_pvalue",
+    "significant": "significance",
+}
+# Giriş verileri tablosu (SampleTable.to_frame) sütunları
+INPUT_COLUMNS = {
+    "sample_number": "sample_number",
+    "target_gene": "target_gene",
+    "group": "Grup",
+    "target_ct": "target_ct",
+    "reference_ct": "reference_ct",
+    "delta_ct_control": "delta_ct_control",
+    "delta_ct_patient": "delta_ct_patient",
+}
+
+# Test türü ve yöntem anahtarları (istatistik motorunun çıktısı)
+TEST_KEYS = ("parametric", "non_parametric", "t_test", "welch_t_test", "mann_whitney_u_test", "permutation_test")
+
+
+# Bir dil için önceden derlenmiş etiket tablosu: sütun başlıkları ve kod -> metin eşlemeleri
+# Dil değiştiğinde analiz yeniden yapılmaz, yalnızca bu tablo ile yeniden etiketlenir
+@functools.lru_cache(maxsize=None)
+def label_table(language_code):
+    text = translations[language_code]
+    tests = {key: text[key] for key in TEST_KEYS}
+    return {
+        "result_columns": {key: text[label] for key, label in RESULT_COLUMNS.items()},
+        "stats_columns": {key: text[label] for key, label in STATS_COLUMNS.items()},
+        "input_columns": {key: text[label] for key, label in INPUT_COLUMNS.items()},
+        "values": {
+            "regulation": {
+                NO_CHANGE: text["no_change"],
+                UPREGULATED: text["upregulated"],
+                DOWNREGULATED: text["downregulated"],
+            },
+            "test_type": tests,
+            "test_method": tests,
+            "significant": {True: text["significant"], False: text["insignificant"]},
+            "removal_reason": {reason: text[f"removal_{reason}"] for reason in REMOVAL_REASONS},
+        },
+    }
+
+
+# Sabit anahtarlı sonuç tablosunu seçilen dilde görüntüleme / dışa aktarım tablosuna dönüştür
+# gene ve group sütunları tam sayı kodlarıdır; etiketler gene_labels / group_labels listelerinden gelir
+def localize_frame(frame, language_code, columns, gene_labels, group_labels):
+    labels = label_table(language_code)
+    headers = labels[columns]
+    localized = {}
+    for column in frame.columns:
+        values = frame[column]
+        if column == "gene":
+            values = pd.Categorical.from_codes(values, categories=list(gene_labels))
+        elif column == "group":
+            values = pd.Categorical.from_codes(values, categories=list(group_labels))
+        elif column in labels["values"]:
+            values = values.map(labels["values"][column])
+        localized[headers[column]] = values
+    return pd.DataFrame(localized, copy=False)
@@ -0,0 +1,113 @@
+import gzip
+import io
+
+import numpy as np
+
+from onbellek import LRUCache
+from veri_tablosu import CT_DECIMALS
+
+# CSV bu satır sayısında parçalar halinde yazılır; tablonun tamamı tek bir metne çevrilmez
+EXPORT_CHUNK_ROWS = 50_000
+# Düşük sıkıştırma düzeyi: Ct tablolarında 6 ve 9'a göre birkaç kat hızlı, dosya yalnızca ~%5-7 büyük
+GZIP_LEVEL = 3
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Bir Excel sayfasındaki en fazla satır sayısı; daha uzun tablolar devam sayfalarına bölünür
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_SHEET_NAME_LENGTH = 31
+
+# Hazırlanan indirme dosyaları veri özetine göre saklanır; tüm oturumlar arasında paylaşılır
+export_cache = LRUCache(max_entries=16)
+
+
+# DataFrame'i ikili akışa parça parça UTF-8 CSV olarak yaz
+def write_csv(frame, stream, chunk_rows=EXPORT_CHUNK_ROWS):
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="", write_through=True)
+    try:
+        # Boş tabloda yalnızca başlık satırı yazılır
+        for start in range(0, max(len(frame), 1), chunk_rows):
+            frame.iloc[start:start + chunk_rows].to_csv(text, index=False, header=start == 0)
+        text.flush()
+    finally:
+        text.detach()
+
+
+# CSV baytları; compress ile gzip (mtime=0: aynı veri her zaman aynı baytları üretir)
+def csv_bytes(frame, compress=False):
+    buffer = io.BytesIO()
+    if compress:
+        with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=GZIP_LEVEL, mtime=0) as stream:
+            write_csv(frame, stream)
+    else:
+        write_csv(frame, buffer)
+    return buffer.getvalue()
+
+
+# İndirme düğmesi için tembel içerik: dosya yalnızca düğmeye basıldığında hazırlanır, sonra önbellekten gelir
+# key: içeriği belirleyen veri özeti (ör. Ct matrisleri + etiketler + dil)
+def lazy_payload(key, build):
+    return lambda: export_cache.get_or_compute(key, build)
+
+
+def lazy_csv(frame, key, compress=False):
+    return lazy_payload(("csv", key, compress), lambda: csv_bytes(frame, compress))
+
+
+# CSV indirme dosya adı ve MIME tipi
+def csv_download(file_stem, compress=False):
+    if compress:
+        return f"{file_stem}.csv.gz", "application/gzip"
+    return f"{file_stem}.csv", "text/csv"
+
+
+# Excel hücre değerleri: NaN boş hücre olur (satırda atlanır), tek duyarlıklı Ct'ler yuvarlanmış çift duyarlığa çevrilir
+def _excel_rows(frame):
+    columns = []
+    for _, values in frame.items():
+        if values.dtype == np.float32:
+            values = values.astype(float).round(CT_DECIMALS)
+        values = values.astype(object)
+        columns.append(values.where(values.notna(), None).to_numpy())
+    return zip(*columns)
+
+
+# Tabloyu bir veya (Excel satır sınırını aşarsa) birden fazla sayfaya satır sırasıyla yaz
+# constant_memory modunda satırlar yazıldıkça geçici dosyaya aktarılır; çalışma kitabı bellekte birikmez
+def _write_sheets(workbook, name, frame, header_format, chunk_rows):
+    rows_per_sheet = EXCEL_MAX_ROWS - 1
+    header = [str(column) for column in frame.columns]
+    for part, sheet_start in enumerate(range(0, max(len(frame), 1), rows_per_sheet)):
+        suffix = f" ({part + 1})" if part else ""
+        sheet = workbook.add_worksheet(name[:EXCEL_SHEET_NAME_LENGTH - len(suffix)] + suffix)
+        sheet.write_row(0, 0, header, header_format)
+        sheet.freeze_panes(1, 0)
+        sheet.set_column(0, len(header) - 1, 16)
+        row = 1
+        sheet_stop = min(sheet_start + rows_per_sheet, len(frame))
+        for start in range(sheet_start, sheet_stop, chunk_rows):
+            for values in _excel_rows(frame.iloc[start:min(start + chunk_rows, sheet_stop)]):
+                sheet.write_row(row, 0, values)
+                row += 1
+
+
+# Ham Ct, ΔCt, ΔΔCt / ekspresyon değişimi ve istatistik sayfalarından oluşan tek çalışma kitabı
+# input_df: SampleTable.to_frame çıktısı (örnek no, gen, grup, hedef Ct, referans Ct, ΔCt kontrol / hasta)
+# sheet_names: (ham Ct, ΔCt, sonuçlar, istatistik) sayfa adları; target: dosya yolu veya ikili akış
+def write_xlsx(target, input_df, results_df, stats_df, sheet_names, chunk_rows=EXPORT_CHUNK_ROWS):
+    # xlsxwriter yalnızca Excel dışa aktarımı istendiğinde yüklenir
+    import xlsxwriter
+
+    sample_column, gene_column, group_column, target_column, reference_column, control_column, patient_column = input_df.columns
+    raw_name, delta_name, results_name, stats_name = sheet_names
+    with xlsxwriter.Workbook(target, {"constant_memory": True}) as workbook:
+        header_format = workbook.add_format({"bold": True, "bg_color": "#D9D9D9", "border": 1})
+        _write_sheets(workbook, raw_name, input_df[[sample_column, gene_column, group_column, target_column, reference_column]], header_format, chunk_rows)
+        _write_sheets(workbook, delta_name, input_df[[sample_column, gene_column, group_column, control_column, patient_column]], header_format, chunk_rows)
+        _write_sheets(workbook, results_name, results_df, header_format, chunk_rows)
+        _write_sheets(workbook, stats_name, stats_df, header_format, chunk_rows)
+
+
+def xlsx_bytes(input_df, results_df, stats_df, sheet_names):
+    buffer = io.BytesIO()
+    write_xlsx(buffer, input_df, results_df, stats_df, sheet_names)
+    return buffer.getvalue()
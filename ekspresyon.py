@@ -1,23 +1,20 @@
+import functools
+import math
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import scipy.stats as stats
-from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.pdfgen import canvas
-from reportlab.platypus import Table, TableStyle, SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image as RLImage
-from reportlab.lib.units import inch
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab import pdfbase
-from reportlab.pdfbase import pdfmetrics
-import plotly.io as pio
-import matplotlib.pyplot as plt
-
-# Unicode destekli fontu kaydet
-pdfmetrics.registerFont(TTFont('DejaVu', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'))
+from analiz import run_analysis, run_bootstrap, with_confidence_intervals, with_raw_delta_ct, pad_series, reference_normalization, gather_rows, efficiency_weighted, STATISTICS_MODES
+from ceviriler import translations, label_table, localize_frame
+from istatistik import BOOTSTRAP_METHODS
+from veri_okuma import parse_ct_block, read_plate_export_cached, read_standard_curve_cached, build_panel
+from on_isleme import preprocess_plate_cached, OUTLIER_METHODS, DEFAULT_CT_CUTOFF, DEFAULT_SD_THRESHOLD
+from verim import standard_curves, gene_amplification, usable_curves, QUANTIFICATION_METHODS, MIN_AMPLIFICATION, MAX_AMPLIFICATION, MIN_R_SQUARED
+from veri_tablosu import cached_sample_table, CONTROL_GROUP_CODE, CT_DTYPE, CT_DISPLAY_FORMAT
+from disa_aktarim import lazy_csv, lazy_payload, csv_download, xlsx_bytes, XLSX_MIME
+from arsiv import export_analysis, import_analysis_cached, ARCHIVE_FORMATS
+from grafik import distribution_figure, heatmap_figure, STATIC_RENDERING_AVAILABLE
+from rapor_isleri import submit_report, report_cache, RAW_TABLE_ROW_LIMIT, JOB_RUNNING, JOB_CANCELLED, JOB_FAILED
+from onbellek import hash_arrays, hash_text, memory_usage, shared_cache_memory
 
 hide_streamlit_style = """
     <style>
@@ -77,861 +74,594 @@ language_map = {
 # Seçilen dilin kodunu al
 language_code = language_map.get(selected_language_name, "tr")  # Varsayılan olarak Türkçe (tr) kullan
 
-translations = {
-    "tr": {
-        "title": "🧬 Gen Ekspresyon Analizi Uygulaması",
-        "subtitle": "B. Yalçınkaya tarafından geliştirildi",
-        "patient_data_header": "📊 Hasta ve Kontrol Grubu Verisi Girin",
-        "num_target_genes": "🔹 Hedef Gen Sayısını Girin",
-        "num_patient_groups": "🔹 Hasta Grubu Sayısını Girin",
-        "sample_number": "Örnek Numarası",
-        "Grup": "Grup",
-        "x_axis_title": "Grup Adı",
-        "ct_value": "Ct Değeri",
-        "reference_ct": "Referans Ct",
-        "delta_ct_control": "ΔCt (Kontrol)",
-        "delta_ct_patient": "ΔCt (Hasta)",
-        "warning_empty_input": "⚠️ Dikkat: Verileri alt alta yazın veya boşluk içeren hücre olmayacak şekilde excelden kopyalayıp yapıştırın.",
-        "download_csv": "📥 CSV İndir",
-        "generate_pdf": "📥 PDF Raporu Hazırla",
-        "pdf_report": "Gen Ekspresyon Analizi Raporu",
-        "statistics": "istatistiksel Sonuçlar",
-        "nil_mine": "📊 Sonuçlar",
-        "gr_tbl": "📋 Giriş Verileri Tablosu",
-        "control_group": "🧬 Kontrol Grubu",
-        "ctrl_trgt_ct": "🟦 Kontrol Grubu Hedef Gen {i} Ct Değerleri",
-        "ctrl_ref_ct": "🟦 Kontrol Grubu Referans Gen {i} Ct Değerleri",
-        "hst_trgt_ct": "🩸 Hasta Grubu Hedef Gen {j} Ct Değerleri",
-        "hst_ref_ct": "🩸 Hasta Grubu Referans Gen {j} Ct Değerleri",
-        "warning_control_ct": "⚠️ Dikkat: Kontrol Grubu {i} verilerini alt alta yazın veya boşluk içeren hücre olmayacak şekilde Excel'den kopyalayıp yapıştırın.",
-        "warning_patient_ct": "⚠️ Dikkat: Hasta grubu Ct verilerini alt alta yazın veya boşluk içeren hücre olmayacak şekilde Excel'den kopyalayıp yapıştırın.",
-        "target_gene": "Hedef Gen",
-        "reference_gene": "Referans Gen",
-        "target_ct": "Hedef Gen Ct",
-        "distribution_graph": "Dağılım Grafiği",
-        "error_missing_control_data": "⚠️ Hata: Kontrol Grubu için Hedef Gen {i} verileri eksik!",
-        "control_group_avg": "Kontrol Grubu Ortalama",
-        "avg": "Ortalama",
-        "control": "Kontrol",
-        "sample": "Örnek",
-        "patient": "Hasta",
-        "delta_ct_distribution": "ΔCt Dağılımı",
-        "delta_ct_value": "ΔCt Değeri",
-        "parametric": "Parametrik",
-        "non_parametric": "Nonparametrik",
-        "t_test": "t-test",
-        "mann_whitney_u_test": "Mann-Whitney U testi",
-        "significant": "Anlamlı",
-        "insignificant": "Anlamsız",
-        "test_type": "Test Türü",
-        "test_method": "Kullanılan Test",
-        "test_pvalue": "Test P-değeri",
-        "significance": "Anlamlılık",
-        "delta_delta_ct": "ΔΔCt",
-        "gene_expression_change": "Gen Ekspresyon Değişimi (2^(-ΔΔCt))",
-        "regulation_status": "Regülasyon Durumu",
-        "no_change": "Değişim Yok",
-        "upregulated": "Yukarı Regüle",
-        "downregulated": "Aşağı Regüle",
-        "report_title": "Gen Ekspresyon Analizi Raporu",
-        "input_data_table": "Giriş Verileri Tablosu",
-        "results": "Sonuçlar",
-        "statistical_results": "📈 İstatistiksel Sonuçlar",
-        "statistical_evaluation": "İstatistiksel Değerlendirme",
-        "significance": "Anlamlılık",
-        "target_gene": "Hedef Gen",
-        "patient_group": "🩸 Hasta Grubu",
-        "expression_change": "Gen Ekspresyon Değişimi",
-        "regulation_status": "Regülasyon Durumu",
-        "generate_pdf": "PDF Oluştur",
-        "pdf_report": "Gen Ekspresyon Raporu",
-        "error_no_data": "Veri bulunamadı, PDF oluşturulamadı.",
-        "statistical_explanation": (
-            "İstatistiksel değerlendirme sürecinde veri dağılımı Shapiro-Wilk testi ile analiz edilmiştir. "
-            "Normallik sağlanırsa, gruplar arasındaki varyans eşitliği Levene testi ile kontrol edilmiştir. "
-            "Varyans eşitliği varsa bağımsız örneklem t-testi, yoksa Welch t-testi uygulanmıştır. "
-            "Normal dağılım sağlanmazsa, parametrik olmayan Mann-Whitney U testi kullanılmıştır. "
-            "Sonuçların anlamlılığı p < 0.05 kriterine göre belirlenmiştir. "
-            "<b>Öneri ve destekleriniz için:</b> Burhanettin Yalçınkaya - mail: mailtoburhanettin@gmail.com"
-        )
-    },
-
-    "en": {
-        "title": "🧬 Gene Expression Analysis Application",
-        "subtitle": "Developed by B. Yalçınkaya",
-        "patient_data_header": "📊 Enter Patient and Control Group Data",
-        "num_target_genes": "🔹 Enter the Number of Target Genes",
-        "num_patient_groups": "🔹 Enter the Number of Patient Groups",
-        "sample_number": "Sample Number",
-        "Grup": "Group",
-        "x_axis_title": "Grup Name",
-        "ct_value": "Ct Value",
-        "reference_ct": "Reference Ct",
-        "delta_ct_control": "ΔCt (Control)",
-        "delta_ct_patient": "ΔCt (Patient)",
-        "warning_empty_input": "⚠️ Warning: Write data one below the other or copy-paste without empty cells from Excel.",
-        "download_csv": "📥 Download CSV",
-        "generate_pdf": "📥 Prepare PDF Report",
-        "pdf_report": "Gene Expression Analysis Report",
-        "nil_mine": "📊 Results",
-        "gr_tbl": "📋 Input Data Table",
-        "control_group": "🧬 Control Group",
-        "ctrl_trgt_ct": "🟦 Control Group Target Gene {i} Ct Values",
-        "ctrl_ref_ct": "🟦 Control Group Reference Gene {i} Ct Values",
-        "hst_trgt_ct": "🩸 Patient Group Target Gene {j} Ct Values",
-        "hst_ref_ct": "🩸 Patient Group Reference Gene {j} Ct Values",
-        "warning_control_ct": "⚠️ Warning: Control Group {i} data should be entered line by line or copied from Excel without empty cells.",
-        "warning_patient_ct": "⚠️ Warning: Enter patient group Ct values line by line or copy-paste from Excel without empty cells.",
-        "target_gene": "Target Gene",
-        "reference_gene": "Reference Gen",
-        "target_ct": "Target Gene Ct", 
-        "distribution_graph": "Distribution Graph",
-        "error_missing_control_data": "⚠️ Error: Missing data for Target Gene {i} in the Control Group!",
-        "control_group_avg": "Control Group Average",
-        "avg": "Average",
-        "control": "Control",
-        "sample": "Sample",
-        "patient": "Patient",
-        "delta_ct_distribution": "ΔCt Distribution",
-        "delta_ct_value": "ΔCt Value",
-        "parametric": "Parametric",
-        "non_parametric": "Nonparametric",
-        "t_test": "t-test",
-        "mann_whitney_u_test": "Mann-Whitney U test",
-        "significant": "Significant",
-        "insignificant": "Insignificant",
-        "test_type": "Test Type",
-        "test_method": "Test Method",
-        "test_pvalue": "Test P-value",
-        "significance": "Significance",
-        "delta_delta_ct": "ΔΔCt",
-        "gene_expression_change": "Gene Expression Change (2^(-ΔΔCt))",
-        "regulation_status": "Regulation Status",
-        "no_change": "No Change",
-        "upregulated": "Upregulated",
-        "downregulated": "Downregulated",
-        "report_title": "Gene Expression Analysis Report",
-        "input_data_table": "Input Data Table",
-        "results": "Results",
-        "statistical_results": "📈 Statistical Results",
-        "statistical_evaluation": "Statistical Evaluation",
-        "significance": "Significance",
-        "target_gene": "Target Gene",
-        "patient_group": "🩸 Patient Group",
-        "expression_change": "Gene Expression Change",
-        "regulation_status": "Regulation Status",
-        "generate_pdf": "Generate PDF",
-        "pdf_report": "Gene Expression Report",
-        "error_no_data": "No data found, PDF could not be generated.",
-        "statistical_explanation": (
-            "During the statistical evaluation process, data distribution was analyzed using the Shapiro-Wilk test. "
-            "If normality was met, variance homogeneity between groups was checked with Levene’s test. "
-            "If variance was equal, an independent sample t-test was applied; otherwise, a Welch t-test was used. "
-            "If normal distribution was not achieved, the non-parametric Mann-Whitney U test was applied. "
-            "Significance was determined using the p < 0.05 criterion."
-            "For suggestions and support, Burhanettin Yalçinkaya - email: mailtoburhanettin@gmail.com"
-        )
-    },
-
-    "de": {
-        "title": "🧬 Genexpression-Analyseanwendung",
-        "subtitle": "Entwickelt von B. Yalçınkaya",
-        "patient_data_header": "📊 Geben Sie Patientendaten und Kontrollgruppen ein",
-        "num_target_genes": "🔹 Geben Sie die Anzahl der Zielgene ein",
-        "num_patient_groups": "🔹 Geben Sie die Anzahl der Patientengruppen ein",
-        "sample_number": "Beispielnummer",
-        "Grup": "Gruppe",
-        "x_axis_title": "Gruppenname",
-        "ct_value": "Ct-Wert",
-        "reference_ct": "Referenz Ct",
-        "delta_ct_control": "ΔCt (Kontrolle)",
-        "delta_ct_patient": "ΔCt (Patientendaten)",
-        "warning_empty_input": "⚠️ Warnung: Geben Sie die Daten untereinander ein oder kopieren Sie sie ohne leere Zellen aus Excel.",
-        "download_csv": "📥 CSV herunterladen",
-        "generate_pdf": "📥 PDF-Bericht erstellen",
-        "pdf_report": "Genexpression-Analysebericht",
-        "statistics": "Statistische Ergebnisse",
-        "nil_mine": "📊 Ergebnisse",
-        "gr_tbl": "📋 Eingabedaten Tabelle",
-        "control_group": "🧬 Kontroll gruppe",
-        "ctrl_trgt_ct": "🟦 Kontrollgruppe Zielgen {i} Ct-Werte",
-        "ctrl_ref_ct": "🟦 Kontrollgruppe Referenz {i} Ct-Werte",
-        "hst_trgt_ct": "🩸 Patientendaten gruppe Zielgen {j} Ct-Werte",
-        "hst_ref_ct": "🩸 Patientendaten gruppe Referenz {j} Ct-Werte",
-        "warning_control_ct": "⚠️ Achtung: Kontrollgruppe {i} Daten sollten untereinander eingegeben oder aus Excel ohne leere Zellen eingefügt werden.",
-        "warning_patient_ct": "⚠️ Achtung: Geben Sie die Ct-Werte der Patientendaten gruppe untereinander ein oder kopieren Sie sie aus Excel ohne leere Zellen.",
-        "target_gene": "Zielgen",
-        "reference_gene": "Referenzgen",
-        "target_ct": "Zielgen Ct",
-        "distribution_graph": "Verteilungsdiagramm",
-        "error_missing_control_data": "⚠️ Fehler: Fehlende Daten für Zielgen {i} in der Kontrollgruppe!",
-        "control_group_avg": "Durchschnitt der Kontrollgruppe",
-        "avg": "Durchschnitt",
-        "control": "Kontrolle",
-        "sample": "Probe",
-        "patient": "Patient",
-        "delta_ct_distribution": "ΔCt-Verteilung",
-        "delta_ct_value": "ΔCt-Wert",
-        "parametric": "Parametrisch",
-        "non_parametric": "Nicht parametrisch",
-        "t_test": "t-Test",
-        "mann_whitney_u_test": "Mann-Whitney U-Test",
-        "significant": "Signifikant",
-        "insignificant": "Nicht signifikant",
-        "test_type": "Testtyp",
-        "test_method": "Verwendeter Test",
-        "test_pvalue": "P-Wert",
-        "significance": "Bedeutung",
-        "delta_delta_ct": "ΔΔCt",
-        "gene_expression_change": "Genexpression Veränderung (2^(-ΔΔCt))",
-        "regulation_status": "Regulierungsstatus",
-        "no_change": "Keine Veränderung",
-        "upregulated": "Hochreguliert",
-        "downregulated": "Herunterreguliert",
-        "report_title": "Genexpressionsanalysebericht",
-        "input_data_table": "Eingabedatentabelle",
-        "results": "Ergebnisse",
-        "statistical_results": "📈 Statistische Ergebnisse",
-        "statistical_evaluation": "Statistische Auswertung",
-        "significance": "Signifikanz",
-        "target_gene": "Zielgen",
-        "patient_group": "🩸 Patientengruppe",
-        "expression_change": "Genexpressionsänderung",
-        "regulation_status": "Regulierungsstatus",
-        "generate_pdf": "PDF Erstellen",
-        "pdf_report": "Genexpressionsbericht",
-        "error_no_data": "Keine Daten gefunden, PDF konnte nicht erstellt werden.",
-        "statistical_explanation": (
-            "Während des statistischen Bewertungsprozesses wurde die Datenverteilung mit dem Shapiro-Wilk-Test analysiert. "
-            "Wenn die Normalität erfüllt war, wurde die Varianzhomogenität zwischen den Gruppen mit dem Levene-Test überprüft. "
-            "War die Varianz gleich, wurde ein unabhängiger Stichprobent-Test angewendet; andernfalls wurde ein Welch-T-Test verwendet. "
-            "Wenn keine normale Verteilung vorlag, wurde der nicht-parametrische Mann-Whitney-U-Test angewendet. "
-            "Die Signifikanz wurde anhand des Kriteriums p < 0,05 bestimmt."
-            "Für Vorschläge und Unterstützung, Burhanettin Yalçinkaya - E-Mail: mailtoburhanettin@gmail.com"
-        )
-    },
-    
-    "fr": {
-        "title": "🧬 Application d'Analyse de l'Expression Génétique",
-        "subtitle": "Développé par B. Yalçınkaya",
-        "patient_data_header": "📊 Entrez les données des groupes patients et témoins",
-        "num_target_genes": "🔹 Entrez le nombre de gènes cibles",
-        "num_patient_groups": "🔹 Entrez le nombre de groupes de patients",
-        "sample_number": "Numéro de l'échantillon",
-        "Grup": "Groupe",
-        "x_axis_title": "Nom du Groupe",
-        "ct_value": "Valeur Ct",
-        "reference_ct": "Ct de Référence",
-        "delta_ct_control": "ΔCt (Contrôle)",
-        "delta_ct_patient": "ΔCt (Patient)",
-        "warning_empty_input": "⚠️ Avertissement : Entrez les données sous forme de liste ou copiez-collez sans cellules vides depuis Excel.",
-        "statistical_results": "📈 Résultats Statistiques",
-        "download_csv": "📥 Télécharger CSV",
-        "generate_pdf": "📥 Préparer le Rapport PDF",
-        "pdf_report": "Rapport d'Analyse de l'Expression Génétique",
-        "statistics": "Résultats Statistiques",
-        "nil_mine": "📊 Résultats",
-        "gr_tbl": "📋 Tableau des Données d'Entrée",
-        "control_group": "🧬 Groupe Contrôle",
-        "ctrl_trgt_ct": "🟦 Valeurs Ct du Gène Cible {i} pour le Groupe Contrôle",
-        "ctrl_ref_ct": "🟦 Valeurs Ct du Gène Référence {i} pour le Groupe Contrôle",
-        "hst_trgt_ct": "🩸 Valeurs Ct du Gène Cible {j} pour le Groupe Patient",
-        "hst_ref_ct": "🩸 Valeurs Ct du Gène Référence {j} pour le Groupe Patient",
-        "warning_control_ct": "⚠️ Avertissement : Les données du groupe témoin {i} doivent être saisies ligne par ligne ou copiées depuis Excel sans cellules vides.",
-        "warning_patient_ct": "⚠️ Avertissement : Entrez les valeurs Ct du groupe patient ligne par ligne ou copiez-les depuis Excel sans cellules vides.",
-        "statistical_results": "📈 Résultats Statistiques",
-        "target_gene": "Gène Cible",
-        "reference_gene": "Gène Référence",
-        "target_ct": "Ct du Gène Cible", 
-        "distribution_graph": "Graphique de Distribution",
-        "error_missing_control_data": "⚠️ Erreur : Données manquantes pour le Gène Cible {i} dans le Groupe Contrôle!",
-        "control_group_avg": "Moyenne du Groupe Contrôle",
-        "avg": "Moyenne",
-        "control": "Contrôle",
-        "sample": "Échantillon",
-        "patient": "Patient",
-        "delta_ct_distribution": "Distribution ΔCt",
-        "delta_ct_value": "Valeur ΔCt",
-        "parametric": "Paramétrique",
-        "non_parametric": "Non paramétrique",
-        "t_test": "Test t",
-        "mann_whitney_u_test": "Test Mann-Whitney U",
-        "significant": "Significatif",
-        "insignificant": "Non Significatif",
-        "test_type": "Type de Test",
-        "test_method": "Méthode de Test",
-        "test_pvalue": "P-valeur du Test",
-        "significance": "Signification",
-        "delta_delta_ct": "ΔΔCt",
-        "gene_expression_change": "Changement de l'Expression Génétique (2^(-ΔΔCt))",
-        "regulation_status": "Statut de Régulation",
-        "no_change": "Aucun Changement",
-        "upregulated": "Upregulé",
-        "downregulated": "Downregulé",
-        "report_title": "Rapport d'Analyse de l'Expression Génétique",
-        "input_data_table": "Tableau des Données d'Entrée",
-        "results": "Résultats",
-        "statistical_results": "Résultats Statistiques",
-        "statistical_evaluation": "Évaluation Statistique",
-        "significance": "Signification",
-        "target_gene": "Gène Cible",
-        "patient_group": "🩸 Groupe Patient",
-        "expression_change": "Changement de l'Expression Génétique",
-        "regulation_status": "Statut de Régulation",
-        "generate_pdf": "Générer le PDF",
-        "pdf_report": "Rapport sur l'Expression Génétique",
-        "error_no_data": "Aucune donnée trouvée, le PDF n'a pas pu être généré.",
-        "statistical_explanation": (
-            "Au cours du processus d'évaluation statistique, la répartition des données a été analysée à l'aide du test de Shapiro-Wilk. "
-            "Si la normalité était remplie, l'homogénéité de la variance entre les groupes a été vérifiée à l'aide du test de Levene. "
-            "Si la variance était égale, un test t pour échantillons indépendants a été appliqué, sinon, un test t de Welch a été utilisé. "
-            "Si aucune distribution normale n'était atteinte, le test non paramétrique de Mann-Whitney U a été appliqué. "
-            "La signification a été déterminée en utilisant le critère p < 0,05."
-            "Pour des suggestions et un soutien, Burhanettin Yalçınkaya - e-mail : mailtoburhanettin@gmail.com"
-        )
-    },
-
-    "es": {
-        "title": "🧬 Aplicación de Análisis de Expresión Génica",
-        "subtitle": "Desarrollado por B. Yalçınkaya",
-        "patient_data_header": "📊 Ingrese Datos de Grupos de Pacientes y de Control",
-        "num_target_genes": "🔹 Ingrese el número de Genes Objetivo",
-        "num_patient_groups": "🔹 Ingrese el número de Grupos de Pacientes",
-        "sample_number": "Número de muestra",
-        "Grup": "Grupo",
-        "x_axis_title": "Nombre del Grupo",
-        "ct_value": "Valor de Ct",
-        "reference_ct": "Ct de Referencia",
-        "delta_ct_control": "ΔCt (Control)",
-        "delta_ct_patient": "ΔCt (Paciente)",
-        "warning_empty_input": "⚠️ Advertencia: Ingrese los datos uno debajo del otro o cópielos sin celdas vacías desde Excel.",
-        "statistical_results": "📈 Resultados Estadísticos",
-        "download_csv": "📥 Descargar CSV",
-        "generate_pdf": "📥 Preparar Informe en PDF",
-        "pdf_report": "Informe de Análisis de Expresión Génica",
-        "statistics": "Resultados Estadísticos",
-        "nil_mine": "📊 Resultados",
-        "gr_tbl": "📋 Tabla de Datos de Entrada",
-        "control_group": "🧬 Grupo Control",
-        "ctrl_trgt_ct": "🟦 Valores Ct del Gen Objetivo {i} para el Grupo Control",
-        "ctrl_ref_ct": "🟦 Valores Ct del Gen de Referencia {i} para el Grupo Control",
-        "hst_trgt_ct": "🩸 Valores Ct del Gen Objetivo {j} para el Grupo Paciente",
-        "hst_ref_ct": "🩸 Valores Ct del Gen de Referencia {j} para el Grupo Paciente",
-        "warning_control_ct": "⚠️ Advertencia: Los datos del grupo control {i} deben ingresarse fila por fila o copiarse desde Excel sin celdas vacías.",
-        "warning_patient_ct": "⚠️ Advertencia: Ingrese los valores de Ct del grupo paciente fila por fila o cópielos desde Excel sin celdas vacías.",
-        "statistical_results": "📈 Resultados Estadísticos",
-        "target_gene": "Gen Objetivo",
-        "reference_gene": "Gen de Referencia",
-        "target_ct": "Ct del Gen Objetivo", 
-        "distribution_graph": "Gráfico de Distribución",
-        "error_missing_control_data": "⚠️ Error: ¡Datos faltantes para el Gen Objetivo {i} en el Grupo Control!",
-        "control_group_avg": "Promedio del Grupo Control",
-        "avg": "Promedio",
-        "control": "Control",
-        "sample": "Muestra",
-        "patient": "Paciente",
-        "delta_ct_distribution": "Distribución ΔCt",
-        "delta_ct_value": "Valor ΔCt",
-        "parametric": "Paramétrico",
-        "non_parametric": "No paramétrico",
-        "t_test": "Test t",
-        "mann_whitney_u_test": "Test Mann-Whitney U",
-        "significant": "Significativo",
-        "insignificant": "No Significativo",
-        "test_type": "Tipo de Test",
-        "test_method": "Método de Test",
-        "test_pvalue": "P-valor del Test",
-        "significance": "Significación",
-        "delta_delta_ct": "ΔΔCt",
-        "gene_expression_change": "Cambio de Expresión Génica (2^(-ΔΔCt))",
-        "regulation_status": "Estado de Regulación",
-        "no_change": "Sin Cambio",
-        "upregulated": "Upregulado",
-        "downregulated": "Downregulado",
-        "report_title": "Informe de Análisis de Expresión Génica",
-        "input_data_table": "Tabla de Datos de Entrada",
-        "results": "Resultados",
-        "statistical_results": "Resultados Estadísticos",
-        "statistical_evaluation": "Evaluación Estadística",
-        "significance": "Significación",
-        "target_gene": "Gen Objetivo",
-        "patient_group": "🩸 Grupo Paciente",
-        "expression_change": "Cambio de Expresión Génica",
-        "regulation_status": "Estado de Regulación",
-        "generate_pdf": "Generar PDF",
-        "pdf_report": "Informe de Expresión Génica",
-        "error_no_data": "No se encontraron datos, no se pudo generar el PDF.",
-        "statistical_explanation": (
-            "Durante el proceso de evaluación estadística, se analizó la distribución de los datos mediante la prueba de Shapiro-Wilk. "
-            "Si se cumplió la normalidad, se verificó la homogeneidad de varianza entre los grupos mediante la prueba de Levene. "
-            "Si la varianza era igual, se aplicó la prueba t de muestras independientes; de lo contrario, se utilizó la prueba t de Welch. "
-            "Si no se alcanzó una distribución normal, se aplicó la prueba no paramétrica Mann-Whitney U. "
-            "La significancia se determinó utilizando el criterio p < 0.05."
-            "Para sugerencias y soporte, Burhanettin Yalçınkaya - correo electrónico: mailtoburhanettin@gmail.com"
-        )
-    },
-
-    "ar": {
-        "title": "🧬 تطبيق تحليل التعبير الجيني",
-        "subtitle": "تم تطويره بواسطة ب. يالجنكايا",
-        "patient_data_header": "📊 إدخال بيانات مجموعة المرضى ومجموعة التحكم",
-        "num_target_genes": "🔹 إدخال عدد الجينات المستهدفة",
-        "num_patient_groups": "🔹 إدخال عدد مجموعات المرضى",
-        "sample_number": "رقم العينة",
-        "Grup": "مجموعة",
-        "x_axis_title": "اسم المجموعة",
-        "ct_value": "قيمة Ct",
-        "reference_ct": "قيمة Ct المرجعية",
-        "delta_ct_control": "ΔCt (التحكم)",
-        "delta_ct_patient": "ΔCt (المريض)",
-        "warning_empty_input": "⚠️ تحذير: أدخل البيانات واحدًا تلو الآخر أو انسخها دون خلايا فارغة من Excel.",
-        "statistical_results": "📈 النتائج الإحصائية",
-        "download_csv": "📥 تحميل CSV",
-        "generate_pdf": "📥 إعداد تقرير PDF",
-        "pdf_report": "تقرير تحليل التعبير الجيني",
-        "statistics": "النتائج الإحصائية",
-        "nil_mine": "📊 النتائج",
-        "gr_tbl": "📋 جدول بيانات الإدخال",
-        "control_group": "🧬 مجموعة التحكم",
-        "ctrl_trgt_ct": "🟦 قيم Ct الجين المستهدف {i} لمجموعة التحكم",
-        "ctrl_ref_ct": "🟦 قيم Ct الجين المرجعي {i} لمجموعة التحكم",
-        "hst_trgt_ct": "🩸 قيم Ct الجين المستهدف {j} لمجموعة المرضى",
-        "hst_ref_ct": "🩸 قيم Ct الجين المرجعي {j} لمجموعة المرضى",
-        "warning_control_ct": "⚠️ تحذير: يجب إدخال بيانات مجموعة التحكم {i} سطرًا بسطر أو نسخها من Excel دون خلايا فارغة.",
-        "warning_patient_ct": "⚠️ تحذير: أدخل قيم Ct لمجموعة المرضى سطرًا بسطر أو انسخها من Excel دون خلايا فارغة.",
-        "statistical_results": "📈 النتائج الإحصائية",
-        "target_gene": "الجين المستهدف",
-        "reference_gene": "الجين المرجعي",
-        "target_ct": "قيمة Ct الجين المستهدف", 
-        "distribution_graph": "رسم بياني للتوزيع",
-        "error_missing_control_data": "⚠️ خطأ: بيانات مفقودة للجين المستهدف {i} في مجموعة التحكم!",
-        "control_group_avg": "متوسط مجموعة التحكم",
-        "avg": "متوسط",
-        "control": "التحكم",
-        "sample": "عينة",
-        "patient": "مريض",
-        "delta_ct_distribution": "توزيع ΔCt",
-        "delta_ct_value": "قيمة ΔCt",
-        "parametric": "معلمي",
-        "non_parametric": "غير معلمي",
-        "t_test": "اختبار t",
-        "mann_whitney_u_test": "اختبار مان-ويتني U",
-        "significant": "مهم",
-        "insignificant": "غير مهم",
-        "test_type": "نوع الاختبار",
-        "test_method": "طريقة الاختبار",
-        "test_pvalue": "قيمة P للاختبار",
-        "significance": "الدلالة",
-        "delta_delta_ct": "ΔΔCt",
-        "gene_expression_change": "تغيير التعبير الجيني (2^(-ΔΔCt))",
-        "regulation_status": "حالة التنظيم",
-        "no_change": "لا تغيير",
-        "upregulated": "مرتفع التنظيم",
-        "downregulated": "منخفض التنظيم",
-        "report_title": "تقرير تحليل التعبير الجيني",
-        "input_data_table": "جدول بيانات الإدخال",
-        "results": "النتائج",
-        "statistical_results": "النتائج الإحصائية",
-        "statistical_evaluation": "التقييم الإحصائي",
-        "significance": "الدلالة",
-        "target_gene": "الجين المستهدف",
-        "patient_group": "🩸 مجموعة المرضى",
-        "expression_change": "تغيير التعبير الجيني",
-        "regulation_status": "حالة التنظيم",
-        "generate_pdf": "توليد تقرير PDF",
-        "pdf_report": "تقرير التعبير الجيني",
-        "error_no_data": "لم يتم العثور على بيانات، لم يتم إنشاء التقرير PDF.",
-        "statistical_explanation": (
-            "أثناء عملية التقييم الإحصائي، تم تحليل توزيع البيانات باستخدام اختبار شابيرو-ويلك. "
-            "إذا تم تحقيق التوزيع الطبيعي، تم التحقق من تجانس التباين بين المجموعات باستخدام اختبار ليفين. "
-            "إذا كانت التباين متساويًا، تم تطبيق اختبار t للعينة المستقلة، وإذا لم يكن كذلك، تم استخدام اختبار t ويلش. "
-            "إذا لم يتم تحقيق التوزيع الطبيعي، تم تطبيق اختبار مان-ويتني U غير المعلمي. "
-            "تم تحديد الدلالة باستخدام المعيار p < 0.05."
-            "للاقتراحات والدعم، بورهانيتين يالجنكايا - البريد الإلكتروني: mailtoburhanettin@gmail.com"
-        )
-    }
-}
-
 # Translate text using the selected language
 st.title(translations[language_code]["title"])
 
 # Kullanıcıdan giriş alın
 st.header(translations[language_code]["patient_data_header"])
-num_target_genes = st.number_input(translations[language_code]["num_target_genes"], min_value=1, step=1, key="gene_count")
-num_patient_groups = st.number_input(translations[language_code]["num_patient_groups"], min_value=1, step=1, key="patient_count")
-
-# Veri işleme fonksiyonu
-def parse_input_data(input_data):
-    values = [x.replace(",", ".").strip() for x in input_data.split() if x.strip()]
-    return np.array([float(x) for x in values if x])
-
-# Veri listeleri
-input_values_table = []
-data = []
-stats_data = []
+input_mode = st.radio(
+    translations[language_code]["input_mode"],
+    options=["manual", "file", "archive"],
+    format_func=lambda mode: translations[language_code][f"{mode}_input"],
+    horizontal=True,
+    key="input_mode"
+)
 
-# Grafik için son işlenen Hedef Genın kontrol verilerini saklamak amacıyla değişkenler
-last_control_delta_ct = None
-last_gene_index = None
+# Dağılım grafikleri sayfa boyutu seçenekleri
+CHART_PAGE_SIZES = [5, 10, 20, 50]
+# Arka plan rapor işinin durum yoklama aralığı (saniye)
+REPORT_POLL_SECONDS = 1.0
+
+# Hatalı değer uyarısında gösterilecek en fazla değer sayısı
+MAX_REPORTED_TOKENS = 10
+
+# Ayrıştırılmış Ct serileri oturum durumunda widget anahtarına göre (metin, dizi, hatalı değerler) olarak tutulur
+# Metin alanı değiştiğinde yalnızca o alan geri çağırma ile yeniden ayrıştırılır; diğer alanlar olduğu gibi kullanılır
+if "parsed_ct" not in st.session_state:
+    st.session_state.parsed_ct = {}
+
+def parse_widget(key):
+    text = st.session_state.get(key, "")
+    st.session_state.parsed_ct[key] = (text, *parse_ct_block(text))
+
+# Ct metin alanı ve ayrıştırılmış değerleri; değer geri çağırma dışında değiştiyse (ör. ilk çizim) burada ayrıştırılır
+# Sayıya çevrilemeyen değerler NaN olarak tutulur ve satır numaralarıyla alanın altında bildirilir
+def ct_text_area(label, key):
+    text = st.text_area(label, key=key, on_change=parse_widget, args=(key,))
+    parsed = st.session_state.parsed_ct.get(key)
+    if parsed is None or parsed[0] != text:
+        parse_widget(key)
+    _, values, bad_tokens = st.session_state.parsed_ct[key]
+    if bad_tokens:
+        shown = ", ".join(f"{line}: '{token}'" for line, token in bad_tokens[:MAX_REPORTED_TOKENS])
+        if len(bad_tokens) > MAX_REPORTED_TOKENS:
+            shown += ", …"
+        st.warning(translations[language_code]["invalid_ct_tokens"].format(count=len(bad_tokens), tokens=shown))
+    return values
+
+# Her gen ve hasta grubu için okunan ham Ct serileri (analiz motoruna toplu olarak verilir)
+control_target_series = []
+control_reference_series = []
+sample_target_series = []
+sample_reference_series = []
 
 control_group = translations[language_code]["control_group"]
 target_gene = translations[language_code]["target_gene"]
 reference_gene = translations[language_code]["reference_gene"]
 ct_value = translations[language_code]["ct_value"]
 patient_group = translations[language_code]["patient_group"]
+# Arşivde saklanan kontrol grubu adı (dosya ve arşiv modunda dosyadaki ad)
+control_label = control_group
+# Referans gen adları; Pfaffl modunda her referans gen için ayrı bir standart eğri seçilir
+reference_genes = [reference_gene]
+# Pfaffl arşivlerinde kaydedilen amplifikasyon faktörleri ve ağırlıklı referans matrisleri
+archived_efficiency = None
+
+
+# Pfaffl: referans Ct matrislerini her referans genin log2(E) ağırlığıyla yeniden normalize et
+# Hedef başına tek referans (veya arşivdeki normalize referans) için tek ağırlık yeterlidir
+def weighted_references(weights):
+    return control_reference * weights[0], sample_reference * weights[0]
+
+
+if input_mode == "manual":
+    num_target_genes = st.number_input(translations[language_code]["num_target_genes"], min_value=1, step=1, key="gene_count")
+    num_patient_groups = st.number_input(translations[language_code]["num_patient_groups"], min_value=1, step=1, key="patient_count")
+    gene_labels = [f"{target_gene} {i+1}" for i in range(num_target_genes)]
+    group_labels = [f"{patient_group} {j+1}" for j in range(num_patient_groups)]
+
+    empty_series = np.array([])
+
+    # Ortak referans genler: her grup için bir kez girilir ve tüm hedef genlerle paylaşılır
+    # Örnek başına normalizasyon Ct'si, referans genlerin Ct ortalamasıdır (geometrik ortalama, geNorm / MIQE)
+    shared_reference = st.checkbox(translations[language_code]["shared_reference"], key="shared_reference")
+    if shared_reference:
+        num_reference_genes = st.number_input(translations[language_code]["num_reference_genes"], min_value=1, step=1, key="reference_count")
+        reference_series = []
+        for g, group_name in enumerate([control_group] + group_labels):
+            st.subheader(f"{group_name} - {reference_gene}")
+            for k in range(num_reference_genes):
+                reference_series.append(ct_text_area(f"{group_name} - {reference_gene} {k+1} - {ct_value}", key=f"shared_reference_ct_{g}_{k}"))
+        reference_width = max(map(len, reference_series), default=0)
+        reference_genes = [f"{reference_gene} {k+1}" for k in range(num_reference_genes)]
+        # (grup, referans gen, örnek) -> (grup, örnek)
+        shared_reference_ct = pad_series(reference_series, reference_width).reshape(num_patient_groups + 1, num_reference_genes, reference_width)
+        group_reference = reference_normalization(shared_reference_ct, axis=1)
 
     # Kontrol Grubu Verileri
-for i in range(num_target_genes):
-    st.subheader(f"{translations[language_code]['control_group']} {i+1} - {translations[language_code]['target_gene']} {i+1}")
-    control_target_ct = st.text_area(f"{translations[language_code]['control_group']} {i+1} - {translations[language_code]['target_gene']} {i+1} - {translations[language_code]['ct_value']}", key=f"control_target_ct_{i}")
-    control_reference_ct = st.text_area(f"{translations[language_code]['control_group']} {i+1} - {translations[language_code]['reference_gene']} {i+1} - {translations[language_code]['ct_value']}", key=f"control_reference_ct_{i}")
-   
-    control_target_ct_values = np.array(parse_input_data(control_target_ct))
-    control_reference_ct_values = np.array(parse_input_data(control_reference_ct))
-
-    if len(control_target_ct_values) == 0 or len(control_reference_ct_values) == 0:
-        st.error(translations[language_code]["warning_control_ct"].format(i=i+1))
-        continue
-    
-    min_control_len = min(len(control_target_ct_values), len(control_reference_ct_values))
-    control_target_ct_values = control_target_ct_values[:min_control_len]
-    control_reference_ct_values = control_reference_ct_values[:min_control_len]
-    control_delta_ct = control_target_ct_values - control_reference_ct_values
+    for i in range(num_target_genes):
+        st.subheader(f"{translations[language_code]['control_group']} {i+1} - {translations[language_code]['target_gene']} {i+1}")
+        control_target_ct_values = ct_text_area(f"{translations[language_code]['control_group']} {i+1} - {translations[language_code]['target_gene']} {i+1} - {translations[language_code]['ct_value']}", key=f"control_target_ct_{i}")
+
+        if shared_reference:
+            control_reference_ct_values = group_reference[0]
+        else:
+            control_reference_ct_values = ct_text_area(f"{translations[language_code]['control_group']} {i+1} - {translations[language_code]['reference_gene']} {i+1} - {translations[language_code]['ct_value']}", key=f"control_reference_ct_{i}")
+
+        if not np.isfinite(control_target_ct_values).any() or not np.isfinite(control_reference_ct_values).any():
+            st.error(translations[language_code]["warning_control_ct"].format(i=i+1))
+            control_target_series.append(empty_series)
+            control_reference_series.append(empty_series)
+            sample_target_series.extend([empty_series] * num_patient_groups)
+            sample_reference_series.extend([empty_series] * num_patient_groups)
+            continue
 
-    average_control_delta_ct = np.mean(control_delta_ct) if len(control_delta_ct) > 0 else None
-    sample_counter = 1  # Kontrol grubu örnek sayacı
+        control_target_series.append(control_target_ct_values)
+        control_reference_series.append(control_reference_ct_values)
     
-    for idx in range(min_control_len):
-        input_values_table.append({
-            translations[language_code]["sample_number"]: sample_counter,
-            translations[language_code]["target_gene"]: f"{target_gene} {i+1}",
-            "Grup": translations[language_code]["control_group"],
-            translations[language_code]["target_ct"]: control_target_ct_values[idx],
-            translations[language_code]["reference_ct"]: control_reference_ct_values[idx],  
-            translations[language_code]["delta_ct_control"]: control_delta_ct[idx]
-        })
-        sample_counter += 1
-    
-    
-    for j in range(num_patient_groups):
-        st.subheader(f"{translations[language_code]['patient_group']} {j+1} - {translations[language_code]['target_gene']} {i+1}")        
-        
-        sample_target_ct = st.text_area(f"{translations[language_code]['patient_group']} {j+1} - {translations[language_code]['target_gene']} {i+1} - {translations[language_code]['ct_value']}", key=f"sample_target_ct_{i}_{j}")
-        sample_reference_ct = st.text_area(f"{translations[language_code]['patient_group']} {j+1} - {translations[language_code]['reference_gene']} {i+1} - {translations[language_code]['ct_value']}", key=f"sample_reference_ct_{i}_{j}")
-        
-        sample_target_ct_values = np.array(parse_input_data(sample_target_ct))
-        sample_reference_ct_values = np.array(parse_input_data(sample_reference_ct))
-         
-        if len(sample_target_ct_values) == 0 or len(sample_reference_ct_values) == 0:
-            st.error(translations[language_code]["warning_patient_ct"].format(j=j+1))
-            continue
-        
-        min_sample_len = min(len(sample_target_ct_values), len(sample_reference_ct_values))
-        sample_target_ct_values = sample_target_ct_values[:min_sample_len]
-        sample_reference_ct_values = sample_reference_ct_values[:min_sample_len]
-        sample_delta_ct = sample_target_ct_values - sample_reference_ct_values
-        
-        average_sample_delta_ct = np.mean(sample_delta_ct) if len(sample_delta_ct) > 0 else None
+        for j in range(num_patient_groups):
+            st.subheader(f"{translations[language_code]['patient_group']} {j+1} - {translations[language_code]['target_gene']} {i+1}")        
         
-        sample_counter = 1  
-        for idx in range(min_sample_len):
-            input_values_table.append({
-                translations[language_code]["sample_number"]: sample_counter,
-                translations[language_code]["target_gene"]: f"{translations[language_code]['target_gene']} {i+1}",
-                "Grup": f"{translations[language_code]['patient_group']} {j+1}",
-                translations[language_code]["target_ct"]: sample_target_ct_values[idx],
-                translations[language_code]["reference_ct"]: sample_reference_ct_values[idx],
-                translations[language_code]["delta_ct_patient"]: sample_delta_ct[idx]
-            })
-            sample_counter += 1
-        
-        # ΔΔCt ve Gen Ekspresyon Değişimi Hesaplama
-        if average_control_delta_ct is not None and average_sample_delta_ct is not None:
-            delta_delta_ct = average_sample_delta_ct - average_control_delta_ct
-            expression_change = 2 ** (-delta_delta_ct)
-            
-            if expression_change == 1:
-                regulation_status = translations[language_code]["no_change"]
-            elif expression_change > 1:
-                regulation_status = translations[language_code]["upregulated"]
+            sample_target_ct_values = ct_text_area(f"{translations[language_code]['patient_group']} {j+1} - {translations[language_code]['target_gene']} {i+1} - {translations[language_code]['ct_value']}", key=f"sample_target_ct_{i}_{j}")
+
+            if shared_reference:
+                sample_reference_ct_values = group_reference[j + 1]
             else:
-                regulation_status = translations[language_code]["downregulated"]
-       
-        # İstatistiksel Testler
-            shapiro_control = stats.shapiro(control_delta_ct)
-            shapiro_sample = stats.shapiro(sample_delta_ct)
-            levene_test = stats.levene(control_delta_ct, sample_delta_ct)
-            
-            control_normal = shapiro_control.pvalue > 0.05
-            sample_normal = shapiro_sample.pvalue > 0.05
-            equal_variance = levene_test.pvalue > 0.05
-            
-            if control_normal and sample_normal:
-               if equal_variance:
-                   test_pvalue = stats.ttest_ind(control_delta_ct, sample_delta_ct).pvalue
-                   test_method = translations[language_code]["t_test"]
-               else:
-                   test_pvalue = stats.ttest_ind(control_delta_ct, sample_delta_ct, equal_var=False).pvalue
-                   test_method = translations[language_code]["welch_t_test"]
-               test_type = translations[language_code]["parametric"]
+                sample_reference_ct_values = ct_text_area(f"{translations[language_code]['patient_group']} {j+1} - {translations[language_code]['reference_gene']} {i+1} - {translations[language_code]['ct_value']}", key=f"sample_reference_ct_{i}_{j}")
+
+            if not np.isfinite(sample_target_ct_values).any() or not np.isfinite(sample_reference_ct_values).any():
+                st.error(translations[language_code]["warning_patient_ct"].format(j=j+1))
+                sample_target_series.append(empty_series)
+                sample_reference_series.append(empty_series)
+                continue
+
+            sample_target_series.append(sample_target_ct_values)
+            sample_reference_series.append(sample_reference_ct_values)
+
+    control_width = max(map(len, control_target_series + control_reference_series), default=0)
+    sample_width = max(map(len, sample_target_series + sample_reference_series), default=0)
+    control_target = pad_series(control_target_series, control_width)
+    control_reference = pad_series(control_reference_series, control_width)
+    sample_target = pad_series(sample_target_series, sample_width).reshape(num_target_genes, num_patient_groups, sample_width)
+    sample_reference = pad_series(sample_reference_series, sample_width).reshape(num_target_genes, num_patient_groups, sample_width)
+
+    if shared_reference:
+        # Ağırlıklı grup referansları, ağırlıksız matrislerle aynı hücrelere yerleştirilir
+        # (ağırlıklar sonlu olduğundan boş hücreler iki matriste de aynıdır)
+        def weighted_references(weights):
+            weighted_group_reference = reference_normalization(shared_reference_ct, axis=1, weights=weights)
+            control_weighted = pad_series(weighted_group_reference[:1], control_width)
+            sample_weighted = pad_series(weighted_group_reference[1:], sample_width)[None]
+            return (
+                np.where(np.isnan(control_reference), np.nan, control_weighted),
+                np.where(np.isnan(sample_reference), np.nan, sample_weighted),
+            )
+else:
+    # Dosya veya arşiv yükleme: widget sayısı panel büyüklüğünden bağımsızdır
+    num_target_genes = 0
+    num_patient_groups = 0
+    gene_labels = []
+    group_labels = []
+    control_target = control_reference = np.empty((0, 0))
+    sample_target = sample_reference = np.empty((0, 0, 0))
+
+    if input_mode == "file":
+        uploaded_file = st.file_uploader(translations[language_code]["upload_file"], type=["csv", "tsv", "txt", "xlsx"], key="plate_file")
+        if uploaded_file is not None:
+            try:
+                plate_table, plate_report = read_plate_export_cached(uploaded_file)
+                plate_groups = list(pd.unique(plate_table["group"].astype(str)))
+                control_name = st.selectbox(translations[language_code]["control_group_select"], options=plate_groups, key="plate_control_group")
+                # Ön işleme: teknik tekrarların ortalaması, belirsiz / eşik üstü Ct maskeleme ve aykırı kuyu filtresi
+                aggregate_replicates = st.checkbox(translations[language_code]["aggregate_replicates"], value=True, key="aggregate_replicates")
+                ct_cutoff = st.number_input(translations[language_code]["ct_cutoff"], min_value=0.0, value=DEFAULT_CT_CUTOFF, step=0.5, key="ct_cutoff")
+                outlier_method = st.selectbox(
+                    translations[language_code]["outlier_method"],
+                    options=OUTLIER_METHODS,
+                    format_func=lambda method: translations[language_code][f"outlier_{method}"],
+                    key="outlier_method"
+                )
+                sd_threshold = DEFAULT_SD_THRESHOLD
+                if outlier_method == "sd":
+                    sd_threshold = st.number_input(translations[language_code]["sd_threshold"], min_value=0.0, value=DEFAULT_SD_THRESHOLD, step=0.1, key="sd_threshold")
+                plate_clean, preprocess_report = preprocess_plate_cached(
+                    plate_table, ct_cutoff=ct_cutoff, outlier_method=outlier_method,
+                    sd_threshold=sd_threshold, aggregate=aggregate_replicates
+                )
+                plate_panel = build_panel(plate_clean, control_name)
+            except ValueError as e:
+                st.error(f"{translations[language_code]['file_error']} {e}")
             else:
-                test_pvalue = stats.mannwhitneyu(control_delta_ct, sample_delta_ct).pvalue
-                test_method = translations[language_code]["mann_whitney_u_test"]
-                test_type = translations[language_code]["non_parametric"]
-               
-            significance = translations[language_code]["significant"] if test_pvalue < 0.05 else translations[language_code]["insignificant"]
-            
-            stats_data.append({
-                translations[language_code]["target_gene"]: f"{translations[language_code]['target_gene']} {i+1}",
-                translations[language_code]["patient_group"]: f"{translations[language_code]['patient_group']} {j+1}",
-                translations[language_code]["test_type"]: test_type,
-                translations[language_code]["test_method"]: test_method,
-                translations[language_code]["test_pvalue"]: test_pvalue,
-                translations[language_code]["significance"]: significance
-            })
-            
-            data.append({
-                translations[language_code]["target_gene"]: f"{translations[language_code]['target_gene']} {i+1}",
-                translations[language_code]["patient_group"]: f"{translations[language_code]['patient_group']} {j+1}",
-                translations[language_code]["delta_delta_ct"]: delta_delta_ct,
-                translations[language_code]["gene_expression_change"]: expression_change,
-                translations[language_code]["regulation_status"]: regulation_status,
-                translations[language_code]["delta_ct_control"]: average_control_delta_ct,
-                translations[language_code]["delta_ct_patient"]: average_sample_delta_ct
-            })
+                st.info(translations[language_code]["file_report"].format(no_reference=plate_panel["no_reference"], **plate_report))
+                st.info(translations[language_code]["preprocess_report"].format(**preprocess_report))
+                if len(preprocess_report["removed"]):
+                    with st.expander(translations[language_code]["removed_wells"]):
+                        removed_labels = label_table(language_code)["values"]["removal_reason"]
+                        st.dataframe(preprocess_report["removed"].assign(
+                            reason=preprocess_report["removed"]["reason"].map(removed_labels)
+                        ).rename(columns={
+                            "sample": translations[language_code]["sample"],
+                            "group": translations[language_code]["Grup"],
+                            "gene": translations[language_code]["gene"],
+                            "role": translations[language_code]["well_role"],
+                            "ct": "Ct",
+                            "reason": translations[language_code]["removal_reason"],
+                        }))
+                control_label = control_name
+                reference_genes = plate_panel["reference_genes"]
+                gene_labels = plate_panel["genes"]
+                group_labels = plate_panel["patient_groups"]
+                num_target_genes = len(gene_labels)
+                num_patient_groups = len(group_labels)
+                control_target = plate_panel["control_target"]
+                control_reference = plate_panel["control_reference"]
+                sample_target = plate_panel["sample_target"]
+                sample_reference = plate_panel["sample_reference"]
+
+                # Her örneğin referans genleri ağırlıklandırılıp yeniden ortalanır ve hücrelere dağıtılır
+                def weighted_references(weights):
+                    weighted_reference_ct = reference_normalization(plate_panel["reference_ct"], axis=1, weights=weights)
+                    return (
+                        gather_rows(weighted_reference_ct, plate_panel["control_reference_rows"]),
+                        gather_rows(weighted_reference_ct, plate_panel["sample_reference_rows"]),
+                    )
+    else:
+        # Önceki analiz arşivi: Ct tabloları metin ayrıştırması yapılmadan tipleriyle yüklenir
+        archive_file = st.file_uploader(translations[language_code]["upload_archive"], type=["zip"], key="archive_file")
+        if archive_file is not None:
+            try:
+                archive = import_analysis_cached(archive_file)
+            except ValueError as e:
+                st.error(f"{translations[language_code]['file_error']} {e}")
+            else:
+                st.info(translations[language_code]["archive_loaded"].format(statistics=translations[language_code][archive["statistics"]]))
+                # Yeni yüklenen arşivde istatistik modu kaydedildiği moda ayarlanır; böylece kaydedilen sonuçlar
+                # yeniden üretilir (kullanıcı modu daha sonra değiştirebilir)
+                # Miktar belirleme yöntemi de aynı şekilde geri yüklenir
+                if st.session_state.get("loaded_archive") != archive_file.file_id:
+                    st.session_state.loaded_archive = archive_file.file_id
+                    if archive["statistics"] in STATISTICS_MODES:
+                        st.session_state.statistics_mode = archive["statistics"]
+                    if archive["quantification"] in QUANTIFICATION_METHODS:
+                        st.session_state.quantification = archive["quantification"]
+                if archive["quantification"] == "pfaffl":
+                    archived_efficiency = archive
+                control_label = archive["control_group"]
+                gene_labels = archive["genes"]
+                group_labels = archive["patient_groups"]
+                num_target_genes = len(gene_labels)
+                num_patient_groups = len(group_labels)
+                control_target = archive["control_target"]
+                control_reference = archive["control_reference"]
+                sample_target = archive["sample_target"]
+                sample_reference = archive["sample_reference"]
+
+# Miktar belirleme modeli: 2^(-ΔΔCt) (%100 verimlilik) veya standart eğrilerden verimlilik düzeltmeli Pfaffl
+# Giriş tablosu ve dağılım grafikleri ham Ct / ΔCt değerlerini gösterir; analiz verimlilik ağırlıklı matrisleri kullanır
+analysis_matrices = (control_target, control_reference, sample_target, sample_reference)
+# Pfaffl analizinde arşive yazılan amplifikasyon faktörleri ve ağırlıklı referanslar (None: 2^(-ΔΔCt))
+efficiency = None
+quantification = st.selectbox(
+    translations[language_code]["quantification_method"],
+    options=QUANTIFICATION_METHODS,
+    format_func=lambda method: translations[language_code][method],
+    key="quantification"
+)
+if quantification == "pfaffl":
+    curve_file = st.file_uploader(translations[language_code]["upload_standard_curve"], type=["csv", "tsv", "txt", "xlsx"], key="standard_curve_file")
+    if curve_file is not None:
+        try:
+            curves = standard_curves(read_standard_curve_cached(curve_file))
+        except ValueError as e:
+            st.error(f"{translations[language_code]['file_error']} {e}")
+        else:
+            st.subheader(translations[language_code]["standard_curves"])
+            st.write(curves.rename_axis(translations[language_code]["target_gene"]).rename(columns={
+                "points": "n",
+                "slope": translations[language_code]["slope"],
+                "intercept": translations[language_code]["intercept"],
+                "r_squared": "R²",
+                "amplification": translations[language_code]["amplification_factor"],
+                "efficiency": translations[language_code]["efficiency_percent"],
+                "usable": translations[language_code]["usable_curve"],
+            }))
+            curve_genes = list(curves.index)
+            # Her referans gen kendi eğrisiyle ağırlıklandırılır; varsayılan, aynı adlı eğridir
+            st.markdown(f"**{translations[language_code]['reference_curves']}**")
+            reference_curves = [
+                st.selectbox(
+                    gene,
+                    options=[""] + curve_genes,
+                    index=curve_genes.index(gene) + 1 if gene in curve_genes else 0,
+                    format_func=lambda curve: curve or translations[language_code]["ideal_efficiency"],
+                    key=f"reference_curve_{k}"
+                )
+                for k, gene in enumerate(reference_genes)
+            ]
+            # Eğrisi olmayan veya kabul aralığı dışında kalan genler %100 verimlilikle analiz edilir
+            missing_curves = [gene for gene, usable in zip(gene_labels, usable_curves(curves, gene_labels)) if not usable]
+            missing_curves += [gene for gene, usable in zip(reference_genes, usable_curves(curves, reference_curves)) if not usable]
+            if missing_curves:
+                st.warning(translations[language_code]["missing_standard_curve"].format(
+                    genes=", ".join(missing_curves),
+                    min_amplification=f"{MIN_AMPLIFICATION:g}",
+                    max_amplification=f"{MAX_AMPLIFICATION:g}",
+                    min_r_squared=f"{MIN_R_SQUARED:g}",
+                ))
+            reference_amplification = gene_amplification(curves, reference_curves)
+            efficiency = {
+                "target_amplification": gene_amplification(curves, gene_labels),
+                "reference_amplification": dict(zip(reference_genes, reference_amplification)),
+                "weighted_reference": weighted_references(np.log2(reference_amplification)),
+            }
+    elif archived_efficiency is not None:
+        # Eğri dosyası yüklenmediyse arşivdeki faktörlerle kaydedilen sonuçlar yeniden üretilir
+        st.info(translations[language_code]["archived_efficiency"])
+        efficiency = {
+            "target_amplification": archived_efficiency["target_amplification"],
+            "reference_amplification": archived_efficiency["reference_amplification"],
+            "weighted_reference": (archived_efficiency["weighted_control_reference"], archived_efficiency["weighted_sample_reference"]),
+        }
+    if efficiency is not None:
+        analysis_matrices = efficiency_weighted(
+            control_target,
+            efficiency["weighted_reference"][0],
+            sample_target,
+            efficiency["weighted_reference"][1],
+            efficiency["target_amplification"]
+        )
+
+# Küçük gruplarda (n=3-6) Shapiro-Wilk ön testinin gücü düşük olduğundan permütasyon testi seçilebilir
+statistics_mode = st.selectbox(
+    translations[language_code]["test_selection"],
+    options=STATISTICS_MODES,
+    format_func=lambda mode: translations[language_code][mode],
+    key="statistics_mode"
+)
+
+# ΔCt, ΔΔCt, Gen Ekspresyon Değişimi ve istatistikler tüm gen x grup hücreleri için tek geçişte hesaplanır
+# Ct verileri değişmediyse sonuçlar önbellekten gelir; değiştiyse yalnızca değişen hücreler yeniden test edilir
+panel = run_analysis(*analysis_matrices, statistics_mode)
+
+# Giriş verileri dizi tabanlı tek bir tabloda tutulur; görüntüleme, CSV, grafik ve PDF bu tabloyu kullanır
+# Tablo ve sonuçlar dilden bağımsızdır; etiketler yalnızca görüntüleme tablolarına eklenir
+sample_table = cached_sample_table(control_target, control_reference, sample_target, sample_reference)
+input_df = sample_table.to_frame(
+    label_table(language_code)["input_columns"],
+    gene_labels,
+    [control_label] + group_labels
+)
+
+# İsteğe bağlı bootstrap güven aralıkları (tüm karşılaştırmalar için işlem havuzunda)
+results = panel["results"]
+if efficiency is not None:
+    results = with_raw_delta_ct(results, control_target, control_reference, sample_target, sample_reference)
+if panel["valid"].any() and st.checkbox(translations[language_code]["bootstrap_ci"], key="bootstrap_enabled"):
+    bootstrap_col1, bootstrap_col2 = st.columns(2)
+    bootstrap_resamples = bootstrap_col1.number_input(translations[language_code]["bootstrap_resamples"], min_value=1000, max_value=100000, value=10000, step=1000, key="bootstrap_resamples")
+    bootstrap_method = bootstrap_col2.selectbox(translations[language_code]["bootstrap_method"], options=BOOTSTRAP_METHODS, format_func=lambda method: translations[language_code][method], key="bootstrap_method")
+    results = with_confidence_intervals(results, run_bootstrap(panel, int(bootstrap_resamples), 0.95, bootstrap_method))
+
+# ΔΔCt, Gen Ekspresyon Değişimi ve istatistik tabloları seçilen dilde
+results_df = localize_frame(results, language_code, "result_columns", gene_labels, group_labels)
+stats_df = localize_frame(panel["stats"], language_code, "stats_columns", gene_labels, group_labels)
+
+# İndirme dosyaları yalnızca düğmeye basıldığında hazırlanır; anahtarlar veri özetleri, etiketler ve dildir
+# Giriş tablosunun anahtarı Ct matrislerinden türetilir (büyük tablo her çalıştırmada özetlenmez)
+input_key = hash_text(
+    hash_arrays(control_target, control_reference, sample_target, sample_reference),
+    language_code, control_label, str(len(gene_labels)), *gene_labels, *group_labels,
+)
+results_key = hash_arrays(pd.util.hash_pandas_object(results_df, index=False).to_numpy())
+stats_key = hash_arrays(pd.util.hash_pandas_object(stats_df, index=False).to_numpy())
+compress_exports = False
 
 # Giriş Verileri Tablosunu Göster
-if input_values_table: 
+if len(sample_table): 
     st.subheader(f" {translations[language_code]['gr_tbl']}")
-    input_df = pd.DataFrame(input_values_table) 
-    st.write(input_df) 
-
-    csv = input_df.to_csv(index=False).encode("utf-8")  
+    # Tek duyarlıklı Ct sütunları yalnızca görüntülemede biçimlendirilir (ikili yuvarlama artıkları gizlenir)
+    st.dataframe(input_df, column_config={
+        column: st.column_config.NumberColumn(format=CT_DISPLAY_FORMAT)
+        for column in input_df.select_dtypes(CT_DTYPE).columns
+    })
+
+    compress_exports = st.checkbox(translations[language_code]["compress_exports"], key="compress_exports")
+    input_file_name, csv_mime = csv_download("giris_verileri", compress_exports)
     st.download_button(
         label=translations[language_code]['download_csv'],  # Dil koduna göre etiket
-        data=csv, file_name="giris_verileri.csv", mime="text/csv") 
+        data=lazy_csv(input_df, ("input", input_key), compress_exports),
+        file_name=input_file_name, mime=csv_mime, on_click="ignore") 
 
 
 
 # Sonuçlar Tablosunu Göster
-if data:
+if len(results_df):
     st.subheader(f" {translations[language_code]['nil_mine']}")
-
-    df = pd.DataFrame(data)
-    st.write(df)
+    st.write(results_df)
 
 # İstatistik Sonuçları
-if stats_data:
+if len(stats_df):
     st.subheader(f" {translations[language_code]['statistical_results']}")
-    
-    stats_df = pd.DataFrame(stats_data)
     st.write(stats_df)
     
-    csv_stats = stats_df.to_csv(index=False).encode("utf-8")
+    stats_file_name, csv_mime = csv_download("istatistik_sonuclari", compress_exports)
     st.download_button(
         label=translations[language_code]['download_csv'],  # Dil koduna göre etiket
-        data=csv_stats,
-        file_name="istatistik_sonuclari.csv",
-        mime="text/csv")
-
+        data=lazy_csv(stats_df, ("stats", stats_key), compress_exports),
+        file_name=stats_file_name,
+        mime=csv_mime,
+        on_click="ignore")
+
+# Analiz arşivi: örnek, sonuç ve istatistik tabloları tipli sütunlarla Parquet veya Arrow IPC olarak
+if len(sample_table):
+    archive_col1, archive_col2 = st.columns(2)
+    archive_format = archive_col1.selectbox(translations[language_code]["archive_format"], options=ARCHIVE_FORMATS, format_func=str.capitalize, key="archive_format")
+    # Arşiv oluşturma fonksiyonu bu çalıştırmanın verilerine bağlanır (tıklama ayrı bir iş parçacığında işlenir)
+    archive_col2.download_button(
+        label=translations[language_code]["download_archive"],
+        data=lazy_payload(
+            ("archive", input_key, results_key, stats_key, statistics_mode, quantification, archive_format),
+            functools.partial(export_analysis, (control_target, control_reference, sample_target, sample_reference), results, panel["stats"], gene_labels, control_label, group_labels, statistics_mode, archive_format, efficiency)
+        ),
+        file_name=f"gen_ekspresyon_analizi_{archive_format}.zip",
+        mime="application/zip",
+        on_click="ignore")
 
-import streamlit as st
-import plotly.graph_objects as go
-import numpy as np
-import pandas as pd
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image as RLImage, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-from io import BytesIO
+    # Tek Excel çalışma kitabı: ham Ct, ΔCt, ΔΔCt / ekspresyon değişimi ve istatistik sayfaları
+    sheet_names = tuple(translations[language_code][key] for key in ("sheet_raw_ct", "sheet_delta_ct", "sheet_results", "sheet_statistics"))
+    st.download_button(
+        label=translations[language_code]["download_xlsx"],
+        data=lazy_payload(
+            ("xlsx", input_key, results_key, stats_key, sheet_names),
+            functools.partial(xlsx_bytes, input_df, results_df, stats_df, sheet_names)
+        ),
+        file_name="gen_ekspresyon_analizi.xlsx",
+        mime=XLSX_MIME,
+        on_click="ignore")
 
 # --- Grafik oluşturma ---
 
-# Grafik oluşturma (her hedef gen için bir grafik oluşturulacak)
-for i in range(num_target_genes):
-    st.subheader(f"{translations[language_code]['target_gene']} {i+1} - {translations[language_code]['distribution_graph']}")
-
-    # Kontrol Grubu Verileri
-    control_target_ct_values = [
-        d[translations[language_code]["target_ct"]] 
-        for d in input_values_table
-        if d["Grup"] == translations[language_code]["control_group"] and
-           d[translations[language_code]["target_gene"]] == f"{translations[language_code]['target_gene']} {i+1}"
-    ]
-
-    control_reference_ct_values = [
-        d[translations[language_code]["reference_ct"]] 
-        for d in input_values_table
-        if d["Grup"] == translations[language_code]["control_group"] and
-           d[translations[language_code]["target_gene"]] == f"{translations[language_code]['target_gene']} {i+1}"
-    ]
+# Panel geneli ısı haritası: tüm genler tek bir grafikte
+heatmap = None
+if panel["valid"].any():
+    st.subheader(translations[language_code]["heatmap_overview"])
+    cluster_heatmap = st.checkbox(translations[language_code]["cluster_genes"], key="cluster_heatmap")
+    heatmap = heatmap_figure(
+        -panel["delta_delta_ct"],
+        panel["test_pvalue"],
+        gene_labels,
+        group_labels,
+        translations[language_code],
+        language_code,
+        cluster=cluster_heatmap
+    )
+    st.plotly_chart(heatmap, key="panel_heatmap")
+
+
+# Bir hedef genin dağılım grafiği; kontrol verisi yoksa None
+# Aynı veriler için grafik önbellekten gelir ve jitter her çalıştırmada aynı kalır
+def gene_distribution_figure(i):
+    # Kontrol Grubu Verileri (örnek tablosundan O(1) dilim erişimi)
+    control_delta_ct = sample_table.cell_delta_ct(i, CONTROL_GROUP_CODE)
+    if len(control_delta_ct) == 0:
+        return None
+
+    return distribution_figure(
+        gene_labels[i],
+        control_delta_ct,
+        [sample_table.cell_delta_ct(i, j + 1) for j in range(num_patient_groups)],
+        group_labels,
+        translations[language_code],
+        language_code,
+        control_label
+    )
 
-    if len(control_target_ct_values) == 0 or len(control_reference_ct_values) == 0:
-        st.error(f" {translations[language_code]['error_missing_control_data'].format(i=i+1)}")
-        continue
 
-    control_delta_ct = np.array(control_target_ct_values) - np.array(control_reference_ct_values)
-    average_control_delta_ct = np.mean(control_delta_ct)
+# Grafik oluşturma (her hedef gen için bir grafik; yalnızca seçili sayfadaki grafikler çizilir)
+visible_genes = range(0)
+if num_target_genes > 0:
+    chart_col1, chart_col2 = st.columns(2)
+    charts_per_page = chart_col1.selectbox(translations[language_code]["charts_per_page"], options=CHART_PAGE_SIZES, key="charts_per_page")
+    page_count = max(1, math.ceil(num_target_genes / charts_per_page))
+    if st.session_state.get("chart_page", 1) > page_count:
+        st.session_state.chart_page = page_count
+    chart_page = chart_col2.number_input(translations[language_code]["page"], min_value=1, max_value=page_count, step=1, key="chart_page")
+    visible_genes = range((chart_page - 1) * charts_per_page, min(chart_page * charts_per_page, num_target_genes))
 
-    # Grafik başlatma
-    fig = go.Figure()
+for i in visible_genes:
+    st.subheader(f"{gene_labels[i]} - {translations[language_code]['distribution_graph']}")
 
-    # Kontrol Grubu Ortalama Çizgisi
-    fig.add_trace(go.Scatter(
-        x=[0.8, 1.2],  
-        y=[average_control_delta_ct, average_control_delta_ct],  
-        mode='lines',
-        line=dict(color='black', width=4),
-        name=translations[language_code]["control_group_avg"]
-    ))
+    fig = gene_distribution_figure(i)
+    if fig is None:
+        st.error(f" {translations[language_code]['error_missing_control_data'].format(gene=gene_labels[i])}")
+        continue
 
-    # Hasta Gruplarının Ortalama Çizgileri
-    for j in range(num_patient_groups):
-        sample_delta_ct_values = [
-            d[translations[language_code]["delta_ct_patient"]] 
-            for d in input_values_table 
-            if d["Grup"] == f"{translations[language_code]['patient_group']} {j+1}" and 
-               d[translations[language_code]["target_gene"]] == f"{translations[language_code]['target_gene']} {i+1}"
-        ]
-
-        if not sample_delta_ct_values:
-            continue  
-
-        average_sample_delta_ct = np.mean(sample_delta_ct_values)
-        fig.add_trace(go.Scatter(
-            x=[(j + 1.8), (j + 2.2)],  
-            y=[average_sample_delta_ct, average_sample_delta_ct],  
-            mode='lines',
-            line=dict(color='black', width=4),
-            name=f"{translations[language_code]['patient_group']} {j+1} {translations[language_code]['avg']}"
-        ))
-
-    # Veri Noktaları (Kontrol Grubu)
-    fig.add_trace(go.Scatter(
-        x=np.ones(len(control_delta_ct)) + np.random.uniform(-0.05, 0.05, len(control_delta_ct)),
-        y=control_delta_ct,
-        mode='markers',  
-        name=translations[language_code]["control_group"],
-        marker=dict(color='blue'),
-        text=[f"{translations[language_code]['control']} {value:.2f}, {translations[language_code]['sample']} {idx+1}" for idx, value in enumerate(control_delta_ct)],
-        hoverinfo='text'
-    ))
+    st.plotly_chart(fig, key=f"distribution_chart_{i}")
 
-    # Veri Noktaları (Hasta Grupları)
-    for j in range(num_patient_groups):
-        sample_delta_ct_values = [
-            d[translations[language_code]["delta_ct_patient"]] 
-            for d in input_values_table 
-            if d["Grup"] == f"{translations[language_code]['patient_group']} {j+1}" and 
-               d[translations[language_code]["target_gene"]] == f"{translations[language_code]['target_gene']} {i+1}"
-        ]
-
-        if not sample_delta_ct_values:
-            continue  
-
-        fig.add_trace(go.Scatter(
-            x=np.ones(len(sample_delta_ct_values)) * (j + 2) + np.random.uniform(-0.05, 0.05, len(sample_delta_ct_values)),
-            y=sample_delta_ct_values,
-            mode='markers',  
-            name=f"{translations[language_code]['patient_group']} {j+1}",
-            marker=dict(color='red'),
-            text=[f"{translations[language_code]['patient']} {value:.2f}, {translations[language_code]['sample']} {idx+1}" for idx, value in enumerate(sample_delta_ct_values)],
-            hoverinfo='text'
-        ))
-
-    # Grafik ayarları
-    fig.update_layout(
-        title=f"{translations[language_code]['target_gene']} {i+1} - {translations[language_code]['delta_ct_distribution']}",
-        xaxis=dict(
-            tickvals=[1] + [j + 2 for j in range(num_patient_groups)],
-            ticktext=[translations[language_code]['control_group']] + [f"{translations[language_code]['patient_group']} {j+1}" for j in range(num_patient_groups)],
-            title=translations[language_code]['x_axis_title']
-        ),
-        yaxis=dict(title=translations[language_code]['delta_ct_value']),
-        showlegend=True
+# PDF rapor oluşturma kısmı (büyük giriş tablolarında varsayılan olarak ham veriler yerine özet eklenir)
+pdf_col1, pdf_col2 = st.columns(2)
+summarize_raw = pdf_col1.checkbox(
+    translations[language_code]["pdf_summarize_raw"],
+    value=len(sample_table) > RAW_TABLE_ROW_LIMIT,
+    key="pdf_summarize_raw"
+)
+# Grafikler statik görüntü olarak eklenir (kaleido gerekir)
+include_charts = pdf_col2.checkbox(
+    translations[language_code]["pdf_include_charts"],
+    value=STATIC_RENDERING_AVAILABLE,
+    disabled=not STATIC_RENDERING_AVAILABLE,
+    key="pdf_include_charts"
+)
+if not STATIC_RENDERING_AVAILABLE:
+    pdf_col2.caption(translations[language_code]["static_rendering_unavailable"])
+
+# Rapor anahtarı: girdi verileri, sonuçlar, seçenekler ve dil; aynı anahtarlı PDF'ler önbellekten gelir
+report_key = None
+if len(sample_table):
+    report_key = hash_text(
+        input_key,
+        results_key,
+        stats_key,
+        language_code,
+        str((summarize_raw, include_charts, st.session_state.get("cluster_heatmap", False))),
     )
-    st.plotly_chart(fig)
-# PDF rapor oluşturma kısmı
-def create_pdf(results, stats, input_df, language_code):
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    elements = []
-    
-    styles = getSampleStyleSheet()
-    font_name = 'DejaVu'
-    styles['Normal'].fontName = font_name
-    styles['Title'].fontName = font_name
-    styles['Heading2'].fontName = font_name
-
-    # Başlık
-    elements.append(Paragraph(translations[language_code]["report_title"], styles['Title']))
-    elements.append(Spacer(1, 12))
-
-    # Giriş Verileri Tablosu Başlığı
-    elements.append(Paragraph(translations[language_code]["input_data_table"], styles['Heading2']))
-    
-    # Tablo Verisi
-    table_data = [input_df.columns.tolist()] + input_df.values.tolist()
-    col_width = (letter[0] - 80) / len(input_df.columns)
-    table = Table(table_data, colWidths=[col_width] * len(input_df.columns))
-    
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), font_name),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-    ]))
-    
-    elements.append(table)
-    elements.append(Spacer(1, 12))
-    
-    # Sonuçlar Başlığı
-    elements.append(Paragraph(translations[language_code]["results"], styles['Heading2']))
-    elements.append(Spacer(1, 12))
-    
-    for result in results:
-        text = (f"{result[translations[language_code]['target_gene']]} - {result[translations[language_code]['patient_group']]} | "
-                f"ΔΔCt: {result['ΔΔCt']:.2f} | 2^(-ΔΔCt): {result[translations[language_code]['gene_expression_change']]:.2f} | "
-                f"{result[translations[language_code]['regulation_status']]}")
-        elements.append(Paragraph(text, styles['Normal']))
-        elements.append(Spacer(1, 6))
-    
-    elements.append(PageBreak())
-    
-    # İstatistiksel Sonuçlar
-    elements.append(Paragraph(translations[language_code]["statistical_results"], styles['Heading2']))
-    elements.append(Spacer(1, 12))
-    
-    for stat in stats:
-        text = (f"{stat[translations[language_code]['target_gene']]} - {stat[translations[language_code]['patient_group']]} | "
-                f"{translations[language_code]['test_method']}: {stat[translations[language_code]['test_method']]} | "
-                f"p: {stat[translations[language_code]['test_pvalue']]:.4f} | {stat[translations[language_code]['significance']]}")
-        elements.append(Paragraph(text, styles['Normal']))
-        elements.append(Spacer(1, 6))
-    
-    elements.append(PageBreak())
-    
-    # İstatistiksel Değerlendirme
-    elements.append(Paragraph(translations[language_code]["statistical_evaluation"], styles['Heading2']))
-    elements.append(Spacer(1, 12))
-    
-    explanation = translations[language_code]["statistical_explanation"]
-    
-    for line in explanation.split(". "):
-        elements.append(Paragraph(line.strip() + '.', styles['Normal']))
-        elements.append(Spacer(1, 6))
-    
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
 
+# PDF arka planda hazırlanır; betik beklemeden devam eder
 if st.button(f"📥 {translations[language_code]['generate_pdf']}"):
-    if input_values_table:
-        pdf_buffer = create_pdf(data, stats_data, pd.DataFrame(input_values_table), language_code)
-        st.download_button(label=f"{translations[language_code]['pdf_report']}", data=pdf_buffer, file_name="gen_ekspresyon_raporu.pdf", mime="application/pdf")
+    if report_key is not None:
+        current_job = st.session_state.get("report_job")
+        already_running = current_job is not None and current_job.key == report_key and current_job.status == JOB_RUNNING
+        if report_key not in report_cache and not already_running:
+            # ReportLab ve fontlar yalnızca ilk PDF isteğinde yüklenir
+            from rapor import build_report
+
+            report_figures = []
+            if include_charts:
+                # Grafikler betikte değil rapor işinde oluşturulur ve partiler halinde PNG'ye dönüştürülür
+                report_figures = [lambda: heatmap] if heatmap is not None else []
+                report_figures += [functools.partial(gene_distribution_figure, i) for i in range(num_target_genes)]
+            st.session_state.report_job = submit_report(
+                report_key, build_report, results_df, stats_df, input_df, translations[language_code], summarize_raw, report_figures
+            )
+        st.session_state.report_key = report_key
+        st.session_state.report_cancelled = None
     else:
         st.error(translations[language_code]["error_no_data"])
 
+
+# Rapor işinin durumu: çalışırken ilerleme çubuğu ve iptal düğmesi, bitince indirme düğmesi
+def show_report_status(polling):
+    job = st.session_state.get("report_job")
+    if job is not None and job.key != report_key:
+        job = None
+
+    if job is not None and job.status == JOB_RUNNING:
+        st.progress(job.progress, text=translations[language_code]["report_in_progress"])
+        if st.button(translations[language_code]["cancel"], key="cancel_report"):
+            # Aynı raporu bekleyen başka oturumlar varsa iş onlar için sürer; bu oturum işi bırakır
+            job.cancel()
+            st.session_state.report_job = None
+            st.session_state.report_cancelled = report_key
+            st.rerun()
+        return
+
+    # İş bittiğinde yoklamayı durdurmak için tüm sayfa yeniden çalıştırılır
+    if polling:
+        st.rerun()
+
+    pdf_bytes = report_cache.get(report_key)
+    if pdf_bytes is not None:
+        if job is not None and job.skipped_images:
+            st.warning(translations[language_code]["static_rendering_failed"])
+        st.download_button(label=f"{translations[language_code]['pdf_report']}", data=pdf_bytes, file_name="gen_ekspresyon_raporu.pdf", mime="application/pdf")
+    elif st.session_state.get("report_cancelled") == report_key or (job is not None and job.status == JOB_CANCELLED):
+        st.info(translations[language_code]["report_cancelled"])
+    elif job is not None and job.status == JOB_FAILED:
+        st.error(f"{translations[language_code]['report_failed']}: {job.error}")
+
+
+if report_key is not None and st.session_state.get("report_key") == report_key:
+    report_job = st.session_state.get("report_job")
+    polling = report_job is not None and report_job.key == report_key and report_job.status == JOB_RUNNING
+    st.fragment(show_report_status, run_every=REPORT_POLL_SECONDS if polling else None)(polling)
+
+# Bellek raporu: bu oturumun durumu ve tabloları; önbellekler tüm oturumlarca paylaşılır (yaklaşık değerler)
+if st.checkbox(translations[language_code]["show_memory_usage"], key="show_memory_usage"):
+    seen = set()
+    st.caption(translations[language_code]["memory_report"].format(
+        session=memory_usage(st.session_state.to_dict(), results_df, stats_df, seen=seen) / 2**20,
+        table=memory_usage(sample_table, input_df, seen=seen) / 2**20,
+        shared=shared_cache_memory() / 2**20,
+    ))
+
 st.markdown(f"<h4 style='font-size: 12px; font-family: Arial, sans-serif; color: #555;'><a href='mailto:mailtoburhanettin@gmail.com' style='color: #555; text-decoration: none;'>{translations[language_code]['subtitle']}</a></h4>", unsafe_allow_html=True)
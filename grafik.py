@@ -0,0 +1,271 @@
+import importlib.util
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import plotly.graph_objects as go
+
+from havuz import pool_map
+from onbellek import LRUCache, hash_arrays, hash_text
+
+# Veri noktalarının yatay dağılma genişliği
+JITTER_WIDTH = 0.05
+
+# Bir grafikteki toplam nokta sayısı bu eşiği aşarsa noktalar WebGL (Scattergl) ile çizilir
+WEBGL_POINT_THRESHOLD = 1_000
+# Bir grubun örnek sayısı bu eşiği aşarsa noktalar yerine önceden hesaplanmış kutu grafiği gösterilir
+SUMMARY_POINT_THRESHOLD = 20_000
+
+# Isı haritasında her gen satırının piksel yüksekliği
+HEATMAP_ROW_HEIGHT = 14
+
+# PDF için statik görüntü boyutu (piksel) ve çözünürlük çarpanı
+STATIC_IMAGE_WIDTH = 800
+STATIC_IMAGE_HEIGHT = 500
+STATIC_IMAGE_SCALE = 2
+
+# Statik görüntü dışa aktarımı için kaleido gerekir; yoksa grafikler rapora eklenmez
+STATIC_RENDERING_AVAILABLE = importlib.util.find_spec("kaleido") is not None
+
+# Değişmeyen grafikler yeniden oluşturulmaz
+figure_cache = LRUCache(max_entries=256)
+# Kümeleme sıralamaları veri özetine göre bir kez hesaplanır
+linkage_cache = LRUCache(max_entries=64)
+# Statik PNG görüntüleri grafik JSON özetine göre saklanır
+image_cache = LRUCache(max_entries=512)
+
+
+# Bir grubun veri noktaları izi
+# Fareyle üzerine gelme metni nokta başına Python dizgisi yerine hovertemplate + customdata ile oluşturulur
+# Çok büyük gruplarda yalnızca sunucuda hesaplanan kutu grafiği istatistikleri gönderilir
+def _group_trace(values, position, name, color, hover_label, labels, rng, use_webgl):
+    if len(values) > SUMMARY_POINT_THRESHOLD:
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        iqr = q3 - q1
+        return go.Box(
+            x=[position],
+            q1=[q1],
+            median=[median],
+            q3=[q3],
+            mean=[np.mean(values)],
+            lowerfence=[max(np.min(values), q1 - 1.5 * iqr)],
+            upperfence=[min(np.max(values), q3 + 1.5 * iqr)],
+            name=f"{name} (n={len(values)})",
+            marker=dict(color=color),
+            width=0.3,
+        )
+
+    scatter = go.Scattergl if use_webgl else go.Scatter
+    return scatter(
+        x=np.full(len(values), float(position)) + rng.uniform(-JITTER_WIDTH, JITTER_WIDTH, len(values)),
+        y=values,
+        mode='markers',
+        name=name,
+        marker=dict(color=color),
+        customdata=np.arange(1, len(values) + 1),
+        hovertemplate=f"{hover_label} %{{y:.2f}}, {labels['sample']} %{{customdata}}<extra></extra>",
+    )
+
+
+# ΔCt dağılım grafiği (kontrol + hasta grupları, ortalama çizgileri ile)
+# sample_delta_cts: her hasta grubu için ΔCt dizisi (boş diziler atlanır)
+# labels: seçilen dilin çeviri sözlüğü; seed: gen başına sabit jitter için
+# control_label: kontrol grubunun adı (dosya / arşiv modunda dosyadaki ad; verilmezse çevirideki genel ad)
+def build_distribution_figure(gene_label, control_delta_ct, sample_delta_cts, group_labels, labels, seed, control_label=None):
+    rng = np.random.default_rng(seed)
+    control_label = control_label or labels["control_group"]
+    average_control_delta_ct = np.mean(control_delta_ct)
+
+    # Grafik başlatma
+    fig = go.Figure()
+
+    # Kontrol Grubu Ortalama Çizgisi
+    fig.add_trace(go.Scatter(
+        x=[0.8, 1.2],
+        y=[average_control_delta_ct, average_control_delta_ct],
+        mode='lines',
+        line=dict(color='black', width=4),
+        name=labels["control_group_avg"]
+    ))
+
+    # Hasta Gruplarının Ortalama Çizgileri
+    for j, sample_delta_ct_values in enumerate(sample_delta_cts):
+        if len(sample_delta_ct_values) == 0:
+            continue
+
+        average_sample_delta_ct = np.mean(sample_delta_ct_values)
+        fig.add_trace(go.Scatter(
+            x=[(j + 1.8), (j + 2.2)],
+            y=[average_sample_delta_ct, average_sample_delta_ct],
+            mode='lines',
+            line=dict(color='black', width=4),
+            name=f"{group_labels[j]} {labels['avg']}"
+        ))
+
+    total_points = len(control_delta_ct) + sum(len(values) for values in sample_delta_cts)
+    use_webgl = total_points > WEBGL_POINT_THRESHOLD
+
+    # Veri Noktaları (Kontrol Grubu)
+    fig.add_trace(_group_trace(
+        control_delta_ct, 1, control_label, 'blue', labels['control'], labels, rng, use_webgl
+    ))
+
+    # Veri Noktaları (Hasta Grupları)
+    for j, sample_delta_ct_values in enumerate(sample_delta_cts):
+        if len(sample_delta_ct_values) == 0:
+            continue
+
+        fig.add_trace(_group_trace(
+            sample_delta_ct_values, j + 2, group_labels[j], 'red', labels['patient'], labels, rng, use_webgl
+        ))
+
+    # Grafik ayarları
+    fig.update_layout(
+        title=f"{gene_label} - {labels['delta_ct_distribution']}",
+        xaxis=dict(
+            tickvals=[1] + [j + 2 for j in range(len(sample_delta_cts))],
+            ticktext=[control_label] + list(group_labels),
+            title=labels['x_axis_title']
+        ),
+        yaxis=dict(title=labels['delta_ct_value']),
+        showlegend=True
+    )
+    return fig
+
+
+# Grafiği veri özetine göre önbellekten döndür; jitter tohumu veriden türetildiği için
+# aynı veriler her zaman aynı grafiği üretir
+def distribution_figure(gene_label, control_delta_ct, sample_delta_cts, group_labels, labels, language_code,
+                        control_label=None):
+    data_key = hash_arrays(control_delta_ct, *sample_delta_cts)
+    key = ("distribution", data_key, gene_label, tuple(group_labels), language_code, control_label)
+    return figure_cache.get_or_compute(key, lambda: build_distribution_figure(
+        gene_label, control_delta_ct, sample_delta_cts, group_labels, labels, seed=int(data_key[:8], 16),
+        control_label=control_label
+    ))
+
+
+# Satırların hiyerarşik kümeleme (ortalama bağlantı) sırası; eksik değerler 0 kabul edilir
+# SciPy kümeleme modülü yalnızca kümeleme istendiğinde yüklenir
+def cluster_order(matrix):
+    def compute():
+        from scipy.cluster.hierarchy import leaves_list, linkage
+
+        if matrix.shape[0] < 3:
+            return np.arange(matrix.shape[0])
+        filled = np.where(np.isnan(matrix), 0.0, matrix)
+        return leaves_list(linkage(filled, method="average", metric="euclidean"))
+
+    return linkage_cache.get_or_compute(hash_arrays(matrix), compute)
+
+
+# Tüm panel için gen x grup log2 kat değişimi ısı haritası; anlamlı hücreler tek bir WebGL izinde işaretlenir
+def build_heatmap_figure(log2_fold_change, test_pvalue, gene_labels, group_labels, labels, cluster):
+    gene_order = np.arange(len(gene_labels))
+    group_order = np.arange(len(group_labels))
+    if cluster:
+        gene_order = cluster_order(log2_fold_change)
+        group_order = cluster_order(log2_fold_change.T)
+
+    z = log2_fold_change[np.ix_(gene_order, group_order)]
+    pvalues = test_pvalue[np.ix_(gene_order, group_order)]
+    y = [gene_labels[g] for g in gene_order]
+    x = [group_labels[p] for p in group_order]
+    limit = np.nanmax(np.abs(z)) if np.isfinite(z).any() else 1.0
+
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        z=z,
+        x=x,
+        y=y,
+        customdata=pvalues,
+        colorscale="RdBu_r",
+        zmin=-limit,
+        zmax=limit,
+        colorbar=dict(title="log2(2^(-ΔΔCt))"),
+        hovertemplate="%{y} - %{x}<br>log2: %{z:.2f}<br>p: %{customdata:.4f}<extra></extra>",
+    ))
+
+    # Anlamlılık işaretleri (p < 0.05)
+    rows, cols = np.nonzero(pvalues < 0.05)
+    fig.add_trace(go.Scattergl(
+        x=[x[c] for c in cols],
+        y=[y[r] for r in rows],
+        mode="markers",
+        marker=dict(symbol="circle", size=5, color="black"),
+        name=labels["significant"],
+        hoverinfo="skip",
+    ))
+
+    fig.update_layout(
+        title=labels["heatmap_overview"],
+        xaxis=dict(title=labels["x_axis_title"], type="category"),
+        yaxis=dict(title=labels["target_gene"], type="category", autorange="reversed"),
+        height=max(400, HEATMAP_ROW_HEIGHT * len(gene_labels) + 150),
+        showlegend=True,
+    )
+    return fig
+
+
+# Isı haritasını veri özetine göre önbellekten döndür
+def heatmap_figure(log2_fold_change, test_pvalue, gene_labels, group_labels, labels, language_code, cluster=False):
+    key = ("heatmap", hash_arrays(log2_fold_change, test_pvalue), tuple(gene_labels), tuple(group_labels), language_code, cluster)
+    return figure_cache.get_or_compute(key, lambda: build_heatmap_figure(
+        log2_fold_change, test_pvalue, gene_labels, group_labels, labels, cluster
+    ))
+
+
+# Tek bir grafiği PNG'ye dönüştür (işlem havuzunda çalışır; grafik JSON olarak aktarılır)
+# Dışa aktarım başarısız olursa None döner, rapor grafik olmadan oluşturulur
+def _render_png(task):
+    import plotly.io as pio
+
+    figure_json, width, height = task
+    try:
+        return pio.to_image(pio.from_json(figure_json), format="png", width=width, height=height, scale=STATIC_IMAGE_SCALE)
+    except Exception:
+        return None
+
+
+# Grafikleri PNG olarak dışa aktar; önbellekte olmayanlar paylaşılan (spawn) işlem havuzunda paralel işlenir
+# Her grafik için (png baytları, genişlik, yükseklik) veya işlenemediyse None döner
+def render_static_images(figures, workers=None):
+    if not STATIC_RENDERING_AVAILABLE:
+        return [None] * len(figures)
+
+    tasks = []
+    for fig in figures:
+        height = fig.layout.height or STATIC_IMAGE_HEIGHT
+        tasks.append((fig.to_json(), STATIC_IMAGE_WIDTH, height))
+    keys = [hash_text(figure_json, f"{width}x{height}") for figure_json, width, height in tasks]
+
+    images = {}
+    missing = {}
+    for key, task in zip(keys, tasks):
+        png = image_cache.get(key)
+        if png is not None:
+            images[key] = png
+        else:
+            missing[key] = task
+
+    if missing:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(missing)))
+        if workers == 1:
+            rendered = [_render_png(task) for task in missing.values()]
+        else:
+            try:
+                rendered = pool_map(_render_png, missing.values())
+            except BrokenProcessPool:
+                rendered = [None] * len(missing)
+        # Başarısız dışa aktarımlar önbelleğe alınmaz
+        for key, png in zip(missing, rendered):
+            if png is not None:
+                image_cache.put(key, png)
+                images[key] = png
+
+    return [
+        (images[key], width, height) if key in images else None
+        for key, (_, width, height) in zip(keys, tasks)
+    ]
@@ -0,0 +1,36 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Streamlit sunucusu çok iş parçacıklıdır; fork ile başlatılan işçi süreçleri başka iş parçacıklarının
+# tuttuğu kilitlerin kopyalarını devralıp kilitlenebilir. İşçiler bu yüzden spawn ile başlatılır.
+# spawn başlatması pahalı olduğundan süreç boyunca tek bir havuz paylaşılır (işçiler modülleri bir kez yükler)
+POOL_CONTEXT = multiprocessing.get_context("spawn")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# Paylaşılan işlem havuzu; ilk kullanımda CPU sayısı kadar işçiyle oluşturulur
+def process_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=POOL_CONTEXT)
+        return _pool
+
+
+# Görevleri paylaşılan havuzda sırayla eşle; bir işçi beklenmedik şekilde ölürse (BrokenProcessPool)
+# bozuk havuz bırakılır ve bir sonraki çağrı yeni havuz oluşturur
+def pool_map(function, tasks):
+    global _pool
+    pool = process_pool()
+    try:
+        return list(pool.map(function, tasks))
+    except BrokenProcessPool:
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        raise
@@ -0,0 +1,332 @@
+import functools
+import itertools
+import math
+import os
+
+import numpy as np
+
+from havuz import pool_map
+
+SIGNIFICANCE_LEVEL = 0.05
+
+BOOTSTRAP_METHODS = ("percentile", "bca")
+
+# Tüm yeniden etiketlemelerin tek tek sayılacağı en büyük kombinasyon sayısı
+EXACT_PERMUTATION_LIMIT = 20_000
+# Permütasyon matris çarpımlarında bir parçadaki en fazla (karşılaştırma x etiketleme) hücresi
+PERMUTATION_CHUNK_CELLS = 4_000_000
+
+
+# NaN ile doldurulmuş satırları sırala (NaN'lar sona gider) ve geçerli değer sayılarını döndür
+# Kullanılan testlerin hepsi sıra bağımsız olduğundan sıralama sonuçları değiştirmez
+def _compact(values):
+    return np.sort(values, axis=-1), np.count_nonzero(~np.isnan(values), axis=-1)
+
+
+# Aynı uzunluktaki satırları gruplayarak scipy fonksiyonunu eksen boyunca tek çağrıda uygula
+def _apply_by_length(values, counts, func, minimum):
+    pvalues = np.full(len(values), np.nan)
+    for n in np.unique(counts):
+        if n < minimum:
+            continue
+        rows = counts == n
+        pvalues[rows] = func(values[rows, :n])
+    return pvalues
+
+
+# NaN yok sayan ortalama ve örneklem varyansı
+def _moments(values, counts):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(values, axis=-1) / counts
+        var = np.nansum((values - mean[:, None]) ** 2, axis=-1) / (counts - 1)
+    return mean, var
+
+
+# İki grup için Levene testi (medyan merkezli, scipy.stats.levene varsayılanı)
+# scipy.stats bu modülde yalnızca ilk hesaplamada içe aktarılır; uygulamanın açılışını yavaşlatmaz
+def _levene(x, nx, y, ny):
+    import scipy.stats as stats
+
+    zx = np.abs(x - np.nanmedian(x, axis=-1, keepdims=True))
+    zy = np.abs(y - np.nanmedian(y, axis=-1, keepdims=True))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        zx_mean = np.nansum(zx, axis=-1) / nx
+        zy_mean = np.nansum(zy, axis=-1) / ny
+        total = nx + ny
+        z_mean = (zx_mean * nx + zy_mean * ny) / total
+        between = nx * (zx_mean - z_mean) ** 2 + ny * (zy_mean - z_mean) ** 2
+        within = np.nansum((zx - zx_mean[:, None]) ** 2, axis=-1) + np.nansum((zy - zy_mean[:, None]) ** 2, axis=-1)
+        f_value = (total - 2) * between / within
+    return stats.f.sf(f_value, 1, total - 2)
+
+
+# Bağımsız örneklem t-testi (eşit varyans) ve Welch t-testi p-değerleri
+def _ttests(x, nx, y, ny):
+    import scipy.stats as stats
+
+    mx, vx = _moments(x, nx)
+    my, vy = _moments(y, ny)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        df_pooled = nx + ny - 2
+        pooled_var = ((nx - 1) * vx + (ny - 1) * vy) / df_pooled
+        t_pooled = (mx - my) / np.sqrt(pooled_var * (1 / nx + 1 / ny))
+
+        vnx = vx / nx
+        vny = vy / ny
+        df_welch = (vnx + vny) ** 2 / (vnx ** 2 / (nx - 1) + vny ** 2 / (ny - 1))
+        t_welch = (mx - my) / np.sqrt(vnx + vny)
+    return (
+        2 * stats.t.sf(np.abs(t_pooled), df_pooled),
+        2 * stats.t.sf(np.abs(t_welch), df_welch),
+    )
+
+
+# Mann-Whitney U testi; aynı (n1, n2) boyutlu ve aynı bağ durumundaki karşılaştırmalar tek çağrıda işlenir
+# scipy "auto" yöntemi (kesin / asimptotik) çağrıdaki tüm satırlar için bir kez seçer ve herhangi bir satırdaki
+# bağ tüm satırları asimptotiğe geçirir; bağlı ve bağsız satırlar ayrı çağrılarla her hücrenin p-değeri
+# tek başına yapılan mannwhitneyu çağrısıyla aynı kalır
+def _mannwhitney(x, nx, y, ny, rows):
+    import scipy.stats as stats
+
+    pvalues = np.full(len(x), np.nan)
+    sizes = np.stack([nx, ny], axis=1)[rows]
+    indices = np.nonzero(rows)[0]
+    for n1, n2 in np.unique(sizes, axis=0):
+        selected = indices[(sizes[:, 0] == n1) & (sizes[:, 1] == n2)]
+        pooled = np.sort(np.concatenate([x[selected, :n1], y[selected, :n2]], axis=1), axis=1)
+        tied = (np.diff(pooled, axis=1) == 0).any(axis=1)
+        for subset in (selected[tied], selected[~tied]):
+            if len(subset):
+                pvalues[subset] = stats.mannwhitneyu(x[subset, :n1], y[subset, :n2], axis=-1).pvalue
+    return pvalues
+
+
+# Benjamini-Hochberg düzeltilmiş p-değerleri (NaN değerler hesaba katılmaz)
+def benjamini_hochberg(pvalues):
+    pvalues = np.asarray(pvalues, dtype=float)
+    adjusted = np.full(pvalues.shape, np.nan)
+    flat = pvalues.ravel()
+    valid = np.nonzero(~np.isnan(flat))[0]
+    if len(valid) == 0:
+        return adjusted
+    order = valid[np.argsort(flat[valid])]
+    ranked = flat[order] * len(valid) / np.arange(1, len(valid) + 1)
+    # Büyük sıralardan küçüğe kümülatif minimum
+    ranked = np.minimum.accumulate(ranked[::-1])[::-1]
+    adjusted.ravel()[order] = np.minimum(ranked, 1.0)
+    return adjusted
+
+
+# Tüm gen x grup karşılaştırmaları için test seçimi toplu olarak yapılır:
+# Shapiro-Wilk -> Levene -> t-test / Welch / Mann-Whitney U, ardından panel geneli BH düzeltmesi
+# control_delta_ct: (gen, örnek), sample_delta_ct: (gen, grup, örnek), valid: (gen, grup)
+def batch_group_tests(control_delta_ct, sample_delta_ct, valid):
+    shape = valid.shape
+    test_type = np.full(shape, None, dtype=object)
+    test_method = np.full(shape, None, dtype=object)
+    test_pvalue = np.full(shape, np.nan)
+
+    gene_index, group_index = np.nonzero(valid)
+    if len(gene_index) == 0:
+        return {
+            "test_type": test_type,
+            "test_method": test_method,
+            "test_pvalue": test_pvalue,
+            "adjusted_pvalue": np.full(shape, np.nan),
+        }
+
+    import scipy.stats as stats
+
+    control, control_n = _compact(control_delta_ct)
+    x, nx = control[gene_index], control_n[gene_index]
+    y, ny = _compact(sample_delta_ct[gene_index, group_index])
+
+    # Normallik: kontrol serisi gen başına bir kez test edilir (Shapiro-Wilk en az 3 örnek ister)
+    shapiro = lambda values: stats.shapiro(values, axis=-1).pvalue
+    control_normal = _apply_by_length(control, control_n, shapiro, 3) > SIGNIFICANCE_LEVEL
+    sample_normal = _apply_by_length(y, ny, shapiro, 3) > SIGNIFICANCE_LEVEL
+    parametric = control_normal[gene_index] & sample_normal
+
+    equal_variance = _levene(x, nx, y, ny) > SIGNIFICANCE_LEVEL
+    student_p, welch_p = _ttests(x, nx, y, ny)
+    mannwhitney_p = _mannwhitney(x, nx, y, ny, ~parametric)
+
+    pvalues = np.where(parametric, np.where(equal_variance, student_p, welch_p), mannwhitney_p)
+    methods = np.where(parametric, np.where(equal_variance, "t_test", "welch_t_test"), "mann_whitney_u_test")
+    types = np.where(parametric, "parametric", "non_parametric")
+
+    test_pvalue[gene_index, group_index] = pvalues
+    test_method[gene_index, group_index] = methods
+    test_type[gene_index, group_index] = types
+
+    return {
+        "test_type": test_type,
+        "test_method": test_method,
+        "test_pvalue": test_pvalue,
+        "adjusted_pvalue": benjamini_hochberg(test_pvalue),
+    }
+
+
+# (n1, n2) için tüm yeniden etiketlemelerin gösterge matrisi: her satırda birinci gruba düşen örnekler 1
+# Aynı boyutlu karşılaştırmalar tabloyu paylaşır; tablo önbellekte tutulur
+@functools.lru_cache(maxsize=64)
+def combination_table(n1, n2):
+    combinations = np.fromiter(
+        itertools.chain.from_iterable(itertools.combinations(range(n1 + n2), n1)),
+        dtype=np.intp,
+    ).reshape(-1, n1)
+    table = np.zeros((len(combinations), n1 + n2))
+    np.put_along_axis(table, combinations, 1.0, axis=1)
+    table.setflags(write=False)
+    return table
+
+
+# Monte-Carlo için rastgele yeniden etiketlemelerin gösterge matrisi
+def _random_labelings(n1, n2, n_resamples, rng):
+    order = np.argsort(rng.random((n_resamples, n1 + n2)), axis=1)
+    table = np.zeros((n_resamples, n1 + n2))
+    np.put_along_axis(table, order[:, :n1], 1.0, axis=1)
+    return table
+
+
+# Aynı (n1, n2) boyutlu karşılaştırmaların permütasyon p-değerleri (ortalama farkı, çift yönlü)
+# Yeniden etiketlenmiş grup toplamları tek bir matris çarpımıyla bulunur
+def _permutation_pvalues(x, y, table, exact):
+    n1, n2 = x.shape[1], y.shape[1]
+    pooled = np.concatenate([x, y], axis=1)
+    totals = pooled.sum(axis=1, keepdims=True)
+    observed = np.abs(y.mean(axis=1) - x.mean(axis=1))
+
+    pvalues = np.empty(len(pooled))
+    chunk = max(1, PERMUTATION_CHUNK_CELLS // len(table))
+    for start in range(0, len(pooled), chunk):
+        rows = slice(start, start + chunk)
+        first = pooled[rows] @ table.T
+        differences = np.abs((totals[rows] - first) / n2 - first / n1)
+        # Kayan nokta hatalarına karşı küçük tolerans
+        extreme = np.count_nonzero(differences >= observed[rows, None] - 1e-12, axis=1)
+        if exact:
+            pvalues[rows] = extreme / len(table)
+        else:
+            pvalues[rows] = (extreme + 1) / (len(table) + 1)
+    return pvalues
+
+
+# Tüm karşılaştırmalar için ΔCt ortalama farkına dayalı permütasyon testi
+# Kombinasyon sayısı küçükse tüm etiketlemeler (kesin), değilse Monte-Carlo örneklemesi kullanılır
+# Monte-Carlo etiketlemeleri (seed, n1, n2) ile üretilir; bir hücrenin p-değeri paneldeki diğer hücrelere bağlı değildir
+def permutation_tests(control_delta_ct, sample_delta_ct, valid, n_resamples=10_000,
+                      exact_limit=EXACT_PERMUTATION_LIMIT, seed=0):
+    shape = valid.shape
+    test_type = np.full(shape, None, dtype=object)
+    test_method = np.full(shape, None, dtype=object)
+    test_pvalue = np.full(shape, np.nan)
+
+    gene_index, group_index = np.nonzero(valid)
+    control, control_n = _compact(control_delta_ct)
+    x, nx = control[gene_index], control_n[gene_index]
+    y, ny = _compact(sample_delta_ct[gene_index, group_index])
+
+    pvalues = np.full(len(gene_index), np.nan)
+    sizes = np.stack([nx, ny], axis=1)
+    for n1, n2 in np.unique(sizes, axis=0):
+        selected = np.nonzero((nx == n1) & (ny == n2))[0]
+        exact = math.comb(int(n1 + n2), int(n1)) <= exact_limit
+        if exact:
+            table = combination_table(int(n1), int(n2))
+        else:
+            table = _random_labelings(int(n1), int(n2), n_resamples, np.random.default_rng((seed, int(n1), int(n2))))
+        pvalues[selected] = _permutation_pvalues(x[selected, :n1], y[selected, :n2], table, exact)
+
+    test_pvalue[gene_index, group_index] = pvalues
+    test_method[gene_index, group_index] = "permutation_test"
+    test_type[gene_index, group_index] = "non_parametric"
+
+    return {
+        "test_type": test_type,
+        "test_method": test_method,
+        "test_pvalue": test_pvalue,
+        "adjusted_pvalue": benjamini_hochberg(test_pvalue),
+    }
+
+
+# BCa düzeltmesi ile yüzdelik sınırlarının yeniden hesaplanması
+def _bca_quantiles(fold_changes, estimate, jackknife, alpha):
+    import scipy.stats as stats
+
+    proportion = np.mean(fold_changes < estimate)
+    if proportion in (0.0, 1.0):
+        return alpha / 2, 1 - alpha / 2
+    z0 = stats.norm.ppf(proportion)
+    deviations = jackknife.mean() - jackknife
+    denominator = 6 * np.sum(deviations ** 2) ** 1.5
+    acceleration = np.sum(deviations ** 3) / denominator if denominator > 0 else 0.0
+    z = stats.norm.ppf([alpha / 2, 1 - alpha / 2])
+    adjusted = stats.norm.cdf(z0 + (z0 + z) / (1 - acceleration * (z0 + z)))
+    return adjusted[0], adjusted[1]
+
+
+# Bir gen grubunun bootstrap güven aralıkları (işlem havuzundaki işçi fonksiyonu)
+# Kontrol ΔCt ortalamaları gen başına bir kez yeniden örneklenir ve tüm hasta gruplarında paylaşılır
+def _bootstrap_genes(task):
+    control_delta_ct, sample_delta_ct, valid, n_resamples, confidence, method, seeds = task
+    alpha = 1 - confidence
+    lower = np.full(valid.shape, np.nan)
+    upper = np.full(valid.shape, np.nan)
+
+    for g, seed in enumerate(seeds):
+        if not valid[g].any():
+            continue
+        rng = np.random.default_rng(seed)
+        control = control_delta_ct[g][~np.isnan(control_delta_ct[g])]
+        # İndeks matrisi: her satır bir yeniden örnekleme
+        control_means = control[rng.integers(0, len(control), size=(n_resamples, len(control)))].mean(axis=1)
+
+        for p in np.nonzero(valid[g])[0]:
+            sample = sample_delta_ct[g, p][~np.isnan(sample_delta_ct[g, p])]
+            sample_means = sample[rng.integers(0, len(sample), size=(n_resamples, len(sample)))].mean(axis=1)
+            fold_changes = 2 ** (-(sample_means - control_means))
+
+            quantiles = (alpha / 2, 1 - alpha / 2)
+            if method == "bca":
+                estimate = 2 ** (-(sample.mean() - control.mean()))
+                # Jackknife: her seferinde bir örnek dışarıda bırakılır
+                control_loo = (control.sum() - control) / max(len(control) - 1, 1)
+                sample_loo = (sample.sum() - sample) / max(len(sample) - 1, 1)
+                jackknife = np.concatenate([
+                    2 ** (-(sample.mean() - control_loo)),
+                    2 ** (-(sample_loo - control.mean())),
+                ])
+                quantiles = _bca_quantiles(fold_changes, estimate, jackknife, alpha)
+
+            lower[g, p], upper[g, p] = np.quantile(fold_changes, quantiles)
+
+    return lower, upper
+
+
+# Tüm karşılaştırmalar için 2^(-ΔΔCt) bootstrap güven aralıkları
+# Genler paylaşılan (spawn) işlem havuzundaki işçilere bölünür; her gen kendi tohumunu aldığı için sonuç işçi sayısından bağımsızdır
+def bootstrap_fold_change(control_delta_ct, sample_delta_ct, valid, n_resamples=10_000, confidence=0.95,
+                          method="percentile", workers=None, seed=0):
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(f"Bilinmeyen bootstrap yöntemi: {method}")
+    num_genes = valid.shape[0]
+    seeds = np.random.SeedSequence(seed).spawn(num_genes)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, int(valid.any(axis=1).sum())))
+
+    chunks = np.array_split(np.arange(num_genes), workers)
+    tasks = [
+        (control_delta_ct[genes], sample_delta_ct[genes], valid[genes], n_resamples, confidence, method,
+         [seeds[g] for g in genes])
+        for genes in chunks
+    ]
+    if workers == 1:
+        results = [_bootstrap_genes(task) for task in tasks]
+    else:
+        results = pool_map(_bootstrap_genes, tasks)
+
+    lower = np.concatenate([r[0] for r in results]) if results else np.full(valid.shape, np.nan)
+    upper = np.concatenate([r[1] for r in results]) if results else np.full(valid.shape, np.nan)
+    return {"ci_lower": lower, "ci_upper": upper}
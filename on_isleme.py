@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from onbellek import LRUCache, hash_arrays, hash_text
+
+# Teknik tekrarlar aynı örnek, grup, gen ve role sahip kuyulardır
+REPLICATE_KEYS = ["group", "sample", "gene", "role"]
+
+OUTLIER_METHODS = ("none", "sd", "grubbs")
+# Bu değerin üzerindeki Ct'ler amplifikasyon yok kabul edilir
+DEFAULT_CT_CUTOFF = 40.0
+# "sd" yönteminde tekrar SD'si bu eşiği aşarsa ortalamadan en uzak kuyu çıkarılır (döngü)
+DEFAULT_SD_THRESHOLD = 0.5
+GRUBBS_ALPHA = 0.05
+# Aykırı değer testi için gereken en az geçerli tekrar sayısı (iki kuyudan hangisinin aykırı olduğu bilinemez)
+MIN_OUTLIER_REPLICATES = 3
+
+# Çıkarılan kuyuların nedeni
+REMOVAL_REASONS = ("undetermined", "above_cutoff", "outlier")
+
+preprocess_cache = LRUCache(max_entries=8)
+
+
+# Grubbs testinin iki yönlü kritik değeri; n dizisi üzerinde vektörel (n < 3 için NaN)
+def _grubbs_critical(n, alpha):
+    from scipy import stats
+
+    n = n.astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = stats.t.ppf(1 - alpha / (2 * n), n - 2)
+        return (n - 1) / np.sqrt(n) * np.sqrt(t ** 2 / (n - 2 + t ** 2))
+
+
+# Plaka tablosunu teknik tekrar grubu x tekrar matrisine yerleştir ve tüm grupları tek geçişte işle:
+# belirsiz ve eşik üstü Ct'leri maskele, her gruptan en fazla bir aykırı kuyu çıkar,
+# isteğe bağlı olarak kalan tekrarların ortalamasını al (her biyolojik örnek için tek satır)
+# table: read_plate_export çıktısı (belirsiz Ct'ler NaN olarak korunur)
+def preprocess_plate(table, ct_cutoff=DEFAULT_CT_CUTOFF, outlier_method="none",
+                     sd_threshold=DEFAULT_SD_THRESHOLD, alpha=GRUBBS_ALPHA, aggregate=True):
+    if outlier_method not in OUTLIER_METHODS:
+        raise ValueError(f"Bilinmeyen aykırı değer yöntemi: {outlier_method}")
+    table = table.reset_index(drop=True)
+    ct = table["ct"].to_numpy(dtype=float)
+
+    grouped = table.groupby(REPLICATE_KEYS, observed=True, sort=False)
+    replicate = grouped.ngroup().to_numpy()
+    position = grouped.cumcount().to_numpy()
+    num_replicates = int(replicate.max()) + 1 if len(table) else 0
+    width = int(position.max()) + 1 if len(table) else 1
+
+    values = np.full((num_replicates, width), np.nan)
+    values[replicate, position] = ct
+    # Doldurma hücreleri -1; diğerleri tablodaki satır numarası
+    wells = np.full((num_replicates, width), -1, dtype=np.int64)
+    wells[replicate, position] = np.arange(len(table))
+
+    reasons = np.full((num_replicates, width), -1, dtype=np.int8)
+    undetermined = (wells >= 0) & np.isnan(values)
+    reasons[undetermined] = REMOVAL_REASONS.index("undetermined")
+    if ct_cutoff is not None:
+        with np.errstate(invalid="ignore"):
+            above_cutoff = values > ct_cutoff
+        reasons[above_cutoff] = REMOVAL_REASONS.index("above_cutoff")
+    masked = np.ma.masked_array(values, mask=reasons >= 0)
+    masked.mask |= wells < 0
+
+    if outlier_method != "none":
+        n = masked.count(axis=1)
+        mean = masked.mean(axis=1)
+        sd = masked.std(axis=1, ddof=1)
+        deviation = np.abs(masked - mean[:, None])
+        # Her grupta ortalamadan en uzak geçerli kuyu aday aykırı değerdir
+        candidate = deviation.filled(-1).argmax(axis=1)
+        largest = deviation.max(axis=1).filled(np.nan)
+        sd = sd.filled(np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if outlier_method == "sd":
+                flagged = sd > sd_threshold
+            else:
+                flagged = largest / sd > _grubbs_critical(n, alpha)
+        flagged &= n >= MIN_OUTLIER_REPLICATES
+        rows = np.flatnonzero(flagged)
+        reasons[rows, candidate[rows]] = REMOVAL_REASONS.index("outlier")
+        masked.mask[rows, candidate[rows]] = True
+
+    # Çıkarılan kuyular tablodaki sıralarıyla raporlanır
+    removed_cells = reasons >= 0
+    order = np.argsort(wells[removed_cells], kind="stable")
+    removed = table.iloc[wells[removed_cells][order]].assign(
+        reason=pd.Categorical.from_codes(reasons[removed_cells][order], categories=REMOVAL_REASONS)
+    ).reset_index(drop=True)
+
+    counts = masked.count(axis=1)
+    if aggregate:
+        # Her tekrar grubunun ilk kuyusu grup anahtarlarını taşır
+        kept = counts > 0
+        key_columns = [column for column in table.columns if column in REPLICATE_KEYS]
+        clean = table.iloc[wells[kept, 0]][key_columns].reset_index(drop=True)
+        clean["ct"] = masked.mean(axis=1).filled(np.nan)[kept]
+        clean["replicates"] = counts[kept]
+    else:
+        clean = table.iloc[np.sort(wells[~masked.mask])].reset_index(drop=True)
+
+    report = {
+        "wells": len(table),
+        "replicate_groups": num_replicates,
+        "averaged": int((counts > 1).sum()) if aggregate else 0,
+        "empty_groups": int((counts == 0).sum()),
+        **{reason: int((reasons == code).sum()) for code, reason in enumerate(REMOVAL_REASONS)},
+        "removed": removed,
+    }
+    return clean, report
+
+
+# Aynı plaka ve ayarlar için ön işleme yeniden yapılmaz
+def preprocess_plate_cached(table, **options):
+    columns = [table[column] for column in REPLICATE_KEYS]
+    key = (
+        hash_arrays(table["ct"].to_numpy(dtype=float), *[column.cat.codes.to_numpy() for column in columns]),
+        hash_text(*[str(list(column.cat.categories)) for column in columns]),
+        tuple(sorted(options.items())),
+    )
+    return preprocess_cache.get_or_compute(key, lambda: preprocess_plate(table, **options))
@@ -0,0 +1,125 @@
+import hashlib
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# Dizilerin içeriğinden (tip, boyut ve değerler) kararlı bir özet anahtarı üret
+def hash_arrays(*arrays):
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+# Metin içeriğinden (ör. grafik JSON'u) özet anahtarı üret
+def hash_text(*parts):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+# Nesnelerin yaklaşık bellek kullanımı (bayt): NumPy dizileri, DataFrame'ler (derin), nbytes özelliği olan
+# nesneler (ör. SampleTable) ve bunları içeren sözlük / liste / demetler; aynı nesne iki kez sayılmaz
+def memory_usage(*objects, seen=None):
+    seen = set() if seen is None else seen
+    total = 0
+    stack = list(objects)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, np.ndarray):
+            # Görünümler sahip oldukları dizi üzerinden sayılır
+            if obj.base is None:
+                total += obj.nbytes
+            else:
+                stack.append(obj.base)
+        elif isinstance(obj, pd.DataFrame):
+            total += int(obj.memory_usage(deep=True).sum())
+        elif isinstance(obj, pd.Series):
+            total += int(obj.memory_usage(deep=True))
+        elif isinstance(obj, dict):
+            total += sys.getsizeof(obj)
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set)):
+            total += sys.getsizeof(obj)
+            stack.extend(obj)
+        elif hasattr(obj, "nbytes"):
+            total += int(obj.nbytes)
+        else:
+            total += sys.getsizeof(obj)
+    return total
+
+
+# Oluşturulan tüm önbellekler (paylaşılan bellek raporu için)
+_caches = weakref.WeakSet()
+
+
+# Boyutu sınırlı, iş parçacığı güvenli LRU önbellek
+# Streamlit her etkileşimde betiği yeniden çalıştırır; modül düzeyindeki önbellekler korunur
+class LRUCache:
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        _caches.add(self)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # Anahtar yoksa değeri hesapla ve sakla
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    # Saklanan değerlerin yaklaşık bellek kullanımı (bayt)
+    def memory_usage(self, seen=None):
+        with self._lock:
+            values = list(self._entries.values())
+        return memory_usage(*values, seen=seen)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Tüm oturumlarca paylaşılan önbelleklerin toplam yaklaşık bellek kullanımı (bayt)
+def shared_cache_memory():
+    seen = set()
+    return sum(cache.memory_usage(seen=seen) for cache in list(_caches))
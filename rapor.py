@@ -0,0 +1,205 @@
+import functools
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Image as RLImage, LongTable, PageBreak, Paragraph, SimpleDocTemplate, Spacer, TableStyle
+
+from grafik import render_static_images
+
+PDF_FONT = 'DejaVu'
+PDF_FONT_PATH = '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+
+# Sayfa kenar boşlukları ve kullanılabilir tablo genişliği
+PAGE_MARGIN = 40
+AVAILABLE_WIDTH = letter[0] - 2 * PAGE_MARGIN
+
+# Uzun tablolar bu satır sayısında parçalara bölünür; her parça sayfa başlarında başlığı tekrarlar
+TABLE_CHUNK_ROWS = 500
+# Sütun genişlikleri bu kadar satırdan tahmin edilir
+WIDTH_SAMPLE_ROWS = 200
+# Grafikler bu sayıda oluşturulup PNG'ye dönüştürülür; her parti sonrası ilerleme bildirilir ve iptal denetlenir
+RENDER_BATCH_SIZE = 16
+# Grafik içeren raporlarda ilerleme çubuğunun grafik aşamasına ayrılan payı
+CHART_PROGRESS_SHARE = 0.5
+# Grafik görüntülerinin PDF'teki en büyük yüksekliği (nokta)
+MAX_IMAGE_HEIGHT = letter[1] - 2 * 72 - 60
+
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, -1), PDF_FONT),
+    ('FONTSIZE', (0, 0), (-1, -1), 7),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+])
+
+
+def _format_value(value):
+    if isinstance(value, (float, np.floating)):
+        if np.isnan(value):
+            return ""
+        if value != 0 and abs(value) < 0.001:
+            return f"{value:.2e}"
+        return f"{value:.4g}"
+    return str(value)
+
+
+# Sütun genişlikleri: başlık ve örnek satırlardaki en uzun metne orantılı, sayfa genişliğine ölçekli
+def _column_widths(header, sample_rows):
+    lengths = np.array([len(str(h)) for h in header], dtype=float)
+    for row in sample_rows:
+        lengths = np.maximum(lengths, [len(cell) for cell in row])
+    lengths = np.clip(lengths, 4, 30)
+    return list(AVAILABLE_WIDTH * lengths / lengths.sum())
+
+
+# DataFrame'i sayfa boyutunda LongTable parçalarına dönüştür
+# Satırlar parça parça biçimlendirildiği için tüm tablo tek seferde metne çevrilmez
+def _chunked_tables(df):
+    header = [str(column) for column in df.columns]
+    sample_rows = [[_format_value(v) for v in row] for row in df.head(WIDTH_SAMPLE_ROWS).itertuples(index=False)]
+    widths = _column_widths(header, sample_rows)
+
+    tables = []
+    for start in range(0, len(df), TABLE_CHUNK_ROWS):
+        rows = [
+            [_format_value(v) for v in row]
+            for row in df.iloc[start:start + TABLE_CHUNK_ROWS].itertuples(index=False)
+        ]
+        tables.append(LongTable([header] + rows, colWidths=widths, repeatRows=1, style=TABLE_STYLE))
+    return tables
+
+
+# Ham veriler yerine gen x grup başına özet tablo (n, ortalama ve SD)
+# input_df sütunları SampleTable.to_frame sırasındadır: örnek no, gen, grup, hedef Ct, referans Ct, ΔCt (kontrol / hasta)
+def summarize_input(input_df, labels):
+    _, gene_column, group_column, target_column, reference_column, control_column, patient_column = input_df.columns
+    values = pd.DataFrame({
+        gene_column: input_df[gene_column],
+        group_column: input_df[group_column],
+        target_column: input_df[target_column],
+        reference_column: input_df[reference_column],
+        "ΔCt": input_df[control_column].fillna(input_df[patient_column]),
+    })
+    grouped = values.groupby([gene_column, group_column], observed=True, sort=False)
+    summary = grouped.agg(["mean", "std"])
+    summary.columns = [f"{column} ({labels['avg'] if stat == 'mean' else 'SD'})" for column, stat in summary.columns]
+    summary.insert(0, "n", grouped.size())
+    return summary.reset_index()
+
+
+# Unicode destekli fontu kaydet (ilk PDF isteğinde bir kez)
+@functools.lru_cache(maxsize=None)
+def register_fonts():
+    pdfmetrics.registerFont(TTFont(PDF_FONT, PDF_FONT_PATH))
+
+
+# Statik grafik görüntüsü (png baytları, piksel genişlik, yükseklik) sayfa genişliğine ölçeklenir
+def _chart_image(png, width, height):
+    scale = min(AVAILABLE_WIDTH / width, MAX_IMAGE_HEIGHT / height)
+    return RLImage(BytesIO(png), width=width * scale, height=height * scale)
+
+
+# PDF rapor oluşturma
+# results / stats / input_df: seçilen dilde etiketlenmiş tablolar; labels: seçilen dilin çeviri sözlüğü
+# summarize_raw: ham veriler yerine özet tablo
+# images: grafik.render_static_images çıktısı; işlenemeyen (None) grafikler atlanır
+# progress: her öğe yerleştirildikten sonra 0-1 arası oranla çağrılır; hata fırlatarak oluşturmayı durdurabilir
+def create_pdf(results, stats, input_df, labels, summarize_raw=False, images=None, progress=None):
+    register_fonts()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, leftMargin=PAGE_MARGIN, rightMargin=PAGE_MARGIN)
+    elements = []
+
+    styles = getSampleStyleSheet()
+    styles['Normal'].fontName = PDF_FONT
+    styles['Title'].fontName = PDF_FONT
+    styles['Heading2'].fontName = PDF_FONT
+
+    # Başlık
+    elements.append(Paragraph(labels["report_title"], styles['Title']))
+    elements.append(Spacer(1, 12))
+
+    # Giriş Verileri Tablosu
+    elements.append(Paragraph(labels["input_data_table"], styles['Heading2']))
+    raw_table = summarize_input(input_df, labels) if summarize_raw else input_df
+    elements.extend(_chunked_tables(raw_table))
+    elements.append(Spacer(1, 12))
+
+    # Sonuçlar
+    elements.append(Paragraph(labels["results"], styles['Heading2']))
+    elements.append(Spacer(1, 12))
+    elements.extend(_chunked_tables(results))
+
+    elements.append(PageBreak())
+
+    # İstatistiksel Sonuçlar
+    elements.append(Paragraph(labels["statistical_results"], styles['Heading2']))
+    elements.append(Spacer(1, 12))
+    elements.extend(_chunked_tables(stats))
+
+    elements.append(PageBreak())
+
+    # Grafikler
+    images = [image for image in images or [] if image is not None]
+    if images:
+        elements.append(Paragraph(labels["report_charts"], styles['Heading2']))
+        elements.append(Spacer(1, 12))
+        for png, width, height in images:
+            elements.append(_chart_image(png, width, height))
+            elements.append(Spacer(1, 12))
+        elements.append(PageBreak())
+
+    # İstatistiksel Değerlendirme
+    elements.append(Paragraph(labels["statistical_evaluation"], styles['Heading2']))
+    elements.append(Spacer(1, 12))
+
+    for line in labels["statistical_explanation"].split(". "):
+        elements.append(Paragraph(line.strip() + '.', styles['Normal']))
+        elements.append(Spacer(1, 6))
+
+    if progress is not None:
+        total = len(elements)
+        placed = [0]
+
+        def after_flowable(flowable):
+            placed[0] += 1
+            progress(min(1.0, placed[0] / total))
+
+        doc.afterFlowable = after_flowable
+
+    doc.build(elements)
+    buffer.seek(0)
+    return buffer
+
+
+# Arka plan rapor işi: grafikler partiler halinde oluşturulup PNG'ye dönüştürülür, ardından PDF oluşturulur
+# figure_builders: her biri bir grafik (veya çizilecek veri yoksa None) döndüren argümansız fonksiyonlar;
+# grafikler betik çalışmasında değil iş içinde oluşturulur
+# job: rapor_isleri.ReportJob; ilerleme ve iptal job.set_progress üzerinden işlenir
+def build_report(results, stats, input_df, labels, summarize_raw, figure_builders, job):
+    images = None
+    chart_share = CHART_PROGRESS_SHARE if figure_builders else 0.0
+    job.set_progress(0.0)
+    if figure_builders:
+        images = []
+        for start in range(0, len(figure_builders), RENDER_BATCH_SIZE):
+            batch = figure_builders[start:start + RENDER_BATCH_SIZE]
+            figures = [fig for fig in (build() for build in batch) if fig is not None]
+            images.extend(render_static_images(figures))
+            job.set_progress(chart_share * (start + len(batch)) / len(figure_builders))
+        job.skipped_images = sum(image is None for image in images)
+
+    def progress(value):
+        job.set_progress(chart_share + (1 - chart_share) * value)
+
+    return create_pdf(
+        results, stats, input_df, labels, summarize_raw=summarize_raw, images=images, progress=progress
+    ).getvalue()
@@ -0,0 +1,100 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from onbellek import LRUCache
+
+# Aynı anda hazırlanabilecek rapor sayısı
+REPORT_WORKERS = 2
+# Bu satır sayısının üzerindeki giriş tabloları için PDF'e varsayılan olarak özet eklenir
+RAW_TABLE_ROW_LIMIT = 2_000
+
+# İş durumları
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_CANCELLED = "cancelled"
+JOB_FAILED = "failed"
+
+# Tamamlanan PDF'ler girdi özeti + dil anahtarıyla saklanır; tüm oturumlar arasında paylaşılır
+report_cache = LRUCache(max_entries=16)
+report_executor = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix="rapor")
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+class ReportCancelled(Exception):
+    pass
+
+
+# Arka planda çalışan tek bir rapor işi; ilerleme 0-1 arası, iptal olayı iş fonksiyonuna aktarılır
+# Aynı rapor anahtarını isteyen oturumlar işi paylaşır; iş yalnızca tüm oturumlar iptal ettiğinde durur
+class ReportJob:
+    def __init__(self, key):
+        self.key = key
+        self.subscribers = 1
+        self.progress = 0.0
+        # Görüntüye dönüştürülemediği için rapora eklenmeyen grafik sayısı
+        self.skipped_images = 0
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    def set_progress(self, value):
+        self.progress = value
+        if self.cancel_event.is_set():
+            raise ReportCancelled()
+
+    # Bu oturumun aboneliğini bırak; iş durduysa True döner
+    def cancel(self):
+        with _jobs_lock:
+            self.subscribers -= 1
+            if self.subscribers > 0:
+                return False
+        self.cancel_event.set()
+        self.future.cancel()
+        return True
+
+    @property
+    def status(self):
+        if not self.future.done():
+            return JOB_RUNNING
+        if self.future.cancelled() or isinstance(self.future.exception(), ReportCancelled):
+            return JOB_CANCELLED
+        if self.future.exception() is not None:
+            return JOB_FAILED
+        return JOB_DONE
+
+    @property
+    def error(self):
+        if self.status == JOB_FAILED:
+            return self.future.exception()
+        return None
+
+
+def _run_job(job, build, args, kwargs):
+    pdf_bytes = build(*args, job=job, **kwargs)
+    report_cache.put(job.key, pdf_bytes)
+    return pdf_bytes
+
+
+# Biten, başarısız olan veya başlamadan iptal edilen işler listeden çıkarılır
+def _forget(job):
+    with _jobs_lock:
+        if _jobs.get(job.key) is job:
+            del _jobs[job.key]
+
+
+# Rapor işini kuyruğa ekle; aynı anahtar için çalışan bir iş varsa o iş döner ve abone sayısı artar
+# Her oturum bir iş için en fazla bir kez çağırmalıdır (iptal, çağrı başına bir aboneliği bırakır)
+# build(*args, job=job, **kwargs) PDF baytlarını döndürmeli ve ilerlemeyi job.set_progress ile bildirmelidir
+def submit_report(key, build, *args, **kwargs):
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is not None and not job.cancel_event.is_set():
+            job.subscribers += 1
+            return job
+        job = ReportJob(key)
+        _jobs[key] = job
+        job.future = report_executor.submit(_run_job, job, build, args, kwargs)
+    job.future.add_done_callback(lambda _: _forget(job))
+    return job
+
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from analiz import STATISTICS_MODES, cell_cache, incremental_tests
+
+
+def _cold(control, samples, valid, statistics):
+    cell_cache.clear()
+    return incremental_tests(control, samples, valid, statistics)
+
+
+def _assert_same(result, expected):
+    for key in ("test_type", "test_method"):
+        assert (result[key] == expected[key]).all()
+    for key in ("test_pvalue", "adjusted_pvalue"):
+        np.testing.assert_array_equal(result[key], expected[key])
+
+
+# Tek başına test edilen hücre, daha sonra tüm panel hesaplanırken önbellekten gelse de soğuk hesapla aynı kalmalı
+@pytest.mark.parametrize("statistics", STATISTICS_MODES)
+def test_cached_cell_matches_cold_panel(statistics):
+    control = np.array([[21.0, 22.0]])
+    samples = np.array([[[25.0, 26.0], [25.0, 25.0]]])
+    expected = _cold(control, samples, np.ones((1, 2), dtype=bool), statistics)
+
+    cell_cache.clear()
+    incremental_tests(control, samples, np.array([[True, False]]), statistics)
+    _assert_same(incremental_tests(control, samples, np.ones((1, 2), dtype=bool), statistics), expected)
+
+
+# Düzenleme geçmişinden bağımsızlık: her düzenlemeden sonra artımlı sonuç soğuk yeniden hesaplamaya eşit olmalı
+@pytest.mark.parametrize("statistics", STATISTICS_MODES)
+def test_incremental_edits_match_cold_recompute(statistics):
+    rng = np.random.default_rng(1)
+    num_genes, num_groups, width = 12, 3, 6
+    control = np.round(rng.normal(6, 1, (num_genes, width)) * 2) / 2
+    samples = np.round(rng.normal(6.5, 1, (num_genes, num_groups, width)) * 2) / 2
+    # Farklı uzunluklarda seriler (NaN dolgu)
+    control[:, 4:][rng.random((num_genes, 2)) < 0.5] = np.nan
+    samples[..., 3:][rng.random((num_genes, num_groups, 3)) < 0.5] = np.nan
+    valid = np.ones((num_genes, num_groups), dtype=bool)
+
+    cell_cache.clear()
+    incremental_tests(control, samples, valid, statistics)
+    for _ in range(10):
+        g, j, k = rng.integers(num_genes), rng.integers(num_groups), rng.integers(3)
+        if rng.random() < 0.5:
+            control[g, k] = np.round(rng.normal(6, 1) * 2) / 2
+        else:
+            samples[g, j, k] = np.round(rng.normal(6.5, 1) * 2) / 2
+        result = incremental_tests(control, samples, valid, statistics)
+        _assert_same(result, _cold(control, samples, valid, statistics))
@@ -0,0 +1,54 @@
+import numpy as np
+import scipy.stats as stats
+
+from istatistik import SIGNIFICANCE_LEVEL, batch_group_tests
+
+
+# Eski tek tek karşılaştırma zinciri: Shapiro-Wilk -> Levene -> t-test / Welch / Mann-Whitney U
+def _pairwise_test(control, sample):
+    def normal(values):
+        return len(values) >= 3 and stats.shapiro(values).pvalue > SIGNIFICANCE_LEVEL
+
+    if normal(control) and normal(sample):
+        equal_variance = stats.levene(control, sample).pvalue > SIGNIFICANCE_LEVEL
+        return stats.ttest_ind(control, sample, equal_var=equal_variance).pvalue
+    return stats.mannwhitneyu(control, sample).pvalue
+
+
+def _panel(control_rows, sample_rows):
+    width = max(len(row) for row in control_rows + [r for rows in sample_rows for r in rows])
+    control = np.full((len(control_rows), width), np.nan)
+    samples = np.full((len(control_rows), len(sample_rows[0]), width), np.nan)
+    for g, row in enumerate(control_rows):
+        control[g, :len(row)] = row
+        for p, sample in enumerate(sample_rows[g]):
+            samples[g, p, :len(sample)] = sample
+    return control, samples
+
+
+def _assert_matches_pairwise(control, samples):
+    valid = np.ones(samples.shape[:2], dtype=bool)
+    result = batch_group_tests(control, samples, valid)
+    for g, p in np.ndindex(valid.shape):
+        expected = _pairwise_test(control[g][~np.isnan(control[g])], samples[g, p][~np.isnan(samples[g, p])])
+        np.testing.assert_allclose(result["test_pvalue"][g, p], expected, rtol=1e-12)
+
+
+# Bağlı bir hücre, aynı boyutlu bağsız hücrenin Mann-Whitney yöntemini değiştirmemeli
+def test_tied_cell_does_not_change_untied_mann_whitney():
+    control, samples = _panel([[21, 22]], [[[25, 26], [25, 25]]])
+    result = batch_group_tests(control, samples, np.ones((1, 2), dtype=bool))
+    np.testing.assert_allclose(result["test_pvalue"][0, 0], stats.mannwhitneyu([21, 22], [25, 26]).pvalue)
+    np.testing.assert_allclose(result["test_pvalue"][0, 0], 1 / 3)
+    _assert_matches_pairwise(control, samples)
+
+
+def test_batch_matches_pairwise_on_tied_data():
+    rng = np.random.default_rng(0)
+    # Ct ölçümleri gibi 0,5 döngüye yuvarlanmış değerler: bağlar sık görülür
+    control_rows = [np.round(rng.normal(6, 1, rng.integers(2, 5)) * 2) / 2 for _ in range(30)]
+    sample_rows = [
+        [np.round(rng.normal(6.5, 1, rng.integers(2, 5)) * 2) / 2 for _ in range(3)]
+        for _ in range(30)
+    ]
+    _assert_matches_pairwise(*_panel(control_rows, sample_rows))
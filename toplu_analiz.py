@@ -0,0 +1,187 @@
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from analiz import STATISTICS_MODES, run_analysis
+from on_isleme import DEFAULT_CT_CUTOFF, DEFAULT_SD_THRESHOLD, OUTLIER_METHODS, preprocess_plate
+from ceviriler import label_table, localize_frame, translations
+from veri_okuma import build_panel, read_plate_export
+from disa_aktarim import write_xlsx
+from veri_tablosu import cached_sample_table
+
+# Klasör olarak verilen girişlerde okunacak plaka dışa aktarım dosyaları
+PLATE_EXTENSIONS = (".csv", ".tsv", ".txt", ".xlsx")
+OUTPUT_FORMATS = ("csv", "parquet", "arrow")
+
+
+# Dosya, klasör ve glob desenlerini sıralı, tekrarsız dosya listesine dönüştür
+def expand_inputs(patterns):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [
+                os.path.join(pattern, name) for name in os.listdir(pattern)
+                if name.lower().endswith(PLATE_EXTENSIONS)
+            ]
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        paths.extend(sorted(path for path in matches if os.path.isfile(path)))
+    return list(dict.fromkeys(paths))
+
+
+# Her çalıştırma için çıktı adı; aynı adlı dosyalar sıra numarası alır
+def output_names(paths):
+    names = []
+    seen = {}
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        count = seen.get(stem, 0)
+        seen[stem] = count + 1
+        names.append(stem if count == 0 else f"{stem}_{count + 1}")
+    return names
+
+
+def write_table(df, path, output_format):
+    if output_format == "parquet":
+        df.to_parquet(f"{path}.parquet", index=False)
+    elif output_format == "arrow":
+        df.reset_index(drop=True).to_feather(f"{path}.arrow", compression="uncompressed")
+    else:
+        df.to_csv(f"{path}.csv", index=False, encoding="utf-8")
+
+
+# Tek bir plaka dosyası için tam ΔΔCt + istatistik analizi ve çıktı dosyaları; özet sözlüğünü günceller
+def analyze_run(path, name, options, summary):
+    table, _ = read_plate_export(path)
+    table, preprocess_report = preprocess_plate(
+        table, ct_cutoff=options["ct_cutoff"], outlier_method=options["outliers"],
+        sd_threshold=options["sd_threshold"], aggregate=options["aggregate"],
+    )
+    summary.update({reason: preprocess_report[reason] for reason in ("undetermined", "above_cutoff", "outlier")})
+    groups = list(pd.unique(table["group"].astype(str)))
+    control_group = options["control"] or (groups[0] if groups else "")
+    plate = build_panel(table, control_group)
+    panel = run_analysis(
+        plate["control_target"], plate["control_reference"], plate["sample_target"], plate["sample_reference"],
+        options["statistics"],
+    )
+
+    language_code = options["language"]
+    labels = translations[language_code]
+    gene_labels, group_labels = plate["genes"], plate["patient_groups"]
+    results_df = localize_frame(panel["results"], language_code, "result_columns", gene_labels, group_labels)
+    stats_df = localize_frame(panel["stats"], language_code, "stats_columns", gene_labels, group_labels)
+
+    prefix = os.path.join(options["output"], name)
+    write_table(results_df, f"{prefix}_sonuclar", options["format"])
+    write_table(stats_df, f"{prefix}_istatistik", options["format"])
+
+    if options["pdf"] or options["xlsx"]:
+        sample_table = cached_sample_table(
+            plate["control_target"], plate["control_reference"], plate["sample_target"], plate["sample_reference"]
+        )
+        input_df = sample_table.to_frame(label_table(language_code)["input_columns"], gene_labels, [control_group] + group_labels)
+
+    if options["xlsx"]:
+        # Çalışma kitabı doğrudan dosyaya sabit bellekle yazılır
+        sheet_names = tuple(labels[key] for key in ("sheet_raw_ct", "sheet_delta_ct", "sheet_results", "sheet_statistics"))
+        write_xlsx(f"{prefix}.xlsx", input_df, results_df, stats_df, sheet_names)
+
+    if options["pdf"]:
+        # ReportLab yalnızca PDF istendiğinde yüklenir
+        from rapor import create_pdf
+
+        pdf = create_pdf(results_df, stats_df, input_df, labels, summarize_raw=options["summarize_raw"])
+        with open(f"{prefix}_rapor.pdf", "wb") as handle:
+            handle.write(pdf.getvalue())
+
+    summary.update(
+        genes=len(gene_labels),
+        comparisons=len(panel["stats"]),
+        significant=int(panel["stats"]["significant"].sum()),
+    )
+
+
+# İşlem havuzunda çalışır; okuma, analiz veya çıktı yazma sırasında oluşan her hata yalnızca
+# bu çalıştırmayı "error" olarak işaretler, diğer çalıştırmalar ve ozet.csv etkilenmez
+def process_run(task):
+    path, name, options = task
+    summary = {
+        "file": path, "status": "ok", "genes": 0, "comparisons": 0, "significant": 0,
+        "undetermined": 0, "above_cutoff": 0, "outlier": 0, "error": "",
+    }
+    try:
+        analyze_run(path, name, options, summary)
+    except Exception as e:
+        summary.update(status="error", error=str(e))
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Plaka dışa aktarımları için toplu ΔΔCt ve istatistik analizi")
+    parser.add_argument("inputs", nargs="+", help="Plaka dosyaları, klasörler veya glob desenleri (ör. 'runs/**/*.csv')")
+    parser.add_argument("-o", "--output", default="sonuclar", help="Çıktı klasörü")
+    parser.add_argument("-c", "--control", help="Kontrol grubu adı (varsayılan: dosyadaki ilk grup)")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="csv", help="Sonuç tablosu biçimi (arrow: bellek eşlemeye uygun Arrow IPC)")
+    parser.add_argument("-s", "--statistics", choices=STATISTICS_MODES, default=STATISTICS_MODES[0], help="İstatistik modu")
+    parser.add_argument("-l", "--language", choices=sorted(translations), default="tr", help="Tablo ve rapor dili")
+    parser.add_argument("--ct-cutoff", type=float, default=DEFAULT_CT_CUTOFF, help="Bu değerin üzerindeki Ct'ler amplifikasyon yok sayılır")
+    parser.add_argument("--outliers", choices=OUTLIER_METHODS, default="none", help="Teknik tekrarlarda aykırı kuyu filtresi")
+    parser.add_argument("--sd-threshold", type=float, default=DEFAULT_SD_THRESHOLD, help="'sd' filtresi için tekrar SD eşiği (döngü)")
+    parser.add_argument("--no-aggregate", action="store_true", help="Teknik tekrarları ayrı örnek olarak bırak")
+    parser.add_argument("--xlsx", action="store_true", help="Her çalıştırma için ham Ct, ΔCt, sonuç ve istatistik sayfalı Excel dosyası oluştur")
+    parser.add_argument("--pdf", action="store_true", help="Her çalıştırma için PDF raporu oluştur")
+    parser.add_argument("--raw-pdf", action="store_true", help="PDF'e özet yerine tüm ham verileri ekle")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="İşlem sayısı (varsayılan: işlemci sayısı)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("Girdi dosyası bulunamadı.", file=sys.stderr)
+        return 2
+
+    os.makedirs(args.output, exist_ok=True)
+    options = {
+        "output": args.output,
+        "control": args.control,
+        "format": args.format,
+        "statistics": args.statistics,
+        "language": args.language,
+        "ct_cutoff": args.ct_cutoff,
+        "outliers": args.outliers,
+        "sd_threshold": args.sd_threshold,
+        "aggregate": not args.no_aggregate,
+        "xlsx": args.xlsx,
+        "pdf": args.pdf,
+        "summarize_raw": not args.raw_pdf,
+    }
+    tasks = [(path, name, options) for path, name in zip(paths, output_names(paths))]
+
+    workers = max(1, min(args.workers or os.cpu_count() or 1, len(tasks)))
+    summaries = []
+    if workers == 1:
+        for task in tasks:
+            summaries.append(process_run(task))
+            print(f"{summaries[-1]['status']:5} {task[0]}", flush=True)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for task, summary in zip(tasks, executor.map(process_run, tasks)):
+                summaries.append(summary)
+                print(f"{summary['status']:5} {task[0]}", flush=True)
+
+    summary_df = pd.DataFrame(summaries)
+    summary_df.to_csv(os.path.join(args.output, "ozet.csv"), index=False, encoding="utf-8")
+    failed = int((summary_df["status"] != "ok").sum())
+    print(f"{len(summaries) - failed}/{len(summaries)} çalıştırma tamamlandı.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+import os
+import re
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from analiz import reference_normalization
+from onbellek import LRUCache, hash_arrays
+
+# Uzun formatlı qPCR dışa aktarımında beklenen sütunlar
+REQUIRED_COLUMNS = ["sample", "group", "gene", "role", "ct"]
+
+TARGET_ROLE = "target"
+REFERENCE_ROLE = "reference"
+
+# Cihaz yazılımlarının farklı sütun adlarını ortak adlara eşle
+COLUMN_ALIASES = {
+    "sample": "sample",
+    "sample name": "sample",
+    "örnek": "sample",
+    "group": "group",
+    "biological group": "group",
+    "grup": "group",
+    "gene": "gene",
+    "target": "gene",
+    "target name": "gene",
+    "gen": "gene",
+    "role": "role",
+    "task": "role",
+    "rol": "role",
+    "ct": "ct",
+    "cq": "ct",
+    "cт": "ct",
+    "quantity": "quantity",
+    "starting quantity": "quantity",
+    "sq": "quantity",
+    "concentration": "quantity",
+    "miktar": "quantity",
+    "konsantrasyon": "quantity",
+}
+
+# Standart eğri (seyreltme serisi) dosyasında beklenen sütunlar
+STANDARD_COLUMNS = ["gene", "quantity", "ct"]
+
+ROLE_ALIASES = {
+    "target": TARGET_ROLE,
+    "hedef": TARGET_ROLE,
+    "unknown": TARGET_ROLE,
+    "reference": REFERENCE_ROLE,
+    "ref": REFERENCE_ROLE,
+    "referans": REFERENCE_ROLE,
+    "endogenous control": REFERENCE_ROLE,
+}
+
+DEFAULT_CHUNKSIZE = 50_000
+
+# Yapıştırılan Ct bloklarında NaN olarak kabul edilen (hata sayılmayan) belirsiz değerler
+UNDETERMINED_TOKENS = ("undetermined", "undet", "und", "n/a", "na", "nan", "-", "—", "noct", "no_ct", "#n/a", "#değer!", "#value!")
+# Excel panosundaki ';' ayırıcısı sekmeye, tırnaklar boşluğa çevrilir (boş ';' alanları da boş hücre sayılır)
+CLIPBOARD_SEPARATORS = str.maketrans({";": "\t", '"': " ", "'": " ", ",": "."})
+# Excel'den kopyalanan boş hücreler: yalnızca boşluk içeren satır (sütun) veya boş sekme alanı (satır / tablo)
+BLANK_LINE = re.compile(r"\n[^\S\n]*(?=\n)")
+EMPTY_CELL = re.compile(r"(?:^|(?<=\t))[^\S\n\t]*(?=\t|$)", re.MULTILINE)
+
+# Aynı dosya tekrar yüklendiğinde ya da betik yeniden çalıştığında dosya yeniden okunmaz
+plate_cache = LRUCache(max_entries=8)
+
+
+def _normalize_column(name):
+    key = str(name).strip().lower()
+    return COLUMN_ALIASES.get(key, key)
+
+
+# Dosya uzantısına ve ilk satıra bakarak ayırıcıyı ve ondalık işaretini belirle
+def _detect_csv_format(handle, file_name):
+    if file_name.lower().endswith((".tsv", ".txt")):
+        sep = "\t"
+    else:
+        sep = ","
+    first_line = handle.readline()
+    if isinstance(first_line, bytes):
+        first_line = first_line.decode("utf-8", errors="ignore")
+    handle.seek(0)
+    if sep == "," and first_line.count(";") > first_line.count(","):
+        # Excel'in Avrupa bölgesel ayarlarında ';' ayırıcı ve ',' ondalık kullanılır
+        return ";", ","
+    return sep, "."
+
+
+# "Undetermined" gibi sayısal olmayan değerler NaN olur; ondalık virgül kabul edilir
+def _to_number(values):
+    if not pd.api.types.is_numeric_dtype(values):
+        values = values.astype(str).str.strip().str.replace(",", ".", regex=False)
+    return pd.to_numeric(values, errors="coerce")
+
+
+# Elle girilen / Excel'den yapıştırılan Ct bloğunu tek seferde sayıya çevir
+# Ondalık virgül kabul edilir; belirsiz değerler ve boş hücreler (ara boş satırlar, boş sekme alanları) NaN olur,
+# böylece örnek sırası (hedef-referans eşleşmesi) korunur; yalnızca sondaki boş satırlar atılır
+# Sayıya çevrilemeyen değerler de NaN olur ve (satır numarası, değer) olarak raporlanır
+def parse_ct_block(text):
+    text = text.translate(CLIPBOARD_SEPARATORS).rstrip()
+    if not text:
+        return np.array([]), []
+    # Boş hücreler "nan" ile doldurulur; böylece her hücre bir değer olarak kalır
+    # Sekmesiz (tek sütun) bloklarda daha hızlı olan satır deseni yeterlidir
+    if "\t" in text:
+        text = EMPTY_CELL.sub("nan", text)
+    else:
+        text = BLANK_LINE.sub("\nnan", "\n" + text)[1:]
+    tokens = text.split()
+
+    try:
+        # Hızlı yol: tüm değerler sayısal (dönüşüm tek bir C düzeyi geçişte yapılır)
+        values = np.fromiter(map(float, tokens), dtype=float, count=len(tokens))
+    except ValueError:
+        values = pd.to_numeric(pd.Series(tokens, dtype=object), errors="coerce").to_numpy(dtype=float)
+    failed = np.flatnonzero(np.isnan(values))
+    if len(failed) == 0:
+        return values, []
+
+    # Yalnızca sayıya çevrilemeyen değerler incelenir
+    failed_tokens = pd.Series([tokens[k] for k in failed], dtype=object).str.lower()
+    bad = failed[~failed_tokens.isin(UNDETERMINED_TOKENS).to_numpy()]
+    if len(bad) == 0:
+        return values, []
+    # Satır numaraları yalnızca hatalı değer varsa çıkarılır
+    line_numbers = np.repeat(np.arange(1, text.count("\n") + 2), [len(line.split()) for line in text.split("\n")])
+    return values, [(int(line_numbers[k]), tokens[k]) for k in bad]
+
+
+# Tek bir parçayı ortak sütun adlarına ve tiplere dönüştür
+def _clean_chunk(chunk):
+    chunk = chunk.rename(columns=_normalize_column)
+    missing = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Eksik sütunlar: {', '.join(missing)}")
+    chunk = chunk[REQUIRED_COLUMNS].copy()
+    for column in ("sample", "group", "gene"):
+        chunk[column] = chunk[column].astype(str).str.strip()
+    chunk["role"] = chunk["role"].astype(str).str.strip().str.lower().map(ROLE_ALIASES)
+    chunk["ct"] = _to_number(chunk["ct"])
+    return chunk
+
+
+# CSV/TSV/XLSX qPCR dışa aktarımını parçalar halinde oku ve doğrula
+def read_plate_export(source, file_name=None, chunksize=DEFAULT_CHUNKSIZE):
+    if file_name is None:
+        file_name = getattr(source, "name", str(source))
+    extension = os.path.splitext(file_name)[1].lower()
+
+    if extension in (".xlsx", ".xls"):
+        frames = [_clean_chunk(pd.read_excel(source, dtype=str))]
+    else:
+        handle = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+        try:
+            sep, decimal = _detect_csv_format(handle, file_name)
+            # Sütun adları cihaza göre değiştiğinden (ör. "Sample Name") tüm sütunlar metin okunur;
+            # "01" ve "1" gibi örnek kimlikleri ayrı kalır, Ct _to_number ile sayıya çevrilir
+            reader = pd.read_csv(
+                handle, sep=sep, decimal=decimal, chunksize=chunksize,
+                dtype=str, skipinitialspace=True,
+            )
+            frames = [_clean_chunk(chunk) for chunk in reader]
+        finally:
+            if handle is not source:
+                handle.close()
+
+    table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=REQUIRED_COLUMNS)
+    report = {
+        "rows": len(table),
+        "unknown_role": int(table["role"].isna().sum()),
+    }
+    # Belirsiz Ct'ler (NaN) korunur; on_isleme.preprocess_plate'te maskelenir ve orada raporlanır
+    table = table[table["role"].notna()]
+    for column in ("sample", "group", "gene", "role"):
+        table[column] = table[column].astype("category")
+    return table.reset_index(drop=True), report
+
+
+# Yüklenen dosyayı içerik özetine göre önbellekten oku
+def read_plate_export_cached(uploaded_file):
+    content = uploaded_file.getvalue()
+    key = (uploaded_file.name, hash_arrays(np.frombuffer(content, dtype=np.uint8)))
+    return plate_cache.get_or_compute(key, lambda: read_plate_export(BytesIO(content), uploaded_file.name))
+
+
+# Uzun formatlı tabloyu analiz motorunun beklediği gen x grup x örnek matrislerine dönüştür
+# Ön işlenmiş tabloda her satır bir biyolojik örnektir; işlenmemiş tabloda teknik tekrarlar ayrı örnek sayılır
+def build_panel(table, control_group):
+    table = table[table["ct"].notna()]
+    groups = list(pd.unique(table["group"].astype(str)))
+    if control_group not in groups:
+        raise ValueError(f"Kontrol grubu bulunamadı: {control_group}")
+    patient_groups = [g for g in groups if g != control_group]
+
+    # Her örneğin normalizasyon Ct değeri: önce her referans genin teknik tekrar ortalaması,
+    # ardından tüm referans genlerin ortalaması (geometrik ortalama); bir referansı eksik örnekler dışarıda kalır
+    reference = table[table["role"] == REFERENCE_ROLE]
+    per_reference = reference.groupby(["group", "sample", "gene"], observed=True)["ct"].mean().unstack("gene")
+    # reference_row: örneğin referans gen tablosundaki satırı (Pfaffl ağırlıklı yeniden normalizasyon için)
+    reference_ct = pd.DataFrame({
+        "reference_ct": reference_normalization(per_reference.to_numpy(dtype=float), axis=1),
+        "reference_row": np.arange(len(per_reference)),
+    }, index=per_reference.index)
+
+    targets = table[table["role"] == TARGET_ROLE]
+    targets = targets.join(reference_ct, on=["group", "sample"])
+    no_reference = int(targets["reference_ct"].isna().sum())
+    targets = targets[targets["reference_ct"].notna()]
+
+    genes = list(pd.unique(targets["gene"].astype(str)))
+    gene_codes = pd.Categorical(targets["gene"].astype(str), categories=genes).codes
+    group_codes = pd.Categorical(targets["group"].astype(str), categories=[control_group] + patient_groups).codes
+    # Her gen x grup hücresi içindeki sıra numarası
+    position = targets.groupby([gene_codes, group_codes]).cumcount().to_numpy()
+
+    width = int(position.max()) + 1 if len(position) else 0
+    target_matrix = np.full((len(genes), len(patient_groups) + 1, width), np.nan)
+    reference_matrix = np.full_like(target_matrix, np.nan)
+    target_matrix[gene_codes, group_codes, position] = targets["ct"].to_numpy(dtype=float)
+    reference_matrix[gene_codes, group_codes, position] = targets["reference_ct"].to_numpy(dtype=float)
+    reference_rows = np.full(target_matrix.shape, -1, dtype=np.int64)
+    reference_rows[gene_codes, group_codes, position] = targets["reference_row"].to_numpy(dtype=np.int64)
+
+    return {
+        "genes": genes,
+        "reference_genes": [str(gene) for gene in per_reference.columns],
+        # Örnek x referans gen Ct tablosu ve hücrelerin bu tablodaki satırları (dolgu: -1)
+        "reference_ct": per_reference.to_numpy(dtype=float),
+        "control_reference_rows": reference_rows[:, 0],
+        "sample_reference_rows": reference_rows[:, 1:],
+        "control_group": control_group,
+        "patient_groups": patient_groups,
+        "control_target": target_matrix[:, 0],
+        "control_reference": reference_matrix[:, 0],
+        "sample_target": target_matrix[:, 1:],
+        "sample_reference": reference_matrix[:, 1:],
+        "no_reference": no_reference,
+    }
+
+
+# Standart eğri dosyasını oku: gen, başlangıç miktarı (seyreltme) ve Ct
+# Ct'si belirlenemeyen veya miktarı pozitif olmayan noktalar atlanır
+def read_standard_curve(source, file_name=None):
+    if file_name is None:
+        file_name = getattr(source, "name", str(source))
+    if os.path.splitext(file_name)[1].lower() in (".xlsx", ".xls"):
+        table = pd.read_excel(source, dtype=str)
+    else:
+        handle = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+        try:
+            sep, decimal = _detect_csv_format(handle, file_name)
+            table = pd.read_csv(handle, sep=sep, decimal=decimal, dtype=str, skipinitialspace=True)
+        finally:
+            if handle is not source:
+                handle.close()
+
+    table = table.rename(columns=_normalize_column)
+    missing = [c for c in STANDARD_COLUMNS if c not in table.columns]
+    if missing:
+        raise ValueError(f"Eksik sütunlar: {', '.join(missing)}")
+    table = table[STANDARD_COLUMNS].copy()
+    table["gene"] = table["gene"].astype(str).str.strip()
+    table["quantity"] = _to_number(table["quantity"])
+    table["ct"] = _to_number(table["ct"])
+    table = table[table["ct"].notna() & (table["quantity"] > 0)]
+    table["gene"] = table["gene"].astype("category")
+    return table.reset_index(drop=True)
+
+
+# Yüklenen standart eğri dosyasını içerik özetine göre önbellekten oku
+def read_standard_curve_cached(uploaded_file):
+    content = uploaded_file.getvalue()
+    key = ("standard", uploaded_file.name, hash_arrays(np.frombuffer(content, dtype=np.uint8)))
+    return plate_cache.get_or_compute(key, lambda: read_standard_curve(BytesIO(content), uploaded_file.name))
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+from onbellek import LRUCache, hash_arrays
+
+# Kontrol grubunun grup kodu; hasta grupları 1'den başlar
+CONTROL_GROUP_CODE = 0
+
+# Tablodaki Ct sütunları tek duyarlıklı tutulur (Ct ölçüm duyarlılığı ~0,01 döngü; 7 anlamlı basamak yeterlidir)
+# Analiz motoru çift duyarlıklı Ct matrisleriyle çalışır; tablo görüntüleme, dışa aktarım ve grafikler içindir
+# Arşivler, yeniden yüklendiğinde aynı sonuçları vermesi için çift duyarlıklı tablodan yazılır
+CT_DTYPE = np.float32
+# Tek duyarlıklı Ct'ler matrislere geri yazılırken ikili yuvarlama artıkları bu basamakta temizlenir (25.299999 -> 25.3)
+CT_DECIMALS = 5
+# Tek duyarlıklı Ct sütunlarının ekranda gösterim biçimi (printf %g: 6 anlamlı basamak, sondaki sıfırlar atılır)
+# Saklanan diziler genişletilmeden 18.049999 yerine 18.05 gösterilir
+CT_DISPLAY_FORMAT = "%.6g"
+
+
+# Kod sayısına göre en küçük işaretli tam sayı tipi (Categorical.from_codes ile uyumlu)
+def code_dtype(num_codes):
+    return np.result_type(np.int8, np.min_scalar_type(-max(num_codes, 1)))
+
+
+# Dizi tabanlı örnek tablosu
+# Satırlar gen -> grup -> örnek sırasıyla ardışık tutulur; (gen, grup) -> dilim indeksi O(1) erişim sağlar
+# Gen ve grup yalnızca tam sayı kodu olarak tutulur; etiketler to_frame ile görüntüleme anında eklenir
+class SampleTable:
+    def __init__(self, gene, group, sample_number, target_ct, reference_ct, delta_ct, num_genes, num_groups):
+        self.gene = gene
+        self.group = group
+        self.sample_number = sample_number
+        self.target_ct = target_ct
+        self.reference_ct = reference_ct
+        self.delta_ct = delta_ct
+        self.num_genes = num_genes
+        self.num_groups = num_groups
+        # Son oluşturulan görüntüleme tablosu: (etiket anahtarı, DataFrame); tek atamayla güncellenir (iş parçacığı güvenli)
+        self._frame = (None, None)
+
+        # Her (gen, grup) hücresinin satır aralığı
+        counts = np.bincount(
+            gene.astype(np.int64) * num_groups + group,
+            minlength=num_genes * num_groups,
+        )
+        stops = np.cumsum(counts)
+        self.index = {
+            divmod(cell, num_groups): slice(int(stop - count), int(stop))
+            for cell, (count, stop) in enumerate(zip(counts, stops))
+            if count
+        }
+
+    # Kontrol (gen, örnek) ve hasta (gen, grup, örnek) matrislerinden tabloyu tek geçişte oluştur
+    # ct_dtype: Ct sütunlarının tipi (arşiv için np.float64: ortalaması alınmış Ct'ler kayıpsız saklanır)
+    @classmethod
+    def from_panel(cls, control_target, control_reference, sample_target, sample_reference, ct_dtype=CT_DTYPE):
+        num_genes = control_target.shape[0]
+        num_groups = sample_target.shape[1] + 1
+        width = max(control_target.shape[-1], sample_target.shape[-1])
+
+        def stack(control, samples):
+            matrix = np.full((num_genes, num_groups, width), np.nan)
+            matrix[:, CONTROL_GROUP_CODE, :control.shape[-1]] = control
+            matrix[:, CONTROL_GROUP_CODE + 1:, :samples.shape[-1]] = samples
+            return matrix
+
+        target = stack(control_target, sample_target)
+        reference = stack(control_reference, sample_reference)
+        delta = target - reference
+        gene, group, position = np.nonzero(~np.isnan(delta))
+
+        return cls(
+            gene=gene.astype(code_dtype(num_genes)),
+            group=group.astype(code_dtype(num_groups)),
+            sample_number=(position + 1).astype(code_dtype(width + 1)),
+            target_ct=target[gene, group, position].astype(ct_dtype),
+            reference_ct=reference[gene, group, position].astype(ct_dtype),
+            delta_ct=delta[gene, group, position].astype(ct_dtype),
+            num_genes=num_genes,
+            num_groups=num_groups,
+        )
+
+    # from_panel işleminin tersi: kontrol (gen, örnek) ve hasta (gen, grup, örnek) Ct matrisleri
+    def to_matrices(self):
+        width = int(self.sample_number.max()) if len(self) else 0
+        position = self.sample_number - 1
+        is_control = self.group == CONTROL_GROUP_CODE
+        control_shape = (self.num_genes, width)
+        sample_shape = (self.num_genes, self.num_groups - 1, width)
+
+        def scatter(values):
+            # Yalnızca tek duyarlıklı değerler yuvarlanır; çift duyarlıklı tablolar matrisleri aynen geri verir
+            if values.dtype == CT_DTYPE:
+                values = np.round(values.astype(float), CT_DECIMALS)
+            control = np.full(control_shape, np.nan)
+            samples = np.full(sample_shape, np.nan)
+            control[self.gene[is_control], position[is_control]] = values[is_control]
+            samples[self.gene[~is_control], self.group[~is_control] - 1, position[~is_control]] = values[~is_control]
+            return control, samples
+
+        control_target, sample_target = scatter(self.target_ct)
+        control_reference, sample_reference = scatter(self.reference_ct)
+        return control_target, control_reference, sample_target, sample_reference
+
+    def __len__(self):
+        return len(self.delta_ct)
+
+    # Dizilerin kapladığı bellek (bayt); görüntüleme tablosu ayrıca sayılır
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in (
+            self.gene, self.group, self.sample_number, self.target_ct, self.reference_ct, self.delta_ct
+        ))
+
+    def cell(self, gene, group):
+        return self.index.get((gene, group), slice(0, 0))
+
+    # Bir hücrenin ΔCt değerleri (kopya değil, görünüm)
+    def cell_delta_ct(self, gene, group):
+        return self.delta_ct[self.cell(gene, group)]
+
+    # Görüntüleme, CSV ve PDF için ortak DataFrame (etiketler kategorik kodlardan türetilir)
+    # group_labels: kontrol grubu etiketi + hasta grubu etiketleri
+    # Tablo bir kez oluşturulur ve aynı etiketlerle çağrıldıkça tüm oturumlarca paylaşılır; çağıran değiştirmemelidir
+    def to_frame(self, columns, gene_labels, group_labels):
+        key = (tuple(columns.items()), tuple(gene_labels), tuple(group_labels))
+        frame_key, frame = self._frame
+        if frame_key != key:
+            frame = self._build_frame(columns, gene_labels, group_labels)
+            self._frame = (key, frame)
+        return frame
+
+    def _build_frame(self, columns, gene_labels, group_labels):
+        is_control = self.group == CONTROL_GROUP_CODE
+        return pd.DataFrame({
+            columns["sample_number"]: self.sample_number,
+            columns["target_gene"]: pd.Categorical.from_codes(self.gene, categories=list(gene_labels)),
+            columns["group"]: pd.Categorical.from_codes(self.group, categories=list(group_labels)),
+            columns["target_ct"]: self.target_ct,
+            columns["reference_ct"]: self.reference_ct,
+            columns["delta_ct_control"]: np.where(is_control, self.delta_ct, CT_DTYPE(np.nan)),
+            columns["delta_ct_patient"]: np.where(is_control, CT_DTYPE(np.nan), self.delta_ct),
+        }, copy=False)
+
+
+# Aynı Ct matrisleri için tablo yeniden oluşturulmaz (ör. yalnızca dil değiştiğinde)
+table_cache = LRUCache(max_entries=16)
+
+
+def cached_sample_table(control_target, control_reference, sample_target, sample_reference):
+    key = hash_arrays(control_target, control_reference, sample_target, sample_reference)
+    return table_cache.get_or_compute(key, lambda: SampleTable.from_panel(
+        control_target, control_reference, sample_target, sample_reference
+    ))
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from onbellek import LRUCache, hash_arrays
+
+# %100 verimlilikte ürün her döngüde iki katına çıkar (2^(-ΔΔCt) modelinin varsayımı)
+IDEAL_AMPLIFICATION = 2.0
+# Bu sayıdan az seyreltme noktası olan eğriler uydurulmaz
+MIN_CURVE_POINTS = 3
+# Kabul edilen eğriler: 1 < E <= 2,2 (verimlilik %0-120) ve R² eşiği (MIQE önerisi ~0,98)
+# Aralık dışındaki eğriler (ör. pozitif eğim, E <= 1) log2(E) ağırlığını sıfırlar veya işaretini çevirir; kullanılmaz
+MIN_AMPLIFICATION = 1.0
+MAX_AMPLIFICATION = 2.2
+MIN_R_SQUARED = 0.98
+
+QUANTIFICATION_METHODS = ("delta_delta_ct_method", "pfaffl")
+
+# Aynı standart eğri verileri (plaka) için eğriler yeniden uydurulmaz
+curve_cache = LRUCache(max_entries=32)
+
+
+# Tüm standart eğrileri tek geçişte en küçük kareler ile uydur: Ct = eğim * log10(miktar) + kesişim
+# Gen başına toplamlar bincount ile hesaplanır; gen sayısından bağımsız olarak Python düzeyinde döngü yoktur
+# gene_codes: her nokta için gen kodu, quantity: başlangıç miktarı, ct: ölçülen Ct
+def fit_standard_curves(gene_codes, quantity, ct, num_genes):
+    gene_codes = np.asarray(gene_codes, dtype=np.int64)
+    x = np.log10(np.asarray(quantity, dtype=float))
+    y = np.asarray(ct, dtype=float)
+
+    def total(values):
+        return np.bincount(gene_codes, weights=values, minlength=num_genes)
+
+    points = np.bincount(gene_codes, minlength=num_genes)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Sayısal kararlılık için ortalamadan sapmalar üzerinden iki geçiş
+        x_mean = total(x) / points
+        y_mean = total(y) / points
+        dx = x - x_mean[gene_codes]
+        dy = y - y_mean[gene_codes]
+        sxx, sxy, syy = total(dx * dx), total(dx * dy), total(dy * dy)
+
+        fitted = (points >= MIN_CURVE_POINTS) & (sxx > 0)
+        slope = np.where(fitted, sxy / sxx, np.nan)
+        intercept = y_mean - slope * x_mean
+        r_squared = np.where(fitted & (syy > 0), sxy ** 2 / (sxx * syy), np.nan)
+        amplification = 10 ** (-1 / slope)
+        usable = fitted & (amplification > MIN_AMPLIFICATION) & (amplification <= MAX_AMPLIFICATION) & (r_squared >= MIN_R_SQUARED)
+
+    return {
+        "points": points,
+        "slope": slope,
+        "intercept": intercept,
+        "r_squared": r_squared,
+        "amplification": amplification,
+        "efficiency": (amplification - 1) * 100,
+        "usable": usable,
+    }
+
+
+# Standart eğri tablosundan (read_standard_curve) gen başına eğri parametreleri; plaka içeriğine göre önbellekte
+def standard_curves(table):
+    genes = table["gene"].cat.categories
+    codes = table["gene"].cat.codes.to_numpy()
+    quantity = table["quantity"].to_numpy(dtype=float)
+    ct = table["ct"].to_numpy(dtype=float)
+    key = (tuple(genes), hash_arrays(codes, quantity, ct))
+    return curve_cache.get_or_compute(key, lambda: pd.DataFrame(
+        fit_standard_curves(codes, quantity, ct, len(genes)), index=pd.Index(genes, name="gene")
+    ))
+
+
+# Eğrisi kullanılabilir (kabul aralığında) olan genler
+def usable_curves(curves, genes):
+    return curves["usable"].reindex(list(genes), fill_value=False).to_numpy(dtype=bool)
+
+
+# Genlerin amplifikasyon faktörleri; eğrisi olmayan, uydurulamayan veya kabul aralığı dışındaki genler için %100 verimlilik
+def gene_amplification(curves, genes):
+    amplification = curves["amplification"].reindex(list(genes)).to_numpy(dtype=float)
+    return np.where(usable_curves(curves, genes), amplification, IDEAL_AMPLIFICATION)